@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+
+# Usage: python -m scripts.ns_benchmark [benchmark ...] [--repeat N] [--trees N]
+
+import argparse
+import csv
+import io
+import timeit
+from collections.abc import Callable
+
+import scripts  # noqa: F401  # put src/ onto sys.path
+from neosca.ns_sca import l2sca
+from neosca.ns_sca.ns_sca_counter import Ns_SCA_Counter
+from neosca.ns_sca.ns_sca_results import Ns_SCA_Results
+from neosca.ns_tregex.forest import Forest
+from neosca.ns_tregex.relation import COLLINS_HEAD_FINDER, DOMINATED_BY, DOMINATES, PRECEDES
+from neosca.ns_tregex.tree import Tree
+from neosca.ns_tregex.tregex_pattern import Forest_Stats, Tregex_Pattern
+
+TREE_STRING = """(ROOT
+  (S
+    (NP (EX There))
+    (VP (VBD was)
+      (NP
+        (NP (DT no) (NN possibility))
+        (PP (IN of)
+          (S
+            (VP (VBG taking)
+              (NP (DT a) (NN walk))
+              (NP (DT that) (NN day)))))))
+    (. .)))
+(ROOT
+  (S
+    (NP (PRP We))
+    (VP (VBD had)
+      (VP (VBN been)
+        (VP (VBG wandering)
+          (, ,)
+          (ADVP (RB indeed))
+          (, ,)
+          (PP (IN in)
+            (NP
+              (NP (DT the) (JJ leafless) (NN shrubbery))
+              (NP (DT an) (NN hour))))
+          (PP (IN in)
+            (NP (DT the) (NN morning))))))
+    (: ;)
+    (S
+      (CC but)
+      (PP (IN since)
+        (NP (NN dinner)))
+      (NP (PRP we))
+      (VP (VBD had) (ADVP (RB now))
+        (SBAR (IN that)
+          (S
+            (NP (NNP Mrs.) (NNP Reed))
+            (VP (VBD was)
+              (ADJP (JJ dined))
+              (, ,)
+              (SBAR (WHADVP (WRB when))
+                (S
+                  (NP (PRP she))
+                  (VP (VBD dined) (ADVP (RB early))))))))))
+    (. .)))
+"""
+
+
+def bench_forest(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Parse the document once per structure (old path) vs. once per document"""
+    string = TREE_STRING * (n_trees // 2)
+    snames = tuple(Ns_SCA_Counter.SNAME_SEARCHER_MAPPING.keys())
+
+    def reparse_per_structure() -> None:
+        for sname in snames:
+            Ns_SCA_Counter.search_sname(sname, Forest.fromstring(string))
+        Ns_SCA_Counter.count_words(Forest.fromstring(string))
+
+    def shared_forest() -> None:
+        forest = Forest.fromstring(string)
+        for sname in snames:
+            Ns_SCA_Counter.search_sname(sname, forest)
+        Ns_SCA_Counter.count_words(forest)
+
+    return {
+        "parse only": lambda: list(Tree.fromstring(string)),
+        "reparse per structure": reparse_per_structure,
+        "shared forest": shared_forest,
+    }
+
+
+def bench_multi_searcher(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Walk the trees once per structure vs. once for all structures"""
+    forest = Forest.fromstring(TREE_STRING * (n_trees // 2))
+    snames = tuple(Ns_SCA_Counter.SNAME_SEARCHER_MAPPING.keys())
+
+    def walk_per_structure() -> None:
+        for sname in snames:
+            for tree in forest:
+                list(Ns_SCA_Counter.SNAME_SEARCHER_MAPPING[sname].searchNodeIterator(tree))
+
+    multi_searcher = l2sca.Multi_Searcher(Ns_SCA_Counter.SNAME_SEARCHER_MAPPING[sname] for sname in snames)
+
+    def single_walk() -> None:
+        for tree in forest:
+            list(multi_searcher.searchNodeIterator(tree))
+
+    return {
+        "walk per structure": walk_per_structure,
+        "single walk": single_walk,
+    }
+
+
+def bench_label_index(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Find the candidates of every built-in searcher by scanning vs. by the label index"""
+    forest = Forest.fromstring(TREE_STRING * (n_trees // 2))
+    label_groups = [searcher.candidate_labels for searcher in Ns_SCA_Counter.SNAME_SEARCHER_MAPPING.values()]
+
+    def scan() -> None:
+        for labels in label_groups:
+            for tree in forest:
+                [node for node in tree.preorder_iter() if node.label in labels]
+
+    def index_lookup() -> None:
+        for tree in forest:
+            tree.clear_index()
+        for labels in label_groups:
+            for tree in forest:
+                tree.get_index().nodes_with_labels(labels)
+
+    return {"scan": scan, "label index (incl. build)": index_lookup}
+
+
+def bench_edges(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Check PRECEDES and DOMINATES on all node pairs by walking the tree vs. by the numbering"""
+    trees = list(Tree.fromstring(TREE_STRING * max(1, n_trees // 20)))
+
+    def walk_left_edge(node: Tree) -> int:
+        edge = 0
+        for other in node.getRoot().preorder_iter():
+            if other is node:
+                return edge
+            if other.isLeaf():
+                edge += 1
+        raise RuntimeError("Tree is not a descendant of root.")
+
+    def walk_dominates(node1: Tree, node2: Tree) -> bool:
+        return any(ancestor is node1 for ancestor in DOMINATED_BY.searchNodeIterator(node2))
+
+    def walk() -> None:
+        for tree in trees:
+            nodes = list(tree.preorder_iter())
+            for node1 in nodes:
+                n_leaves = sum(1 for node in node1.preorder_iter() if node.isLeaf())
+                right_edge = walk_left_edge(node1) + n_leaves
+                for node2 in nodes:
+                    _ = right_edge <= walk_left_edge(node2)
+                    walk_dominates(node1, node2)
+
+    def numbering() -> None:
+        for tree in trees:
+            tree.clear_index()
+            nodes = list(tree.preorder_iter())
+            for node1 in nodes:
+                for node2 in nodes:
+                    PRECEDES.satisfies(node1, node2)
+                    DOMINATES.satisfies(node1, node2)
+
+    return {"walk": walk, "numbering (incl. build)": numbering}
+
+
+def bench_heads(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Ask for the head of every clause/VP node three times, as C1/C2/DC/CT do across their branches"""
+    forest = Forest.fromstring(TREE_STRING * (n_trees // 2))
+    labels = ("S", "SINV", "SQ", "VP", "SBAR")
+
+    def candidates() -> list[Tree]:
+        for tree in forest:
+            tree.clear_index()
+        return [node for tree in forest for node in tree.get_index().nodes_with_labels(labels)]
+
+    def per_query() -> None:
+        for node in candidates():
+            for _ in range(3):
+                COLLINS_HEAD_FINDER.determineHead(node)
+
+    def memoized() -> None:
+        for node in candidates():
+            for _ in range(3):
+                node.head_daughter(COLLINS_HEAD_FINDER)
+
+    def precomputed() -> None:
+        nodes = candidates()
+        for tree in forest:
+            tree.get_index().get_head_cache(COLLINS_HEAD_FINDER, precompute=True)
+        for node in nodes:
+            for _ in range(3):
+                node.head_daughter(COLLINS_HEAD_FINDER)
+
+    return {"determineHead per query": per_query, "memoized": memoized, "precomputed": precomputed}
+
+
+def bench_tregex_pattern(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Run all built-in structures: hand-written searchers vs. compiled Tregex patterns"""
+    forest = Forest.fromstring(TREE_STRING * (n_trees // 2))
+    tregex_patterns = [
+        Ns_SCA_Counter.BUILTIN_STRUCTURE_DEFS[sname].tregex_pattern
+        for sname in Ns_SCA_Counter.SNAME_SEARCHER_MAPPING
+    ]
+
+    def compile_all() -> list[Tregex_Pattern]:
+        Tregex_Pattern.compiled_patterns.clear()
+        return [Tregex_Pattern.compile(tregex_pattern) for tregex_pattern in tregex_patterns]  # type:ignore
+
+    def walk(multi_searcher: l2sca.Multi_Searcher) -> None:
+        for tree in forest:
+            list(multi_searcher.searchNodeIterator(tree))
+
+    hand_written = l2sca.Multi_Searcher(Ns_SCA_Counter.SNAME_SEARCHER_MAPPING.values())
+    compiled = l2sca.Multi_Searcher(compile_all())
+    return {
+        "compile": compile_all,
+        "hand-written searchers": lambda: walk(hand_written),
+        "compiled patterns": lambda: walk(compiled),
+    }
+
+
+def bench_query_plan(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Run user patterns with their checks as written vs. reordered by estimated cost"""
+    forest = Forest.fromstring(TREE_STRING * (n_trees // 2))
+    # expensive relations are written first
+    tregex_patterns = (
+        "NP .. NN << DT > VP",
+        "VP << NN !<< JJ > S",
+        "__ ,, DT << NN > PP",
+        "NP >> S .. VBD $+ VP",
+    )
+
+    def searcher(stats: Forest_Stats | None) -> l2sca.Multi_Searcher:
+        patterns = [Tregex_Pattern(tregex_pattern) for tregex_pattern in tregex_patterns]
+        if stats is not None:
+            for pattern in patterns:
+                pattern.plan(stats)
+        return l2sca.Multi_Searcher(patterns)
+
+    def walk(multi_searcher: l2sca.Multi_Searcher) -> None:
+        for tree in forest:
+            list(multi_searcher.searchNodeIterator(tree))
+
+    as_written = searcher(None)
+    default_stats = searcher(Forest_Stats())
+    return {
+        "as written": lambda: walk(as_written),
+        "default statistics": lambda: walk(default_stats),
+        "forest statistics": lambda: walk(searcher(Forest_Stats.from_forest(forest))),
+    }
+
+
+def bench_regex_descriptions(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Run regex-heavy user patterns on growing forests, time should grow linearly with the number of nodes"""
+    tregex_patterns = ("/^N/ < /^(DT|PRP.?)$/", "/^V/ < /^S/", "/^(S|SBAR)$/ << /^W/", "__ < /^J/")
+    multi_searcher = l2sca.Multi_Searcher(
+        Tregex_Pattern.compile(tregex_pattern) for tregex_pattern in tregex_patterns
+    )
+
+    def walk(forest: Forest) -> None:
+        for tree in forest:
+            list(multi_searcher.searchNodeIterator(tree))
+
+    ret = {}
+    for scale in (1, 2, 4):
+        forest = Forest.fromstring(TREE_STRING * max(1, n_trees * scale // 4))
+        n_nodes = sum(1 for tree in forest for _ in tree.preorder_iter())
+        ret[f"{n_nodes} nodes"] = lambda forest=forest: walk(forest)
+    return ret
+
+
+def bench_matches(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Search for the built-in structures, keeping matches as leaf offsets vs joining their text eagerly"""
+    snames = tuple(Ns_SCA_Counter.SNAME_SEARCHER_MAPPING)
+    forest = Forest.fromstring(TREE_STRING * max(1, n_trees // 4))
+    multi_searcher = l2sca.Multi_Searcher(Ns_SCA_Counter.SNAME_SEARCHER_MAPPING.values())
+
+    def eager() -> None:
+        for tree in forest:
+            for _, node in multi_searcher.searchNodeIterator(tree):
+                node.span_string()
+
+    sname_matches_map = Ns_SCA_Counter.search_snames(snames, forest)
+    return {
+        "span strings": eager,
+        "offsets": lambda: Ns_SCA_Counter.search_snames(snames, forest),
+        "counts only": lambda: Ns_SCA_Counter.count_snames(snames, forest),
+        "render offsets": lambda: [list(matches) for matches in sname_matches_map.values()],
+    }
+
+
+def bench_value_sources(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Compute the derived measures (MLS, C/T, ...) of many counters whose terminal values are known"""
+    forest = Forest.fromstring(TREE_STRING)
+    counters = [Ns_SCA_Counter() for _ in range(n_trees)]
+    for counter in counters:
+        counter.determine_all_values(forest)
+    derived_sids = [
+        counters[0].sname_id_map[sname] for sname in counters[0].evaluation_plan.value_source_snames
+    ]
+
+    def determine_derived() -> None:
+        for counter in counters:
+            for sid in derived_sids:
+                counter.values[sid] = None
+            counter.determine_all_values(forest)
+
+    return {f"{n_trees} counters": determine_derived}
+
+
+def bench_counters(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Create many counters and combine counters of searched documents"""
+    forest = Forest.fromstring(TREE_STRING)
+    counter = Ns_SCA_Counter()
+    counter.determine_all_values(forest)
+
+    def combine_pairwise() -> None:
+        total = Ns_SCA_Counter()
+        for _ in range(n_trees):
+            total += counter
+
+    def merge_from() -> None:
+        Ns_SCA_Counter().merge_from(counter for _ in range(n_trees))
+
+    return {
+        f"create {n_trees * 10} counters": lambda: [Ns_SCA_Counter() for _ in range(n_trees * 10)],
+        f"combine {n_trees} pairwise": combine_pairwise,
+        f"merge_from {n_trees}": merge_from,
+    }
+
+
+def bench_results(n_trees: int) -> dict[str, Callable[[], object]]:
+    """Write the values of many searched documents as CSV, cell by cell vs column by column"""
+    forest = Forest.fromstring(TREE_STRING)
+    counters = []
+    for i in range(n_trees * 10):
+        counter = Ns_SCA_Counter(f"{i}.txt")
+        counter.determine_all_values(forest)
+        counters.append(counter)
+
+    def per_cell() -> None:
+        sname_value_maps = [counter.get_all_values() for counter in counters]
+        csv_writer = csv.DictWriter(io.StringIO(), fieldnames=sname_value_maps[0].keys())
+        csv_writer.writeheader()
+        csv_writer.writerows(sname_value_maps)
+
+    return {
+        "per-cell strings": per_cell,
+        "columnar": lambda: Ns_SCA_Results.from_counters(counters).dump_csv(io.StringIO()),
+    }
+
+
+BENCHMARKS: dict[str, Callable[[int], dict[str, Callable[[], object]]]] = {
+    "forest": bench_forest,
+    "multi_searcher": bench_multi_searcher,
+    "label_index": bench_label_index,
+    "edges": bench_edges,
+    "heads": bench_heads,
+    "tregex_pattern": bench_tregex_pattern,
+    "query_plan": bench_query_plan,
+    "regex_descriptions": bench_regex_descriptions,
+    "matches": bench_matches,
+    "value_sources": bench_value_sources,
+    "counters": bench_counters,
+    "results": bench_results,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m scripts.ns_benchmark")
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark", help=f"any of {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing runs, the best one is reported")
+    parser.add_argument("--trees", type=int, default=200, help="approximate number of trees per document")
+    options = parser.parse_args()
+    if unknown := set(options.benchmarks) - BENCHMARKS.keys():
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    for name in options.benchmarks or BENCHMARKS:
+        print(f"{name}: {BENCHMARKS[name].__doc__}")
+        for label, func in BENCHMARKS[name](options.trees).items():
+            best = min(timeit.repeat(func, number=1, repeat=options.repeat))
+            print(f"  {label:<28}{best * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
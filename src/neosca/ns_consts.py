@@ -21,6 +21,8 @@ ICON_MAC_PATH: Path = DATA_DIR / "ns_icon.icns"
 SETTING_PATH: Path = DATA_DIR / "settings.ini"
 CACHE_DIR: Path = DATA_DIR / "cache" / "cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DB_PATH: Path = DATA_DIR / "cache" / "cache_info.sqlite3"
+# Store of cache information before CACHE_DB_PATH, imported into it on first use
 CACHE_INFO_PATH: Path = DATA_DIR / "cache" / "cache_info.json"
 
 DESKTOP_PATH: Path = Path.home().absolute() / "Desktop"
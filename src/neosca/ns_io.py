@@ -7,17 +7,21 @@ import lzma
 import os
 import os.path as os_path
 import pickle
+import sqlite3
 import sys
+import threading
+import time
 import zipfile
 from collections.abc import Generator, Iterable, Sequence
+from contextlib import contextmanager
 from os import PathLike
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 from xml.etree.ElementTree import XML, fromstring
 
 from charset_normalizer import detect
 
-from neosca.ns_consts import CACHE_DIR, CACHE_INFO_PATH
+from neosca.ns_consts import CACHE_DB_PATH, CACHE_DIR, CACHE_INFO_PATH
 from neosca.ns_utils import Ns_Procedure_Result
 
 
@@ -203,13 +207,17 @@ class Ns_IO(metaclass=Ns_IO_Meta):
 
     @classmethod
     def dump_bytes(cls, data: bytes, path: str | PathLike) -> None:
+        # Write to a temporary file and move it into place, so that other
+        # processes reading path never see it half-written
+        tmp_path = f"{path}.{os.getpid()}.tmp"
         try:
-            with open(path, "wb") as f:
+            with open(tmp_path, "wb") as f:
                 f.write(data)
         except FileNotFoundError:
             Path(path).parent.mkdir(parents=True)
-            with open(path, "wb") as f:
+            with open(tmp_path, "wb") as f:
                 f.write(data)
+        os.replace(tmp_path, path)
 
     @classmethod
     def get_verified_ifile_list(cls, ifile_list: Iterable[str]) -> list[str]:
@@ -282,15 +290,353 @@ class Ns_IO(metaclass=Ns_IO_Meta):
         return file_paths
 
 
+class Ns_Run_Manifest:
+    """
+    Sidecar of an output file recording the files whose values have been
+    written, so that an interrupted run can be resumed without analyzing
+    them again. It is a JSON Lines file: the first line holds the measure
+    configuration of the run, and each following line a finished file with
+    the hash of its contents and its values.
+    """
+
+    SUFFIX = ".manifest.jsonl"
+
+    def __init__(self, ofile: str, config: dict[str, Any]) -> None:
+        self.path = ofile + self.SUFFIX
+        # round-trip through JSON so that it compares equal to a loaded one
+        self.config = json.loads(json.dumps(config))
+        # json.dumps(source) -> {"source": ..., "hash": ..., "record": ...}
+        self.entries: dict[str, dict[str, Any]] = {}
+        # Number of lines dropped by load(): files changed or removed since,
+        # and files recorded again after an earlier resumed run
+        self.n_dropped = 0
+        self.handle: TextIO | None = None
+
+    @classmethod
+    def hash_source(cls, source: str | list[str]) -> str:
+        """
+        Hash of the contents of a file, or of all the subfiles of a list
+        """
+        import hashlib
+
+        hasher = hashlib.sha256()
+        for file_path in [source] if isinstance(source, str) else source:
+            with open(file_path, "rb") as f:
+                hasher.update(hashlib.sha256(f.read()).digest())
+        return hasher.hexdigest()
+
+    def load(self) -> int:
+        """
+        Read the finished files of a previous run with the same
+        configuration that have not changed since, and return how many there
+        are
+        """
+        self.entries.clear()
+        self.n_dropped = 0
+        if not os_path.isfile(self.path):
+            return 0
+        n_lines = 0
+        with open(self.path, encoding="utf-8") as f:
+            lines = iter(f)
+            try:
+                if json.loads(next(lines)).get("config") != self.config:
+                    logging.info(f"Measure configuration differs from that of {self.path}, starting over")
+                    return 0
+                for line in lines:
+                    entry = json.loads(line)
+                    self.entries[json.dumps(entry["source"])] = entry
+                    n_lines += 1
+            except (StopIteration, json.JSONDecodeError, KeyError):
+                # A line cut off by the interruption, the files before it are
+                # still finished
+                pass
+
+        for key, entry in tuple(self.entries.items()):
+            try:
+                is_changed = entry["hash"] != self.hash_source(entry["source"])
+            except OSError:
+                is_changed = True
+            if is_changed:
+                logging.info(f'"{entry["source"]}" has changed since the previous run')
+                del self.entries[key]
+        self.n_dropped = n_lines - len(self.entries)
+        return len(self.entries)
+
+    def open(self) -> None:
+        """
+        Start writing the manifest, keeping the entries loaded by load()
+        """
+        self.handle = handle = open(self.path, "w", encoding="utf-8")  # noqa: SIM115
+        handle.write(json.dumps({"config": self.config}, ensure_ascii=False) + "\n")
+        for entry in self.entries.values():
+            handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        handle.flush()
+
+    def get_record(self, source: str | list[str]) -> dict[str, Any] | None:
+        """
+        Values of a file finished in a previous run, if it has not changed
+        since, which load() has checked
+        """
+        if (entry := self.entries.get(json.dumps(source))) is None:
+            return None
+        return entry["record"]
+
+    def add(self, source: str | list[str], record: dict[str, Any]) -> None:
+        assert self.handle is not None, "Call open() before adding entries"
+        entry = {"source": source, "hash": self.hash_source(source), "record": record}
+        self.entries[json.dumps(source)] = entry
+        self.handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.handle.flush()
+
+    def close(self) -> None:
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+class Ns_Values_Writer:
+    """
+    Write the values of each file as soon as they are determined, as a CSV
+    row, a JSON Lines record, or an item of a JSON array, so that counters
+    need not be kept until the end of a run, and rows written before an
+    interruption are on disk
+    """
+
+    FORMATS: tuple[str, ...] = ("csv", "json", "jsonl")
+
+    def __init__(
+        self, ofile: str | None, oformat: str = "csv", *, manifest: Ns_Run_Manifest | None = None
+    ) -> None:
+        """
+        :param ofile: path of the output file, or None for stdout
+        :param manifest: if given, files finished in a previous run are
+            skipped, see is_finished(), and rows of new files are appended
+        """
+        if oformat not in self.FORMATS:
+            raise ValueError(f"oformat {oformat} not in {self.FORMATS}")
+        if manifest is not None and ofile is None:
+            raise ValueError("Cannot resume a run that writes to stdout")
+        self.oformat = oformat
+        self.is_stdout = ofile is None
+        self.csv_writer = None
+        self.n_records = 0
+        self.manifest = manifest
+
+        if manifest is None:
+            self.handle = (
+                sys.stdout if ofile is None else open(ofile, "w", encoding="utf-8", newline="")  # noqa: SIM115
+            )
+            return
+
+        assert ofile is not None
+        n_finished = manifest.load()
+        manifest.open()
+        # The output holds a row for each finished file unless the run was
+        # interrupted between writing a row and recording it, or files have
+        # changed since, in which case the rows of the files still finished
+        # are written again from the manifest before any new row. JSON arrays
+        # cannot be appended to and are always written again.
+        if (
+            n_finished > 0
+            and manifest.n_dropped == 0
+            and oformat != "json"
+            and self.count_records(ofile, oformat) == n_finished
+        ):
+            self.handle = open(ofile, "a", encoding="utf-8", newline="")  # noqa: SIM115
+            self.n_records = n_finished
+            if oformat == "csv":
+                import csv
+
+                first_record = next(iter(manifest.entries.values()))["record"]
+                self.csv_writer = csv.DictWriter(self.handle, fieldnames=first_record.keys())
+            logging.info(f"Resuming {ofile} after {n_finished} finished file(s)")
+        else:
+            self.handle = open(ofile, "w", encoding="utf-8", newline="")  # noqa: SIM115
+            for entry in manifest.entries.values():
+                self._write(entry["record"])
+
+    def __enter__(self) -> "Ns_Values_Writer":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @classmethod
+    def count_records(cls, ofile: str, oformat: str) -> int:
+        if not os_path.isfile(ofile):
+            return 0
+        with open(ofile, encoding="utf-8", newline="") as f:
+            if oformat == "csv":
+                import csv
+
+                return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+            return sum(1 for line in f if line.strip())
+
+    def is_finished(self, source: str | list[str]) -> bool:
+        """
+        Whether the values of a file or list of subfiles were written in a
+        previous run and the file has not changed since
+        """
+        return self.manifest is not None and self.manifest.get_record(source) is not None
+
+    def filter_unfinished(self, sources: list[str | list[str]]) -> list[str | list[str]]:
+        unfinished_sources = []
+        for source in sources:
+            if self.is_finished(source):
+                logging.info(f'Skipping "{source}", finished in a previous run')
+            else:
+                unfinished_sources.append(source)
+        return unfinished_sources
+
+    def write(self, record: dict[str, Any], source: str | list[str] | None = None) -> None:
+        """
+        :param source: the file or list of subfiles of the record, to be
+            recorded in the manifest
+        """
+        self._write(record)
+        # After the row is written, so that a recorded file always has its row
+        if self.manifest is not None and source is not None:
+            self.manifest.add(source, record)
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self.oformat == "csv":
+            if self.csv_writer is None:
+                import csv
+
+                self.csv_writer = csv.DictWriter(self.handle, fieldnames=record.keys())
+                self.csv_writer.writeheader()
+            self.csv_writer.writerow(record)
+        elif self.oformat == "jsonl":
+            self.handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            # Same layout as json.dump(records, indent=2)
+            from textwrap import indent
+
+            self.handle.write(",\n" if self.n_records else "[\n")
+            self.handle.write(indent(json.dumps(record, ensure_ascii=False, indent=2), "  "))
+        self.n_records += 1
+        self.handle.flush()
+
+    def close(self) -> None:
+        if self.manifest is not None:
+            self.manifest.close()
+        if self.handle is None:
+            return
+        if self.oformat == "json":
+            self.handle.write("\n]" if self.n_records else "[]")
+        if self.is_stdout:
+            self.handle.flush()
+        else:
+            self.handle.close()
+        self.handle = None  # type:ignore
+
+
 class Ns_Cache:
     CACHE_EXTENSION = ".pickle.lzma"
-    # fpath_cname: { "/absolute/path/to/foo.txt": "foo.pickle.lzma", ... }
-    fpath_cname: dict[str, str] = (
-        Ns_IO.load_json(CACHE_INFO_PATH)
-        if CACHE_INFO_PATH.exists() and os_path.getsize(CACHE_INFO_PATH) > 0
-        else {}
-    )
-    info_changed: bool = False
+    # Cache files are named by what they parse, "<content hash>-<model tag>",
+    # so that identical texts share one cache wherever they live.
+    # The metadata store at CACHE_DB_PATH holds three tables:
+    #   files: file_path -> cache_name, a lookup layer on top of the cache
+    #       files, so that unchanged files are found without being read and
+    #       hashed
+    #   caches: cache_name -> size, last_access, for LRU eviction
+    #   sentences: key -> record, size, last_access, parses of sentences,
+    #       evicted along with cache files and counted in their total size
+    # Each change is committed at once, so that the database is never locked
+    # for longer than a statement, e.g., by the GUI while a CLI run is going.
+    connection: sqlite3.Connection | None = None
+    # Guards the connection, which GUI workers share with the main thread
+    lock = threading.RLock()
+    # Running total of the sizes in the caches table, None until needed
+    total_size: int | None = None
+    # Parsing worker processes leave the metadata to the main process
+    is_recording: bool = True
+    # Sentence records of a process that does not record, left for the main
+    # process to save, see Ns_Parse_Pool
+    unsaved_sentence_records: dict[str, dict] = {}
+    model_tag: str | None = None
+    # Maximum total size of cache files and sentence records in bytes, 0 for
+    # unlimited
+    max_size: int = 0
+    # Keys per statement, below the limit on the number of SQL variables
+    KEY_CHUNK_SIZE = 500
+
+    @classmethod
+    def connect(cls) -> sqlite3.Connection:
+        with cls.lock:
+            if cls.connection is not None:
+                return cls.connection
+            logging.debug(f"Opening cache information at {CACHE_DB_PATH}...")
+            # Autocommit, with explicit transactions for multi-statement changes
+            connection = sqlite3.connect(CACHE_DB_PATH, check_same_thread=False, isolation_level=None)
+            # Readers in other processes are not blocked by a writer
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            # Sentence records written before they were sized cannot be
+            # evicted, and are only parses to redo
+            sentence_columns = [row[1] for row in connection.execute("PRAGMA table_info(sentences)")]
+            if sentence_columns and "size" not in sentence_columns:
+                connection.execute("DROP TABLE sentences")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS files (file_path TEXT PRIMARY KEY, cache_name TEXT NOT NULL);
+                CREATE INDEX IF NOT EXISTS files_cache_name ON files (cache_name);
+                CREATE TABLE IF NOT EXISTS caches (
+                    cache_name TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    last_access REAL NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS caches_last_access ON caches (last_access);
+                CREATE TABLE IF NOT EXISTS sentences (
+                    key TEXT PRIMARY KEY,
+                    record BLOB NOT NULL,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    last_access REAL NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS sentences_last_access ON sentences (last_access);
+                """
+            )
+            cls.connection = connection
+            cls._import_cache_info_json()
+            return connection
+
+    @classmethod
+    def _import_cache_info_json(cls) -> None:
+        """
+        Move the entries of cache_info.json, the store of earlier versions,
+        into the database
+        """
+        if not CACHE_INFO_PATH.exists():
+            return
+        logging.debug(f"Importing cache information from {CACHE_INFO_PATH}...")
+        if os_path.getsize(CACHE_INFO_PATH) > 0:
+            fpath_cname: dict[str, str] = Ns_IO.load_json(CACHE_INFO_PATH)
+            with cls.transaction() as connection:
+                connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?)", fpath_cname.items())
+                for cache_name in set(fpath_cname.values()):
+                    cache_path = cls._name2path(cache_name)
+                    if os_path.exists(cache_path):
+                        connection.execute(
+                            "INSERT OR REPLACE INTO caches VALUES (?, ?, ?)",
+                            (cache_name, os_path.getsize(cache_path), os_path.getmtime(cache_path)),
+                        )
+        os.remove(CACHE_INFO_PATH)
+
+    @classmethod
+    @contextmanager
+    def transaction(cls) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Run several statements as one transaction, committed on exit
+        """
+        with cls.lock:
+            connection = cls.connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
 
     @classmethod
     def get_cache_path(cls, file_path: str) -> tuple[str, bool]:
@@ -299,26 +645,215 @@ class Ns_Cache:
         """
         if not os_path.isfile(file_path):
             raise FileNotFoundError(f"{file_path} is not an existing file")
-        cache_name = cls.fpath_cname.get(file_path, None)
-        if file_path not in cls.fpath_cname:
-            cache_name = cls.register_cache_name(file_path)
-            cache_path = cls._name2path(cache_name)
-            return cache_path, False
 
-        cache_name = cls.fpath_cname[file_path]
+        # A cache indexed for the path, made by the current models, and newer
+        # than the file is still the parse of its contents
+        indexed_cache_name = cls.get_cache_name(file_path)
+        if indexed_cache_name is not None and cls._name2stem(indexed_cache_name).endswith(
+            f"-{cls.get_model_tag()}"
+        ):
+            cache_path = cls._name2path(indexed_cache_name)
+            if cls.is_usable(cache_path) and os_path.getmtime(cache_path) > os_path.getmtime(file_path):
+                logging.info(f"Found cache: {cache_path} exists, and is non-empty and newer than {file_path}.")
+                cls.touch_cache(indexed_cache_name)
+                return cache_path, True
+
+        cache_name = cls._stem2name(f"{cls.get_content_hash(file_path)}-{cls.get_model_tag()}")
+        if indexed_cache_name != cache_name:
+            cls.register_cache_name(file_path, cache_name)
         cache_path = cls._name2path(cache_name)
-        if not os_path.exists(cache_path):
-            return cache_path, False
-        outdated = os_path.getmtime(cache_path) <= os_path.getmtime(file_path)
-        if outdated:
-            return cache_path, False
-        empty = os_path.getsize(cache_path) == 0
-        if empty:
+        if not cls.is_usable(cache_path):
             return cache_path, False
 
-        logging.info(f"Found cache: {cache_path} exists, and is non-empty and newer than {file_path}.")
+        logging.info(f"Found cache: {cache_path} parses the same contents as {file_path}.")
+        cls.touch_cache(cache_name)
         return cache_path, True
 
+    @classmethod
+    def get_cache_name(cls, file_path: str) -> str | None:
+        with cls.lock:
+            row = (
+                cls.connect()
+                .execute("SELECT cache_name FROM files WHERE file_path = ?", (file_path,))
+                .fetchone()
+            )
+        return None if row is None else row[0]
+
+    @classmethod
+    def touch_cache(cls, cache_name: str) -> None:
+        with cls.lock:
+            cls.connect().execute(
+                "UPDATE caches SET last_access = ? WHERE cache_name = ?", (time.time(), cache_name)
+            )
+
+    @classmethod
+    def record_cache(cls, cache_path: str) -> None:
+        """
+        Record the size of a cache file just written, and evict the least
+        recently used other caches if the total size exceeds max_size
+        """
+        if not cls.is_recording:
+            return
+        cache_name = cls._path2name(cache_path)
+        size = os_path.getsize(cache_path)
+        with cls.transaction() as connection:
+            row = connection.execute("SELECT size FROM caches WHERE cache_name = ?", (cache_name,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO caches VALUES (?, ?, ?)", (cache_name, size, time.time())
+            )
+            if cls.total_size is not None:
+                cls.total_size += size - (0 if row is None else row[0])
+        cls.evict(keep=cache_name)
+
+    @classmethod
+    def get_total_size(cls, *, is_refreshing: bool = False) -> int:
+        """
+        Total size of the recorded cache files and sentence records, kept as a
+        running total that is summed up again only if is_refreshing, e.g., to
+        take in caches recorded by other processes
+        """
+        with cls.lock:
+            if cls.total_size is None or is_refreshing:
+                cls.total_size = (
+                    cls.connect()
+                    .execute(
+                        "SELECT (SELECT COALESCE(SUM(size), 0) FROM caches)"
+                        " + (SELECT COALESCE(SUM(size), 0) FROM sentences)"
+                    )
+                    .fetchone()[0]
+                )
+            return cls.total_size
+
+    @classmethod
+    def evict(cls, *, keep: str | None = None) -> None:
+        if cls.max_size <= 0 or cls.get_total_size() <= cls.max_size:
+            return
+        with cls.transaction() as connection:
+            total_size = cls.get_total_size(is_refreshing=True)
+            evicted_cache_names: list[tuple[str]] = []
+            evicted_sentence_keys: list[tuple[str]] = []
+            # Cache files and sentence records, least recently used first
+            cursor = connection.execute(
+                "SELECT 0, cache_name, size, last_access FROM caches WHERE cache_name IS NOT ?"
+                " UNION ALL SELECT 1, key, size, last_access FROM sentences ORDER BY last_access",
+                (keep,),
+            )
+            for is_sentence, name, size, _ in cursor:
+                if total_size <= cls.max_size:
+                    break
+                (evicted_sentence_keys if is_sentence else evicted_cache_names).append((name,))
+                total_size -= size
+            cursor.close()
+            connection.executemany("DELETE FROM files WHERE cache_name = ?", evicted_cache_names)
+            connection.executemany("DELETE FROM caches WHERE cache_name = ?", evicted_cache_names)
+            connection.executemany("DELETE FROM sentences WHERE key = ?", evicted_sentence_keys)
+            cls.total_size = total_size
+
+        # Only after the entries are gone, so that no entry outlives its file
+        for (cache_name,) in evicted_cache_names:
+            cache_path = cls._name2path(cache_name)
+            if os_path.exists(cache_path):
+                os.remove(cache_path)
+        logging.info(
+            f"Evicted {len(evicted_cache_names)} least recently used cache file(s)"
+            f" and {len(evicted_sentence_keys)} sentence record(s)."
+        )
+
+    @classmethod
+    def get_content_hash(cls, file_path: str) -> str:
+        import hashlib
+
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @classmethod
+    def get_model_tag(cls) -> str:
+        if cls.model_tag is None:
+            import hashlib
+
+            from neosca.ns_nlp import Ns_NLP_Stanza
+
+            signature = Ns_NLP_Stanza.get_model_signature()
+            cls.model_tag = hashlib.sha256(signature.encode("utf-8")).hexdigest()[:12]
+        return cls.model_tag
+
+    @classmethod
+    def get_sentence_key(cls, text: str) -> str:
+        import hashlib
+
+        return hashlib.sha256(f"{cls.get_model_tag()}\0{text}".encode()).hexdigest()
+
+    @classmethod
+    def load_sentence_records(cls, keys: Iterable[str]) -> dict[str, dict]:
+        """
+        Load cached parses of sentences, see Ns_NLP_Stanza._nlp_many_by_sentence()
+        """
+        records: dict[str, dict] = {}
+        with cls.lock:
+            connection = cls.connect()
+            for chunk, placeholders in cls._yield_key_chunks(keys):
+                rows = connection.execute(
+                    f"SELECT key, record FROM sentences WHERE key IN ({placeholders})", chunk
+                )
+                records.update((key, pickle.loads(record)) for key, record in rows)
+        if records and cls.is_recording:
+            now = time.time()
+            with cls.transaction() as connection:
+                for chunk, placeholders in cls._yield_key_chunks(records):
+                    connection.execute(
+                        f"UPDATE sentences SET last_access = ? WHERE key IN ({placeholders})", (now, *chunk)
+                    )
+        return records
+
+    @classmethod
+    def save_sentence_records(cls, key_record: dict[str, dict]) -> None:
+        """
+        Record parses of sentences, and evict the least recently used caches
+        and sentence records if the total size exceeds max_size
+        """
+        if not key_record:
+            return
+        if not cls.is_recording:
+            cls.unsaved_sentence_records.update(key_record)
+            return
+        key_blob = {key: pickle.dumps(record) for key, record in key_record.items()}
+        now = time.time()
+        with cls.transaction() as connection:
+            replaced_size = sum(
+                connection.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM sentences WHERE key IN ({placeholders})", chunk
+                ).fetchone()[0]
+                for chunk, placeholders in cls._yield_key_chunks(key_blob)
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO sentences VALUES (?, ?, ?, ?)",
+                ((key, blob, len(blob), now) for key, blob in key_blob.items()),
+            )
+            if cls.total_size is not None:
+                cls.total_size += sum(map(len, key_blob.values())) - replaced_size
+        cls.evict()
+
+    @classmethod
+    def clear_sentence_records(cls) -> None:
+        with cls.transaction() as connection:
+            connection.execute("DELETE FROM sentences")
+            # Summed up again when next needed
+            cls.total_size = None
+
+    @classmethod
+    def _yield_key_chunks(cls, keys: Iterable[str]) -> Generator[tuple[list[str], str], None, None]:
+        """
+        Chunks of keys and their "?, ?, ..." placeholders for "IN (...)"
+        """
+        keys = list(keys)
+        for start in range(0, len(keys), cls.KEY_CHUNK_SIZE):
+            chunk = keys[start : start + cls.KEY_CHUNK_SIZE]
+            yield chunk, ", ".join("?" * len(chunk))
+
+    @classmethod
+    def is_usable(cls, cache_path: str) -> bool:
+        return os_path.exists(cache_path) and os_path.getsize(cache_path) > 0
+
     @classmethod
     def _size_fmt(cls, filesize: int | float, suffix: str = "B") -> str:
         # https://github.com/gaogaotiantian/viztracer/blob/3ecd46aa0e70df7dd78f720a2660d6da211c4a51/src/viztracer/util.py#L12
@@ -330,12 +865,24 @@ class Ns_Cache:
 
     @classmethod
     def yield_cname_cpath_csize_fpath(cls) -> Generator[tuple[str, str, str, str], None, None]:
-        for file_path, cache_name in Ns_Cache.fpath_cname.items():
-            cache_path = Ns_Cache._name2path(cache_name)
+        with cls.lock:
+            rows = (
+                cls.connect()
+                .execute(
+                    "SELECT files.cache_name, caches.size, files.file_path FROM files"
+                    " JOIN caches ON files.cache_name = caches.cache_name ORDER BY caches.last_access DESC"
+                )
+                .fetchall()
+            )
+        for cache_name, size, file_path in rows:
+            cache_path = cls._name2path(cache_name)
             if not os_path.exists(cache_path):
                 continue
-            cache_size = cls._size_fmt(os_path.getsize(cache_path))
-            yield cache_name, cache_path, cache_size, file_path
+            yield cache_name, cache_path, cls._size_fmt(size), file_path
+
+    @classmethod
+    def has_caches(cls) -> bool:
+        return any(cls.yield_cname_cpath_csize_fpath())
 
     @classmethod
     def _stem2name(cls, stem: str) -> str:
@@ -370,30 +917,29 @@ class Ns_Cache:
         return os_path.basename(path)
 
     @classmethod
-    def register_cache_name(cls, file_path: str) -> str:
+    def register_cache_name(cls, file_path: str, cache_name: str) -> str:
         logging.debug(f"Registering cache path for {file_path}...")
-        cache_stem = Path(file_path).stem
-        cache_stem = Ns_IO.ensure_unique_filestem(
-            cache_stem, tuple(map(cls._name2stem, cls.fpath_cname.values()))
-        )
-        cache_name = cls._stem2name(cache_stem)
-        cls.fpath_cname[file_path] = cache_name
-        if not cls.info_changed:
-            cls.info_changed = True
+        with cls.lock:
+            cls.connect().execute("INSERT OR REPLACE INTO files VALUES (?, ?)", (file_path, cache_name))
         return cache_name
 
     @classmethod
     def delete_cache_entries(cls, deleted_cache_paths: Iterable[str]) -> None:
-        logging.debug(f"Deleting cache entries from {CACHE_INFO_PATH}...")
-        deleted_cache_names = tuple(map(cls._path2name, deleted_cache_paths))
-        cls.fpath_cname = {k: v for k, v in cls.fpath_cname.items() if v not in deleted_cache_names}
-        if not cls.info_changed:
-            cls.info_changed = True
+        logging.debug(f"Deleting cache entries from {CACHE_DB_PATH}...")
+        deleted_cache_names = [(name,) for name in map(cls._path2name, deleted_cache_paths)]
+        with cls.transaction() as connection:
+            connection.executemany("DELETE FROM files WHERE cache_name = ?", deleted_cache_names)
+            connection.executemany("DELETE FROM caches WHERE cache_name = ?", deleted_cache_names)
+            # Summed up again when next needed
+            cls.total_size = None
 
     @classmethod
     def save_cache_info(cls) -> None:
-        if cls.info_changed:
-            logging.debug(f"Saving cache information to {CACHE_INFO_PATH}...")
-            Ns_IO.dump_json(cls.fpath_cname, CACHE_INFO_PATH)
-        else:
-            logging.debug("No new cache information to save.")
+        """
+        Close the database at exit, each change has been committed already
+        """
+        with cls.lock:
+            if cls.connection is not None:
+                logging.debug(f"Closing cache information at {CACHE_DB_PATH}...")
+                cls.connection.close()
+                cls.connection = None
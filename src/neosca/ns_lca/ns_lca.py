@@ -3,15 +3,22 @@
 import logging
 import os
 import os.path as os_path
-import sys
+from collections.abc import Generator
+from contextlib import nullcontext
 from typing import Literal
 
 from neosca.ns_io import Ns_Cache, Ns_IO
 from neosca.ns_lca.ns_lca_counter import Ns_LCA_Counter
+from neosca.ns_parse_pool import Ns_Parse_Pool, Ns_Run_Mixin
 from neosca.ns_utils import Ns_Procedure_Result
 
 
-class Ns_LCA:
+class Ns_LCA(Ns_Run_Mixin):
+    ANALYZER_NAME = "lca"
+    RUN_CONFIG_ATTRS = ("wordlist", "tagset", "easy_word_threshold", "section_size", "ndw_trials", "precision")
+    PARSE_FILE_METHOD_NAME = "get_lempos_frm_cache_or_file"
+    PARSE_TEXTS_METHOD_NAME = "get_lempos_frm_texts"
+
     def __init__(
         self,
         wordlist: str = "bnc",
@@ -28,6 +35,11 @@ class Ns_LCA:
         is_stdout: bool = False,
         is_save_matches: bool = False,
         is_save_values: bool = True,
+        is_counting_only: bool = False,
+        is_streaming: bool = False,
+        is_resuming: bool = False,
+        jobs: int = 1,
+        batch_size: int = 1,
     ) -> None:
         assert wordlist in ("bnc", "anc")
         assert tagset in ("ud", "ptb")
@@ -49,6 +61,20 @@ class Ns_LCA:
         self.is_use_cache = is_use_cache
         self.is_save_matches = is_save_matches
         self.is_save_values = is_save_values
+        # Keep only the counts of lemmas, not the lemmas themselves, for runs
+        # where matches are neither saved nor shown
+        self.is_counting_only = is_counting_only
+        # Write the values and matches of each file once it is processed, and
+        # release its counter, instead of keeping all of them in self.counters
+        self.is_streaming = is_streaming
+        # Skip files whose values a previous, interrupted run has written, as
+        # recorded in the manifest next to ofile_freq
+        self.is_resuming = is_resuming
+        # Number of processes to parse files in, see Ns_Parse_Pool
+        self.jobs = jobs
+        # Number of files sent to the Stanza pipeline at once
+        self.batch_size = batch_size
+        self.parse_pool: Ns_Parse_Pool | None = None
 
         self.counters: list[Ns_LCA_Counter] = []
 
@@ -58,9 +84,24 @@ class Ns_LCA:
         return Ns_NLP_Stanza.get_lemma_and_pos(text, tagset=self.tagset, cache_path=cache_path)
 
     def get_lempos_frm_file(self, file_path: str, /) -> tuple[tuple[str, str], ...]:
-        from neosca.ns_nlp import Ns_NLP_Stanza
+        if self.parse_pool is not None:
+            return self.parse_pool.take(file_path)
 
         cache_path, is_cache_available = Ns_Cache.get_cache_path(file_path)
+        return self.get_lempos_frm_cache_or_file(file_path, cache_path, is_cache_available)
+
+    def get_lempos_frm_texts(
+        self, texts: list[str], *, cache_paths: list[str | None] | None = None
+    ) -> list[tuple[tuple[str, str], ...]]:
+        from neosca.ns_nlp import Ns_NLP_Stanza
+
+        return Ns_NLP_Stanza.get_lemmas_and_poses(texts, tagset=self.tagset, cache_paths=cache_paths)
+
+    def get_lempos_frm_cache_or_file(
+        self, file_path: str, cache_path: str, is_cache_available: bool
+    ) -> tuple[tuple[str, str], ...]:
+        from neosca.ns_nlp import Ns_NLP_Stanza
+
         # Use cache
         if self.is_use_cache and is_cache_available:
             logging.info(f"Loading cache: {cache_path}.")
@@ -74,7 +115,7 @@ class Ns_LCA:
             cache_path: str | None = None  # type: ignore
 
         try:
-            return self.get_lempos_frm_text(text)
+            return self.get_lempos_frm_text(text, cache_path=cache_path)
         except BaseException as e:
             # If cache is generated at current run, remove it as it is potentially broken
             if cache_path is not None and os_path.exists(cache_path) and not is_cache_available:
@@ -89,6 +130,7 @@ class Ns_LCA:
             easy_word_threshold=self.easy_word_threshold,
             section_size=self.section_size,
             ndw_trials=self.ndw_trials,
+            is_counting_only=self.is_counting_only,
         )
 
     def run_on_text(self, text: str, *, file_path: str = "cli_text", clear: bool = True) -> None:
@@ -115,10 +157,13 @@ class Ns_LCA:
             subfiles = file_or_subfiles
             total = len(subfiles)
             counter = self.init_new_counter()
-            for i, subfile in enumerate(subfiles, 1):
-                logging.info(f'Processing "{subfile}" ({i}/{total})...')
-                child_counter = self.run_on_file_or_subfiles(subfile)
-                counter += child_counter
+
+            def yield_child_counters() -> Generator[Ns_LCA_Counter, None, None]:
+                for i, subfile in enumerate(subfiles, 1):
+                    logging.info(f'Processing "{subfile}" ({i}/{total})...')
+                    yield self.run_on_file_or_subfiles(subfile)
+
+            counter.merge_from(yield_child_counters())
         else:
             raise ValueError(f"file_or_subfiles {file_or_subfiles} is neither str nor list")
         return counter
@@ -129,9 +174,23 @@ class Ns_LCA:
         if clear:
             self.counters.clear()
 
-        for file_or_subfiles in file_or_subfiles_list:
-            counter = self.run_on_file_or_subfiles(file_or_subfiles)
-            self.counters.append(counter)
+        if self.is_streaming:
+            with self.open_values_writer() if self.is_save_values else nullcontext() as writer:
+                if writer is not None:
+                    file_or_subfiles_list = writer.filter_unfinished(file_or_subfiles_list)
+                with self.open_parse_pool(file_or_subfiles_list):
+                    for file_or_subfiles in file_or_subfiles_list:
+                        counter = self.run_on_file_or_subfiles(file_or_subfiles)
+                        if self.is_save_matches:
+                            counter.dump_matches(self.odir_matched, self.is_stdout)
+                        if writer is not None:
+                            writer.write(counter.get_all_values(self.precision), file_or_subfiles)
+            return
+
+        with self.open_parse_pool(file_or_subfiles_list):
+            for file_or_subfiles in file_or_subfiles_list:
+                counter = self.run_on_file_or_subfiles(file_or_subfiles)
+                self.counters.append(counter)
 
         if self.is_save_matches:
             self.dump_matches()
@@ -144,28 +203,9 @@ class Ns_LCA:
         if len(self.counters) == 0:
             raise ValueError("empty counter list")
 
-        value_tables: list[dict[str, str]] = [
-            counter.get_all_values(self.precision) for counter in self.counters
-        ]
-
-        handle = sys.stdout if self.is_stdout else open(self.ofile_freq, "w", encoding="utf-8", newline="")  # noqa: SIM115
-
-        if self.oformat_freq == "csv":
-            import csv
-
-            fieldnames = value_tables[0].keys()
-            csv_writer = csv.DictWriter(handle, fieldnames=fieldnames)
-
-            csv_writer.writeheader()
-            csv_writer.writerows(value_tables)
-        elif self.oformat_freq == "json":
-            import json
-
-            json.dump(value_tables, handle, ensure_ascii=False, indent=2)
-        else:
-            raise ValueError(f'oformat_freq {self.oformat_freq} not in ("csv", "json")')
-
-        handle.close()
+        with self.open_values_writer() as writer:
+            for counter in self.counters:
+                writer.write(counter.get_all_values(self.precision))
 
     def dump_matches(self) -> None:
         for counter in self.counters:
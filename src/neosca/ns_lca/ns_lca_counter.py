@@ -6,8 +6,8 @@ import os.path as os_path
 import random
 import shutil
 import sys
-from collections import OrderedDict
-from collections.abc import Sequence
+from collections import Counter, OrderedDict
+from collections.abc import Iterable, Sequence
 from math import sqrt as _sqrt
 from typing import Literal
 
@@ -74,10 +74,23 @@ class Ns_LCA_Counter:
         easy_word_threshold: int = 2000,
         section_size: int = 50,
         ndw_trials: int = 10,
+        is_counting_only: bool = False,
     ) -> None:
+        """
+        :param is_counting_only: keep the counts of lemmas instead of the lemmas
+            themselves, except for words, whose order is needed by NDW and MSTTR
+        """
         self.file_path = file_path
+        self.is_counting_only = is_counting_only
 
-        self.count_table: dict[str, list[str]] = {item: [] for item in self.COUNT_ITEMS}
+        # Counts of the lemmas of each item when counting only, the lemmas
+        # themselves in count_table otherwise
+        self.count_freqs: dict[str, Counter[str]] = (
+            {item: Counter() for item in self.COUNT_ITEMS if item != "word"} if is_counting_only else {}
+        )
+        self.count_table: dict[str, list[str]] = {
+            item: [] for item in self.COUNT_ITEMS if item not in self.count_freqs
+        }
         self.freq_table: dict[str, int | float | None] = {item: None for item in self.FREQ_ITEMS}
 
         word_data_path = DATA_DIR / self.WORDLIST_DATAFILE_MAP[wordlist]
@@ -139,13 +152,26 @@ class Ns_LCA_Counter:
         return safe_div(msttr, sample_no)
 
     def determine_counts(self, lempos_tuples: tuple[tuple[str, str], ...]):
+        count_table = self.count_table
+        # When counting only, lemmas are counted as they are classified
+        # instead of being kept
+        if self.is_counting_only:
+            count_freqs = self.count_freqs
+
+            def add(item: str, lemma: str) -> None:
+                count_freqs[item][lemma] += 1
+        else:
+
+            def add(item: str, lemma: str) -> None:
+                count_table[item].append(lemma)
+
         filtered_lempos_tuples = tuple(
             filter(lambda lempos: not self.word_classifier.is_("misc", *lempos), lempos_tuples)
         )
         try:
-            self.count_table["word"] = list(next(zip(*filtered_lempos_tuples, strict=False)))
+            count_table["word"] = list(next(zip(*filtered_lempos_tuples, strict=False)))
         except StopIteration:
-            self.count_table["word"] = []
+            count_table["word"] = []
 
         for lemma, pos in filtered_lempos_tuples:
             is_sophisticated = False
@@ -153,53 +179,53 @@ class Ns_LCA_Counter:
             is_verb = False
 
             if self.word_classifier.is_("noun", lemma, pos):
-                self.count_table["noun"].append(lemma)
+                add("noun", lemma)
                 logging.debug(f'Counted "{lemma}" as a noun')
 
-                self.count_table["lex"].append(lemma)
+                add("lex", lemma)
                 logging.debug(f'Counted "{lemma}" as a lexical word')
 
                 is_lexical = True
 
             elif self.word_classifier.is_("adj", lemma, pos):
-                self.count_table["adj"].append(lemma)
+                add("adj", lemma)
                 logging.debug(f'Counted "{lemma}" as an adjective')
 
-                self.count_table["lex"].append(lemma)
+                add("lex", lemma)
                 logging.debug(f'Counted "{lemma}" as a lexical word')
 
                 is_lexical = True
 
             elif self.word_classifier.is_("adv", lemma, pos):
-                self.count_table["adv"].append(lemma)
+                add("adv", lemma)
                 logging.debug(f'Counted "{lemma}" as an adverb')
 
-                self.count_table["lex"].append(lemma)
+                add("lex", lemma)
                 logging.debug(f'Counted "{lemma}" as a lexical word')
 
                 is_lexical = True
 
             elif self.word_classifier.is_("verb", lemma, pos):
-                self.count_table["verb"].append(lemma)
+                add("verb", lemma)
                 logging.debug(f'Counted "{lemma}" as a verb')
 
-                self.count_table["lex"].append(lemma)
+                add("lex", lemma)
                 logging.debug(f'Counted "{lemma}" as a lexical word')
 
                 is_lexical = True
                 is_verb = True
 
             if self.word_classifier.is_("sword", lemma, pos):
-                self.count_table["sword"].append(lemma)
+                add("sword", lemma)
                 logging.debug(f'Counted "{lemma}" as a sophisticated word')
 
                 is_sophisticated = True
 
             if is_lexical and is_sophisticated:
-                self.count_table["slex"].append(lemma)
+                add("slex", lemma)
                 logging.debug(f'Counted "{lemma}" as a sophisticated lexical word')
                 if is_verb:
-                    self.count_table["sverb"].append(lemma)
+                    add("sverb", lemma)
                     logging.debug(f'Counted "{lemma}" as a sophisticated verb')
 
     def determine_freqs(self, *, section_size: int | None = None) -> None:
@@ -279,10 +305,11 @@ class Ns_LCA_Counter:
 
     def get_value(self, key: str, /, precision: int = 4) -> int | float:
         if (trimmed_key := key.removesuffix("types").removesuffix("tokens")) in self.COUNT_ITEMS:
+            freqs = self.count_freqs.get(trimmed_key)
             if key.endswith("types"):
-                return len(set(self.count_table[trimmed_key]))
+                return len(freqs) if freqs is not None else len(set(self.count_table[trimmed_key]))
             elif key.endswith("tokens"):
-                return len(self.count_table[trimmed_key])
+                return freqs.total() if freqs is not None else len(self.count_table[trimmed_key])
             else:
                 assert False, f"Unknown key: {key}"
         elif key in self.FREQ_ITEMS:
@@ -293,6 +320,8 @@ class Ns_LCA_Counter:
 
     def get_matches(self, key: str, /) -> list[str]:
         if (trimmed_key := key.removesuffix("types").removesuffix("tokens")) in self.COUNT_ITEMS:
+            if self.is_counting_only:
+                return []
             if key.endswith("types"):
                 return list(dict.fromkeys(self.count_table[trimmed_key]))
             elif key.endswith("tokens"):
@@ -332,12 +361,31 @@ class Ns_LCA_Counter:
             else:
                 sys.stdout.write(f"{matches_id}\n\n{res}\n")
 
-    def __add__(self, other: "Ns_LCA_Counter") -> "Ns_LCA_Counter":
+    def merge_from(self, others: Iterable["Ns_LCA_Counter"]) -> None:
+        """
+        Append the words counted by other counters, e.g., those of the subfiles
+        of a file, to this one, and then re-calculate the frequencies once.
+        Linear in the total number of words, unlike summing counters pairwise.
+        """
         logging.debug("Combining counters...")
-        new_file_path = self.file_path + "+" + other.file_path if self.file_path else other.file_path
-        new = Ns_LCA_Counter(new_file_path)
-        for item in new.COUNT_ITEMS:
-            new.count_table[item] = self.count_table[item] + other.count_table[item]
-        new.determine_freqs()
+        file_paths = [self.file_path] if self.file_path else []
+        for other in others:
+            if file_paths or other.file_path:
+                file_paths.append(other.file_path)
+            for item, freqs in self.count_freqs.items():
+                if (other_freqs := other.count_freqs.get(item)) is not None:
+                    freqs.update(other_freqs)
+                else:
+                    freqs.update(other.count_table[item])
+            for item, lemmas in self.count_table.items():
+                if (other_freqs := other.count_freqs.get(item)) is not None:
+                    lemmas.extend(other_freqs.elements())
+                else:
+                    lemmas.extend(other.count_table[item])
+        self.file_path = "+".join(file_paths)
+        self.determine_freqs()
 
+    def __add__(self, other: "Ns_LCA_Counter") -> "Ns_LCA_Counter":
+        new = Ns_LCA_Counter(is_counting_only=self.is_counting_only and other.is_counting_only)
+        new.merge_from((self, other))
         return new
@@ -36,6 +36,72 @@ class Ns_Main_Cli:
             help="enable verbose loggings",
         )
 
+    def __add_run_options(self, parser: argparse.ArgumentParser) -> None:
+        """
+        Options of how files are parsed, cached, and resumed, checked by
+        check_run_options()
+        """
+        parser.add_argument(
+            "--jobs",
+            "-j",
+            metavar="<N>",
+            dest="jobs",
+            type=int,
+            default=1,
+            help=(
+                "Parse files in N processes, each loading its own Stanza models. The default is 1."
+                " Use 0 for one process per CPU core."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            metavar="<N>",
+            dest="batch_size",
+            type=int,
+            default=16,
+            help=(
+                "Number of files sent to Stanza at once, so that its batches are filled with sentences"
+                " across files. The default is 16."
+            ),
+        )
+        parser.add_argument(
+            "--cache-max-size",
+            metavar="<MiB>",
+            dest="cache_max_size",
+            type=int,
+            default=0,
+            help=(
+                "Maximum total size of cache files in MiB. Least recently used cache files are"
+                " deleted once it is exceeded. The default is 0, for unlimited."
+            ),
+        )
+        parser.add_argument(
+            "--resume",
+            dest="is_resuming",
+            action="store_true",
+            default=False,
+            help=(
+                "Resume an interrupted run. Files whose values were written by a previous run with"
+                " the same settings, and which have not changed since, are skipped, and the values"
+                " of the other files are appended to the output file. Finished files are recorded"
+                " in <output-file>.manifest.jsonl."
+            ),
+        )
+
+    def check_run_options(self, options: argparse.Namespace) -> Ns_Procedure_Result:
+        if options.jobs < 0:
+            return False, "--jobs must not be negative."
+        if options.jobs == 0:
+            options.jobs = os.cpu_count() or 1
+
+        if options.batch_size < 1:
+            return False, "--batch-size must be at least 1."
+        if options.cache_max_size < 0:
+            return False, "--cache-max-size must not be negative."
+        # MiB -> bytes
+        Ns_Cache.max_size = options.cache_max_size * 1024**2
+        return True, None
+
     def create_args_parser(self) -> argparse.ArgumentParser:
         parser = argparse.ArgumentParser(prog="nsca", formatter_class=argparse.RawDescriptionHelpFormatter)
         parser.add_argument(
@@ -100,9 +166,9 @@ class Ns_Main_Cli:
         sca_parser.add_argument(
             "--output-format",
             dest="oformat_freq",
-            choices=["csv", "json"],
+            choices=["csv", "json", "jsonl", "npy"],
             default="csv",
-            help='Output format, the default is "csv".',
+            help='Output format, the default is "csv". "npy" saves a NumPy structured array.',
         )
         sca_parser.add_argument(
             "--stdout",
@@ -138,6 +204,7 @@ class Ns_Main_Cli:
             default=False,
             help="Use cache if available.",
         )
+        self.__add_run_options(sca_parser)
         sca_parser.add_argument(
             "--save-matches",
             "-m",
@@ -160,6 +227,16 @@ class Ns_Main_Cli:
                 " flags will be automatically set as False."
             ),
         )
+        sca_parser.add_argument(
+            "--explain",
+            dest="is_explain",
+            action="store_true",
+            default=False,
+            help=(
+                "Print how the structures of the selected measures are searched for, including"
+                " the order in which the checks of user-defined Tregex patterns run, and exit."
+            ),
+        )
         # parser_sca.add_argument(
         #     "--config",
         #     dest="config",
@@ -220,7 +297,7 @@ class Ns_Main_Cli:
         lca_parser.add_argument(
             "--output-format",
             dest="oformat_freq",
-            choices=["csv", "json"],
+            choices=["csv", "json", "jsonl"],
             default="csv",
             help='Output format, the default is "csv".',
         )
@@ -252,6 +329,7 @@ class Ns_Main_Cli:
             default=False,
             help="Use cache if available.",
         )
+        self.__add_run_options(lca_parser)
         lca_parser.add_argument(
             "--save-matches",
             "-m",
@@ -287,10 +365,10 @@ class Ns_Main_Cli:
         if options.ofile_freq is not None:
             self.odir_matched = os_path.splitext(options.ofile_freq)[0] + "_matches"
             ofile_freq_ext = Ns_IO.suffix(options.ofile_freq, strip_dot=True)
-            if ofile_freq_ext not in ("csv", "json"):
+            if ofile_freq_ext not in ("csv", "json", "jsonl", "npy"):
                 return (
                     False,
-                    f"The file extension {ofile_freq_ext} is not supported. Use one of the following:\n1. csv\n2. json",
+                    f"The file extension {ofile_freq_ext} is not supported. Use one of the following:\n1. csv\n2. json\n3. jsonl\n4. npy",
                 )
             if ofile_freq_ext != options.oformat_freq:
                 logging.debug(
@@ -300,6 +378,9 @@ class Ns_Main_Cli:
         else:
             options.ofile_freq = f"neosca_sca_results.{options.oformat_freq}"
 
+        if options.is_resuming and (options.is_stdout or options.oformat_freq == "npy"):
+            return False, "--resume works only when writing csv, json, or jsonl values to a file."
+
         if options.selected_measures is not None:
             # Drop duplicates while retain order. Starting from Python 3.7, the
             # built-in dictionary is guaranteed to maintain the insertion order
@@ -321,6 +402,10 @@ class Ns_Main_Cli:
             else:
                 logging.debug("No configuration file found")
 
+        sucess, err_msg = self.check_run_options(options)
+        if not sucess:
+            return sucess, err_msg
+
         self.init_kwargs = {
             "ofile_freq": options.ofile_freq,
             "oformat_freq": options.oformat_freq,
@@ -329,6 +414,11 @@ class Ns_Main_Cli:
             "is_cache": options.is_cache,
             "is_use_cache": options.is_use_cache,
             "is_save_matches": options.is_save_matches,
+            "is_counting_only": not options.is_save_matches,
+            "is_streaming": True,
+            "is_resuming": options.is_resuming,
+            "jobs": options.jobs,
+            "batch_size": options.batch_size,
             "is_stdout": options.is_stdout,
             "is_skip_parsing": options.is_skip_parsing,
             "config": user_config,
@@ -340,10 +430,10 @@ class Ns_Main_Cli:
         if options.ofile_freq is not None:
             self.odir_matched = os_path.splitext(options.ofile_freq)[0] + "_matches"
             ofile_freq_ext = Ns_IO.suffix(options.ofile_freq, strip_dot=True)
-            if ofile_freq_ext not in ("csv", "json"):
+            if ofile_freq_ext not in ("csv", "json", "jsonl"):
                 return (
                     False,
-                    f"The file extension {ofile_freq_ext} is not supported. Use one of the following:\n1. csv\n2. json",
+                    f"The file extension {ofile_freq_ext} is not supported. Use one of the following:\n1. csv\n2. json\n3. jsonl",
                 )
             if ofile_freq_ext != options.oformat_freq:
                 logging.debug(
@@ -353,6 +443,9 @@ class Ns_Main_Cli:
         else:
             options.ofile_freq = f"neosca_lca_results.{options.oformat_freq}"
 
+        if options.is_resuming and options.is_stdout:
+            return False, "--resume works only when writing values to a file."
+
         if options.text is not None:
             logging.debug(f"CLI text: {options.text}")
 
@@ -361,6 +454,10 @@ class Ns_Main_Cli:
         else:
             self.verified_subfiles_list = Ns_IO.get_verified_subfiles_list(options.subfiles_list)
 
+        sucess, err_msg = self.check_run_options(options)
+        if not sucess:
+            return sucess, err_msg
+
         self.init_kwargs = {
             "wordlist": options.wordlist,
             "tagset": options.tagset,
@@ -371,6 +468,11 @@ class Ns_Main_Cli:
             "is_cache": options.is_cache,
             "is_use_cache": options.is_use_cache,
             "is_save_matches": options.is_save_matches,
+            "is_counting_only": not options.is_save_matches,
+            "is_streaming": True,
+            "is_resuming": options.is_resuming,
+            "jobs": options.jobs,
+            "batch_size": options.batch_size,
         }
         return True, None
 
@@ -383,9 +485,9 @@ class Ns_Main_Cli:
         else:
             options, ifile_list = self.args_parser.parse_known_args(argv[1:])
 
-        assert not (
-            options.is_quiet and options.is_verbose
-        ), "logging cannot be quiet and verbose at the same time"
+        assert not (options.is_quiet and options.is_verbose), (
+            "logging cannot be quiet and verbose at the same time"
+        )
         if options.is_quiet:
             logging.basicConfig(format="%(message)s", level=logging.CRITICAL)
         elif options.is_verbose:
@@ -396,7 +498,9 @@ class Ns_Main_Cli:
         self.verified_ifiles = Ns_IO.get_verified_ifile_list(ifile_list)
 
         if (func := getattr(options, "func", None)) is not None:
-            func(options)
+            sucess, err_msg = func(options)
+            if not sucess:
+                return sucess, err_msg
 
         self.options = options
         return True, None
@@ -486,6 +590,8 @@ class Ns_Main_Cli:
             return self.run_gui()
         elif getattr(self.options, "list_fields", False):
             return self.options.analyzer_class.list_fields()
+        elif getattr(self.options, "is_explain", False):
+            return self.options.analyzer_class(**self.init_kwargs).explain_patterns()
         elif (
             getattr(self, "verified_ifiles", False)
             or getattr(self, "verified_subfiles_list", False)
@@ -69,6 +69,8 @@ class Ns_Main_Gui(QMainWindow):
         self.setup_tray()
         self.fix_macos_layout(self)
         self.setup_statusbar()
+        # MiB -> bytes
+        Ns_Cache.max_size = Ns_Settings.value("Miscellaneous/cache-max-size", type=int) * 1024**2
 
     def setup_statusbar(self) -> None:
         height_pt = Ns_Settings.value("Appearance/font-size", type=int)
@@ -200,13 +202,13 @@ class Ns_Main_Gui(QMainWindow):
         self.table_file.add_file_paths(file_paths)
 
     def menu_files_clear_cache(self):
-        if any(Ns_Cache.yield_cname_cpath_csize_fpath()):
+        if Ns_Cache.has_caches():
             Ns_Dialog_Table_Cache(self).open()
         else:
             QMessageBox.information(self, "No Caches", "There are no caches to clear.")
 
     def menu_files_about_to_show(self):
-        if any(Ns_Cache.yield_cname_cpath_csize_fpath()):
+        if Ns_Cache.has_caches():
             self.action_clear_cache.setEnabled(True)
         else:
             self.action_clear_cache.setEnabled(False)
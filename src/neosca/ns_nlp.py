@@ -3,54 +3,135 @@
 import logging
 import lzma
 import pickle
-from collections.abc import Sequence
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
 from typing import Any, Literal
 
-from stanza import Document
+from stanza import Document, Pipeline
 
 from neosca.ns_consts import STANZA_MODEL_DIR
-from neosca.ns_io import Ns_IO
+from neosca.ns_io import Ns_Cache, Ns_IO
 
 
 class Ns_NLP_Stanza:
     # Stores all processors needed in the whole application
     processors: tuple = ("tokenize", "mwt", "pos", "lemma", "constituency")
+    # Loaded whatever the analysis, the others are loaded when first needed
+    base_processors: tuple = ("tokenize", "mwt")
+    # Set by initialize()
+    pipeline: Pipeline
+    # Processors in the current pipeline
+    loaded_processors: tuple = ()
+    # Bytes of model weights of each loaded processor
+    processor_sizes: dict[str, int] = {}
+    # Whether to cache the parse of each sentence of documents that are cached,
+    # so that only new or changed sentences are parsed after an edit
+    is_caching_sentences: bool = True
+    # Parses of the sentences processed since start_reusing_sentences(), so
+    # that sentences repeated across documents are parsed once, None if not
+    # reusing sentences. The least recently used are dropped beyond
+    # max_sentence_records, which keeps memory flat on large corpora.
+    sentence_records: OrderedDict[str, dict] | None = None
+    max_sentence_records: int = 20_000
+    n_sentences: int = 0
+    n_parsed_sentences: int = 0
+    lang: str = "en"
+    model_dir: str = str(STANZA_MODEL_DIR)
 
     @classmethod
-    def initialize(cls, lang: str | None = None, model_dir: str | None = None) -> None:
+    def initialize(
+        cls, lang: str | None = None, model_dir: str | None = None, processors: Iterable[str] | None = None
+    ) -> None:
         import stanza
 
         if lang is None:
-            lang = "en"
+            lang = cls.lang
+        cls.lang = lang
         if model_dir is None:
-            model_dir = str(STANZA_MODEL_DIR)
+            model_dir = cls.model_dir
+        cls.model_dir = model_dir
+        # In the order they run in
+        if processors is None:
+            processors = cls.processors
+        else:
+            processors = tuple(p for p in cls.processors if p in set(processors))
 
-        logging.debug("Loading Stanza processors...")
+        logging.debug(f"Loading Stanza processors {', '.join(processors)}...")
+        start_time = time.perf_counter()
         cls.pipeline = stanza.Pipeline(  # type: ignore
             lang=lang,
             dir=model_dir,
-            processors=cls.processors,
+            processors=processors,
             verbose=False,
             # https://github.com/stanfordnlp/stanza/issues/331
             resources_url="stanford",
             download_method=None,
         )
+        elapsed = time.perf_counter() - start_time
+        cls.loaded_processors = processors
+
+        cls.processor_sizes = {
+            name: cls._get_model_size(processor)
+            for name, processor in cls.pipeline.processors.items()  # type: ignore
+        }
+        sizes = ", ".join(f"{name} {size / 1024**2:.1f} MiB" for name, size in cls.processor_sizes.items())
+        logging.info(f"Loaded Stanza processors in {elapsed:.1f} s, model sizes: {sizes}")
+
+    @classmethod
+    def load_processors(cls, processors: Iterable[str]) -> None:
+        """
+        Reload the pipeline with the given processors if it lacks any of them,
+        keeping those already loaded
+        """
+        processors = set(processors)
+        if hasattr(cls, "pipeline") and processors.issubset(cls.loaded_processors):
+            return
+        cls.initialize(processors=processors.union(cls.base_processors, cls.loaded_processors))
+
+    @classmethod
+    def _get_model_size(cls, processor: Any) -> int:
+        """
+        Bytes of the parameters and buffers of the PyTorch modules of a
+        processor, which keeps them as attributes or attributes of its trainer
+        """
+        import torch
+
+        modules: list[torch.nn.Module] = []
+        for attr in vars(processor).values():
+            if isinstance(attr, torch.nn.Module):
+                modules.append(attr)
+            elif hasattr(attr, "__dict__"):
+                modules.extend(v for v in vars(attr).values() if isinstance(v, torch.nn.Module))
+
+        tensors = {
+            id(tensor): tensor for module in modules for tensor in (*module.parameters(), *module.buffers())
+        }
+        return sum(tensor.numel() * tensor.element_size() for tensor in tensors.values())
 
     @classmethod
-    def _nlp(cls, doc, processors: Sequence[str] | None = None) -> Document:
-        assert isinstance(doc, (str, Document))
+    def get_model_signature(cls) -> str:
+        """
+        Identify the models that documents are processed with, parses made by
+        different models are cached separately
+        """
+        import stanza
 
-        attr = "pipeline"
-        if not hasattr(cls, attr):
-            cls.initialize()
-        assert hasattr(cls, attr)
+        return f"stanza {stanza.__version__} {cls.lang} {'+'.join(cls.processors)}"
 
+    @classmethod
+    def _nlp_many(
+        cls, docs: Sequence[str | Document], processors: Sequence[str] | None = None
+    ) -> list[Document]:
         if processors is None:
             processors = cls.processors
+        cls.load_processors(processors)
 
-        doc = cls.pipeline(doc, processors=processors)  # type: ignore
-        doc.processors = set(processors)
-        return doc
+        # The processors batch sentences across documents
+        processed_docs: list[Document] = list(cls.pipeline.bulk_process(docs, processors=processors))
+        for doc in processed_docs:
+            doc.processors = set(processors)
+        return processed_docs
 
     @classmethod
     def nlp(
@@ -59,32 +140,218 @@ class Ns_NLP_Stanza:
         processors: tuple | None = None,
         cache_path: str | None = None,
     ) -> Document:
-        has_just_processed: bool = False
+        return cls.nlp_many((doc,), processors=processors, cache_paths=(cache_path,))[0]
 
+    @classmethod
+    def nlp_many(
+        cls,
+        docs: Sequence[str | Document],
+        processors: tuple | None = None,
+        cache_paths: Sequence[str | None] | None = None,
+    ) -> list[Document]:
+        """
+        Process many documents in one call to the pipeline, and cache each
+        document that has just been processed to its cache path
+        """
         if processors is None:
             processors = cls.processors
+        if cache_paths is None:
+            cache_paths = (None,) * len(docs)
+        assert len(cache_paths) == len(docs)
 
-        if isinstance(doc, str):
-            logging.debug("Processing bare text...")
-            doc = cls._nlp(doc, processors=processors)
-            has_just_processed = True
-        else:
-            attr = "processors"
+        processed_docs = list(docs)
+        attr = "processors"
+        # Documents are processed together if they need the same processors
+        missing_processors_indices: dict[frozenset[str], list[int]] = {}
+        for i, doc in enumerate(docs):
             existing_processors = set(getattr(doc, attr)) if hasattr(doc, attr) else set()
-            filtered_processors = set(processors) - existing_processors
-            if filtered_processors:
-                logging.debug(
-                    f"Processing partially parsed document with additional processors {filtered_processors}"
+            if missing_processors := frozenset(set(processors) - existing_processors):
+                missing_processors_indices.setdefault(missing_processors, []).append(i)
+
+        # Load every processor the groups need at once, rather than
+        # rebuilding the pipeline for a group that needs one more, e.g., after
+        # tokenizing texts that are parsed by sentence
+        if missing_processors_indices:
+            cls.load_processors(frozenset().union(*missing_processors_indices))
+
+        for missing_processors, indices in missing_processors_indices.items():
+            logging.debug(f"Processing {len(indices)} document(s) with processors {set(missing_processors)}...")
+            existing_processors_list = [
+                set(getattr(docs[i], attr)) if hasattr(docs[i], attr) else set() for i in indices
+            ]
+            # Keep the order of the processors for bare texts
+            group_processors = tuple(p for p in processors if p in missing_processors)
+            # Bare texts to be cached reuse the parses of their cached sentences,
+            # and all bare texts those of sentences processed earlier in the run
+            sentence_indices = [
+                i
+                for i in indices
+                if isinstance(docs[i], str)
+                and (
+                    cls.sentence_records is not None
+                    or (cls.is_caching_sentences and cache_paths[i] is not None)
+                )
+            ]
+            other_indices = [i for i in indices if i not in sentence_indices]
+            index_doc: dict[int, Document] = {}
+            if other_indices:
+                other_docs = cls._nlp_many([docs[i] for i in other_indices], group_processors)
+                index_doc.update(zip(other_indices, other_docs, strict=True))
+            if sentence_indices:
+                texts: list[str] = [docs[i] for i in sentence_indices]  # type: ignore
+                is_caching = cls.is_caching_sentences and any(
+                    cache_paths[i] is not None for i in sentence_indices
                 )
-                doc = cls._nlp(doc, processors=tuple(filtered_processors))
-                setattr(doc, attr, existing_processors | filtered_processors)
-                has_just_processed = True
+                sentence_docs = cls._nlp_many_by_sentence(texts, group_processors, is_caching=is_caching)
+                index_doc.update(zip(sentence_indices, sentence_docs, strict=True))
+            group_docs = [index_doc[i] for i in indices]
 
-        if has_just_processed and cache_path is not None:
-            logging.debug(f"Caching document to {cache_path}...")
-            Ns_IO.dump_bytes(lzma.compress(cls.doc2serialized(doc)), cache_path)
+            for i, doc, existing_processors in zip(indices, group_docs, existing_processors_list, strict=True):
+                setattr(doc, attr, existing_processors | missing_processors)
+                processed_docs[i] = doc
+                if (cache_path := cache_paths[i]) is not None:
+                    logging.debug(f"Caching document to {cache_path}...")
+                    Ns_IO.dump_bytes(lzma.compress(cls.doc2serialized(doc)), cache_path)
+                    Ns_Cache.record_cache(cache_path)
 
-        return doc
+        return processed_docs
+
+    @classmethod
+    def _nlp_many_by_sentence(
+        cls, texts: Sequence[str], processors: Sequence[str], *, is_caching: bool = True
+    ) -> list[Document]:
+        """
+        Process bare texts, running the processors after tokenize only once
+        on each unique sentence that has no parse from earlier in the run or,
+        if is_caching, from the cache, e.g., those edited since the texts
+        were last processed
+        """
+        tokenized_docs = cls._nlp_many(texts, processors=("tokenize",))
+        sentence_processors = set(processors) - {"tokenize"}
+        if not sentence_processors:
+            return tokenized_docs
+
+        doc_sentence_dicts: list[list[list[dict]]] = []
+        doc_sentence_keys: list[list[str]] = []
+        for doc in tokenized_docs:
+            doc_sentence_dicts.append([sentence.to_dict() for sentence in doc.sentences])
+            doc_sentence_keys.append([Ns_Cache.get_sentence_key(sentence.text) for sentence in doc.sentences])
+        all_keys = {key for keys in doc_sentence_keys for key in keys}
+        records: dict[str, dict] = {}
+        if cls.sentence_records is not None:
+            for key in all_keys & cls.sentence_records.keys():
+                cls.sentence_records.move_to_end(key)
+                records[key] = cls.sentence_records[key]
+        if is_caching:
+            records.update(Ns_Cache.load_sentence_records(all_keys - records.keys()))
+
+        # (doc index, sentence index) of sentences without a usable parse
+        missing_positions = [
+            (i, j)
+            for i, keys in enumerate(doc_sentence_keys)
+            for j, key in enumerate(keys)
+            if key not in records
+            or not sentence_processors.issubset(records[key]["processors"])
+            or len(records[key]["words"]) != len(cls._get_word_dicts(doc_sentence_dicts[i][j]))
+        ]
+        # Sentences repeated within the texts are parsed once
+        key_position: dict[str, tuple[int, int]] = {}
+        for i, j in missing_positions:
+            key_position.setdefault(doc_sentence_keys[i][j], (i, j))
+        n_sentences = sum(map(len, doc_sentence_keys))
+        cls.n_sentences += n_sentences
+        cls.n_parsed_sentences += len(key_position)
+        logging.debug(
+            f"Processing {len(key_position)} unique new sentence(s),"
+            f" reusing parses for the other {n_sentences - len(key_position)}"
+        )
+
+        if key_position:
+            missing_doc = Document([doc_sentence_dicts[i][j] for i, j in key_position.values()])
+            missing_doc = cls._nlp_many([missing_doc], [p for p in processors if p in sentence_processors])[0]
+            new_records: dict[str, dict] = {}
+            for key, sentence in zip(key_position, missing_doc.sentences, strict=True):
+                old_record = records.get(key)
+                if old_record is not None and len(old_record["words"]) != len(sentence.words):
+                    old_record = None
+                records[key] = new_records[key] = cls._sentence2record(
+                    sentence, sentence_processors, old_record
+                )
+            cls.keep_sentence_records(new_records)
+            if is_caching:
+                Ns_Cache.save_sentence_records(new_records)
+
+        from stanza.models.constituency.tree_reader import read_trees
+
+        docs: list[Document] = []
+        for text, sentence_dicts, keys in zip(texts, doc_sentence_dicts, doc_sentence_keys, strict=True):
+            for sentence_dict, key in zip(sentence_dicts, keys, strict=True):
+                for word_dict, annotations in zip(
+                    cls._get_word_dicts(sentence_dict), records[key]["words"], strict=True
+                ):
+                    word_dict.update((name, value) for name, value in annotations.items() if value is not None)
+            doc = Document(sentence_dicts, text=text)
+            if "constituency" in sentence_processors:
+                for sentence, key in zip(doc.sentences, keys, strict=True):
+                    sentence.constituency = read_trees(records[key]["constituency"])[0]
+            docs.append(doc)
+        return docs
+
+    @classmethod
+    def start_reusing_sentences(cls) -> None:
+        cls.sentence_records = OrderedDict()
+        cls.n_sentences = 0
+        cls.n_parsed_sentences = 0
+
+    @classmethod
+    def keep_sentence_records(cls, key_record: dict[str, dict]) -> None:
+        if cls.sentence_records is None:
+            return
+        for key, record in key_record.items():
+            cls.sentence_records[key] = record
+            cls.sentence_records.move_to_end(key)
+        while len(cls.sentence_records) > cls.max_sentence_records:
+            cls.sentence_records.popitem(last=False)
+
+    @classmethod
+    def stop_reusing_sentences(cls) -> None:
+        cls.sentence_records = None
+        if cls.n_sentences > 0:
+            n_reused = cls.n_sentences - cls.n_parsed_sentences
+            logging.info(
+                f"Parsed {cls.n_parsed_sentences} of {cls.n_sentences} sentences, reused parses for"
+                f" {n_reused} ({n_reused / cls.n_sentences:.1%}) repeated or cached ones."
+            )
+
+    @classmethod
+    def _get_word_dicts(cls, sentence_dict: list[dict]) -> list[dict]:
+        # Skip multi-word tokens, whose ids are ranges of word ids
+        return [d for d in sentence_dict if not (isinstance(d["id"], tuple) and len(d["id"]) > 1)]
+
+    @classmethod
+    def _sentence2record(cls, sentence, processors: set[str], old_record: dict | None) -> dict:
+        """
+        Annotations of a sentence that are not reproduced by tokenize, merged
+        with those cached from other processors
+        """
+        words = [
+            {"lemma": word.lemma, "upos": word.upos, "xpos": word.xpos, "feats": word.feats}
+            for word in sentence.words
+        ]
+        record: dict[str, Any] = {"processors": set(processors), "words": words, "constituency": None}
+        if sentence.constituency is not None:
+            record["constituency"] = str(sentence.constituency)
+        if old_record is None:
+            return record
+
+        record["processors"] |= old_record["processors"]
+        for word, old_word in zip(words, old_record["words"], strict=True):
+            for name, value in old_word.items():
+                if word[name] is None:
+                    word[name] = value
+        if record["constituency"] is None:
+            record["constituency"] = old_record["constituency"]
+        return record
 
     @classmethod
     def doc2tree(cls, doc: Document) -> str:
@@ -101,8 +368,17 @@ class Ns_NLP_Stanza:
         *,
         cache_path: str | None = None,
     ) -> str:
-        doc = cls.nlp(doc, processors=("tokenize", "pos", "constituency"), cache_path=cache_path)
-        return cls.doc2tree(doc)
+        return cls.get_constituency_forests((doc,), cache_paths=(cache_path,))[0]
+
+    @classmethod
+    def get_constituency_forests(
+        cls,
+        docs: Sequence[str | Document],
+        *,
+        cache_paths: Sequence[str | None] | None = None,
+    ) -> list[str]:
+        docs = cls.nlp_many(docs, processors=("tokenize", "pos", "constituency"), cache_paths=cache_paths)
+        return [cls.doc2tree(doc) for doc in docs]
 
     @classmethod
     def get_lemma_and_pos(
@@ -112,6 +388,16 @@ class Ns_NLP_Stanza:
         tagset: Literal["ud", "ptb"],
         cache_path: str | None = None,
     ) -> tuple[tuple[str, str], ...]:
+        return cls.get_lemmas_and_poses((doc,), tagset=tagset, cache_paths=(cache_path,))[0]
+
+    @classmethod
+    def get_lemmas_and_poses(
+        cls,
+        docs: Sequence[str | Document],
+        *,
+        tagset: Literal["ud", "ptb"],
+        cache_paths: Sequence[str | None] | None = None,
+    ) -> list[tuple[tuple[str, str], ...]]:
         if tagset == "ud":
             pos_attr = "upos"
         elif tagset == "ptb":
@@ -119,13 +405,16 @@ class Ns_NLP_Stanza:
         else:
             assert False, "Invalid tagset"
 
-        doc = cls.nlp(doc, processors=("tokenize", "pos", "lemma"), cache_path=cache_path)
-        return tuple(
-            # Foreign words could have word.lemma as None
-            (word.lemma.lower() if word.lemma is not None else word.text.lower(), getattr(word, pos_attr))
-            for sent in doc.sentences
-            for word in sent.words
-        )
+        docs = cls.nlp_many(docs, processors=("tokenize", "pos", "lemma"), cache_paths=cache_paths)
+        return [
+            tuple(
+                # Foreign words could have word.lemma as None
+                (word.lemma.lower() if word.lemma is not None else word.text.lower(), getattr(word, pos_attr))
+                for sent in doc.sentences
+                for word in sent.words
+            )
+            for doc in docs
+        ]
 
     @classmethod
     def doc2serialized(cls, doc: Document) -> bytes:
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+
+import copy
+import logging
+import os
+from collections import deque
+from collections.abc import Generator, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any
+
+from neosca.ns_io import Ns_Cache, Ns_IO, Ns_Run_Manifest, Ns_Values_Writer
+
+# (file_path, cache_path, is_cache_available)
+Ns_Parse_Task = tuple[str, str, bool]
+
+# The analyzer of a worker process, see init_worker()
+worker_analyzer: Any = None
+
+
+def init_worker(analyzer: Any, jobs: int) -> None:
+    global worker_analyzer
+    worker_analyzer = analyzer
+    # Metadata of caches and new parses of sentences are recorded by the main
+    # process only, workers only read the cache database
+    Ns_Cache.is_recording = False
+
+    import torch
+
+    from neosca.ns_nlp import Ns_NLP_Stanza
+
+    Ns_NLP_Stanza.start_reusing_sentences()
+
+    # Share the cores among workers instead of each using all of them. The
+    # Stanza pipeline of the worker is loaded on its first file and kept.
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // jobs))
+
+
+def parse_batch(
+    analyzer: Any, file_method_name: str, texts_method_name: str, batch: list[Ns_Parse_Task]
+) -> list:
+    """
+    Load cached files one by one, and parse the other files of the batch in
+    one call to the Stanza pipeline
+    """
+    results: list = [None] * len(batch)
+    text_indices: list[int] = []
+    texts: list[str] = []
+    text_cache_paths: list[str | None] = []
+    for i, (file_path, cache_path, is_cache_available) in enumerate(batch):
+        if analyzer.is_use_cache and is_cache_available:
+            results[i] = getattr(analyzer, file_method_name)(file_path, cache_path, is_cache_available)
+        else:
+            text_indices.append(i)
+            texts.append(Ns_IO.load_file(file_path))
+            text_cache_paths.append(cache_path if analyzer.is_cache else None)
+
+    if texts:
+        text_results = getattr(analyzer, texts_method_name)(texts, cache_paths=text_cache_paths)
+        for i, result in zip(text_indices, text_results, strict=True):
+            results[i] = result
+    return results
+
+
+def parse_batch_in_worker(
+    file_method_name: str, texts_method_name: str, batch: list[Ns_Parse_Task]
+) -> tuple[list, int, int, dict[str, dict]]:
+    """
+    Return the results of the batch, the numbers of sentences processed and
+    parsed for them, which the main process adds up, and the records of the
+    newly parsed sentences to be cached, which it saves for other workers to
+    find
+    """
+    from neosca.ns_nlp import Ns_NLP_Stanza
+
+    n_sentences, n_parsed_sentences = Ns_NLP_Stanza.n_sentences, Ns_NLP_Stanza.n_parsed_sentences
+    results = parse_batch(worker_analyzer, file_method_name, texts_method_name, batch)
+    sentence_records = Ns_Cache.unsaved_sentence_records
+    Ns_Cache.unsaved_sentence_records = {}
+    return (
+        results,
+        Ns_NLP_Stanza.n_sentences - n_sentences,
+        Ns_NLP_Stanza.n_parsed_sentences - n_parsed_sentences,
+        sentence_records,
+    )
+
+
+class Ns_Parse_Pool:
+    """
+    Parse files in batches ahead of the main process, which takes the results
+    in input order with take() and queries them. With more than one job,
+    batches are parsed in worker processes, each loading its own Stanza
+    pipeline once. Cache paths are looked up, and new caches recorded, in the
+    main process. A sentence repeated across files is parsed once by each
+    process while its parse is among the most recently used, see
+    Ns_NLP_Stanza.start_reusing_sentences(). When files are cached, the
+    parses of sentences made by a worker are also saved by the main process
+    to the cache database, where the other workers find them.
+    """
+
+    def __init__(
+        self,
+        analyzer: Any,
+        file_method_name: str,
+        texts_method_name: str,
+        file_paths: Iterable[str],
+        *,
+        jobs: int = 1,
+        batch_size: int = 1,
+    ) -> None:
+        """
+        :param file_method_name: method of analyzer that takes (file_path,
+            cache_path, is_cache_available) and returns the parse of a file
+        :param texts_method_name: method of analyzer that takes a list of
+            texts and their cache_paths, and returns their parses
+        :param batch_size: number of files sent to the pipeline at once
+        """
+        self.analyzer = analyzer
+        self.file_method_name = file_method_name
+        self.texts_method_name = texts_method_name
+        self.file_paths: Iterator[str] = iter(file_paths)
+        self.batch_size = batch_size
+        self.batches: deque[tuple[list[Ns_Parse_Task], Future]] = deque()
+        # Tasks and results of the batch being taken
+        self.ready: deque[tuple[Ns_Parse_Task, Any]] = deque()
+
+        from neosca.ns_nlp import Ns_NLP_Stanza
+
+        Ns_NLP_Stanza.start_reusing_sentences()
+
+        self.executor: ProcessPoolExecutor | None = None
+        if jobs <= 1:
+            return
+
+        logging.info(f"Parsing in {jobs} processes...")
+        import multiprocessing
+
+        # The analyzer is sent to each worker without the counters it holds
+        analyzer = copy.copy(analyzer)
+        analyzer.counters = []
+        analyzer.parse_pool = None
+        # Stanza is not safe to fork once PyTorch has started threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(analyzer, jobs),
+        )
+        # Keep each worker busy while the main process queries, without
+        # holding the parses of far ahead files in memory
+        self.window = jobs * 2
+        self.submit_ahead()
+
+    def __enter__(self) -> "Ns_Parse_Pool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @classmethod
+    def flatten(cls, file_or_subfiles_list: Iterable[str | list[str]]) -> Generator[str, None, None]:
+        for file_or_subfiles in file_or_subfiles_list:
+            if isinstance(file_or_subfiles, str):
+                yield file_or_subfiles
+            else:
+                yield from file_or_subfiles
+
+    def submit(self) -> bool:
+        """
+        Submit the next batch, return False if there are no files left
+        """
+        batch: list[Ns_Parse_Task] = [
+            (file_path, *Ns_Cache.get_cache_path(file_path))
+            for file_path in islice(self.file_paths, self.batch_size)
+        ]
+        if not batch:
+            return False
+
+        if self.executor is None:
+            future: Future = Future()
+            future.set_result(parse_batch(self.analyzer, self.file_method_name, self.texts_method_name, batch))
+        else:
+            future = self.executor.submit(
+                parse_batch_in_worker, self.file_method_name, self.texts_method_name, batch
+            )
+        self.batches.append((batch, future))
+        return True
+
+    def submit_ahead(self) -> None:
+        while len(self.batches) < self.window and self.submit():
+            pass
+
+    def take(self, file_path: str) -> Any:
+        if not self.ready:
+            if self.executor is None:
+                self.submit()
+            if not self.batches:
+                raise ValueError(f"{file_path} was not submitted to the parsing pool")
+            batch, future = self.batches.popleft()
+            if self.executor is not None:
+                self.submit_ahead()
+
+            results = future.result()
+            if self.executor is not None:
+                from neosca.ns_nlp import Ns_NLP_Stanza
+
+                results, n_sentences, n_parsed_sentences, sentence_records = results
+                Ns_NLP_Stanza.n_sentences += n_sentences
+                Ns_NLP_Stanza.n_parsed_sentences += n_parsed_sentences
+                Ns_Cache.save_sentence_records(sentence_records)
+            for task, result in zip(batch, results, strict=True):
+                _, cache_path, is_cache_available = task
+                # Caches written in worker processes
+                if self.executor is not None and not is_cache_available and Ns_Cache.is_usable(cache_path):
+                    Ns_Cache.record_cache(cache_path)
+                self.ready.append((task, result))
+
+        # Results are taken in the order the files were submitted
+        (expected_file_path, *_), result = self.ready.popleft()
+        if expected_file_path != file_path:
+            raise ValueError(f"Expected {expected_file_path} from the parsing pool, got {file_path}")
+        return result
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+        from neosca.ns_nlp import Ns_NLP_Stanza
+
+        Ns_NLP_Stanza.stop_reusing_sentences()
+
+
+class Ns_Run_Mixin:
+    """
+    Parsing files ahead in an Ns_Parse_Pool, and writing their values to a
+    resumable output file, for analyzers that run on lists of files, i.e.,
+    Ns_SCA and Ns_LCA
+    """
+
+    # name of the analyzer in the manifest of a resumable run
+    ANALYZER_NAME: str
+    # attributes besides the contents of a file that its values depend on
+    RUN_CONFIG_ATTRS: tuple[str, ...]
+    # file_method_name and texts_method_name of Ns_Parse_Pool
+    PARSE_FILE_METHOD_NAME: str
+    PARSE_TEXTS_METHOD_NAME: str
+
+    ofile_freq: str
+    oformat_freq: str
+    is_stdout: bool
+    is_resuming: bool
+    is_skip_parsing: bool = False
+    jobs: int
+    batch_size: int
+    parse_pool: Ns_Parse_Pool | None
+
+    @contextmanager
+    def open_parse_pool(self, file_or_subfiles_list: list[str | list[str]]) -> Generator[None, None, None]:
+        """
+        Parse the files in batches of self.batch_size, in self.jobs processes,
+        while the caller analyzes them one by one in the order of
+        file_or_subfiles_list
+        """
+        if (self.jobs <= 1 and self.batch_size <= 1) or self.is_skip_parsing:
+            yield
+            return
+
+        file_paths = Ns_Parse_Pool.flatten(file_or_subfiles_list)
+        with Ns_Parse_Pool(
+            self,
+            self.PARSE_FILE_METHOD_NAME,
+            self.PARSE_TEXTS_METHOD_NAME,
+            file_paths,
+            jobs=self.jobs,
+            batch_size=self.batch_size,
+        ) as self.parse_pool:
+            try:
+                yield
+            finally:
+                self.parse_pool = None
+
+    def open_values_writer(self) -> Ns_Values_Writer:
+        manifest = None
+        if self.is_resuming:
+            manifest = Ns_Run_Manifest(self.ofile_freq, self.get_run_config())
+        return Ns_Values_Writer(
+            None if self.is_stdout else self.ofile_freq, self.oformat_freq, manifest=manifest
+        )
+
+    def get_run_config(self) -> dict:
+        """
+        Everything that the values of a file depend on besides its contents,
+        a resumed run reuses the values of a previous run only if they match
+        """
+        return {"analyzer": self.ANALYZER_NAME, **{attr: getattr(self, attr) for attr in self.RUN_CONFIG_ATTRS}}
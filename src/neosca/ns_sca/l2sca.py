@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 from abc import ABC, abstractmethod
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 
 from neosca.ns_tregex.node_descriptions import Node_Any, Node_Text
 from neosca.ns_tregex.relation import (
@@ -16,12 +16,27 @@ from neosca.ns_tregex.relation import (
     RIGHT_SISTER_OF,
 )
 from neosca.ns_tregex.tree import Tree
+from neosca.ns_tregex.tregex_pattern import Tregex_Pattern
 
 
 class Abstract_Searcher(ABC):
+    # Labels a node must have to possibly match, nodes with other labels are
+    # never handed to matchCandidate()
+    candidate_labels: tuple[str, ...] = ()
+
     @classmethod
-    @abstractmethod
     def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+        if t.parent is None:
+            # Look candidates up in the label index of the whole tree
+            candidates: Iterable[Tree] = t.get_index().nodes_with_labels(cls.candidate_labels)
+        else:
+            candidates = (node for node in t.preorder_iter() if node.label in cls.candidate_labels)
+        for candidate in candidates:
+            yield from cls.matchCandidate(candidate)
+
+    @classmethod
+    @abstractmethod
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         # The same node can be yieleded multiple times in two cases:
         #  echo '(A (a) (a))' | tregex.sh 'A < a'       # 'A' is matched twice
         #  echo '(A (a) (b))' | tregex.sh 'A [<a | <b]' # 'A' is matched twice
@@ -29,252 +44,284 @@ class Abstract_Searcher(ABC):
         raise NotImplementedError()
 
 
+# Hand-written searchers and compiled patterns are interchangeable
+Searcher = type[Abstract_Searcher] | Tregex_Pattern
+
+
+class Multi_Searcher:
+    """
+    Run several searchers in a single preorder walk: each node is handed only
+    to the searchers whose candidate_labels contain its label, or that accept
+    any label (candidate_labels is None). For every searcher, nodes come out in
+    the same order as its own searchNodeIterator.
+    """
+
+    def __init__(self, searchers: Iterable[Searcher]) -> None:
+        self.searchers: tuple[Searcher, ...] = tuple(dict.fromkeys(searchers))
+        self.label_searchers_map: dict[str, list[Searcher]] = {}
+        self.wildcard_searchers: list[Searcher] = []
+        for searcher in self.searchers:
+            if searcher.candidate_labels is None:
+                self.wildcard_searchers.append(searcher)
+                continue
+            for label in searcher.candidate_labels:
+                self.label_searchers_map.setdefault(label, []).append(searcher)
+        for searchers in self.label_searchers_map.values():
+            searchers.extend(self.wildcard_searchers)
+
+    def searchNodeIterator(self, t: Tree) -> Generator[tuple[Searcher, Tree], None, None]:
+        label_searchers_map = self.label_searchers_map
+        wildcard_searchers = self.wildcard_searchers
+        if t.parent is None and not wildcard_searchers:
+            candidates: Iterable[Tree] = t.get_index().nodes_with_labels(label_searchers_map)
+        else:
+            candidates = t.preorder_iter()
+        for candidate in candidates:
+            searchers = label_searchers_map.get(candidate.label, wildcard_searchers)  # type: ignore
+            for searcher in searchers:
+                for node in searcher.matchCandidate(candidate):
+                    yield searcher, node
+
+
 class S(Abstract_Searcher):
+    candidate_labels = ("ROOT",)
+
     @classmethod
     def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+        # Don't have to iterate the tree because descendants won't match
+        if Node_Text.satisfies(t, "ROOT"):
+            yield from cls.matchCandidate(t)
+
+    @classmethod
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         ROOT !> __
         """
-        # Don't have to iterate the tree because descendants won't match
-        if not Node_Text.satisfies(t, "ROOT"):
-            return
-        if not any(Node_Any.satisfies(node) for node in CHILD_OF.searchNodeIterator(t)):
-            yield t
+        if not any(Node_Any.satisfies(node) for node in CHILD_OF.searchNodeIterator(candidate)):
+            yield candidate
 
 
 class VP1(Abstract_Searcher):
+    candidate_labels = ("VP",)
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         VP > S|SINV|SQ
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.satisfies(candidate, "VP"):
-                continue
-            for _ in filter(
-                lambda node: Node_Text.in_(node, ("S", "SINV", "SQ")),
-                CHILD_OF.searchNodeIterator(candidate),
-            ):
-                yield candidate
+        for _ in filter(
+            lambda node: Node_Text.in_(node, ("S", "SINV", "SQ")),
+            CHILD_OF.searchNodeIterator(candidate),
+        ):
+            yield candidate
 
 
 class VP2(Abstract_Searcher):
+    candidate_labels = ("MD", "VBZ", "VBP", "VBD")
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         MD|VBZ|VBP|VBD > (SQ !< VP)
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.in_(candidate, ("MD", "VBZ", "VBP", "VBD")):
-                continue
-            for sq in filter(
-                lambda node: Node_Text.satisfies(node, "SQ"),
-                CHILD_OF.searchNodeIterator(candidate),
-            ):
-                if not any(Node_Text.satisfies(node, "VP") for node in PARENT_OF.searchNodeIterator(sq)):
-                    yield candidate
+        for sq in filter(
+            lambda node: Node_Text.satisfies(node, "SQ"),
+            CHILD_OF.searchNodeIterator(candidate),
+        ):
+            if not any(Node_Text.satisfies(node, "VP") for node in PARENT_OF.searchNodeIterator(sq)):
+                yield candidate
 
 
 class C1(Abstract_Searcher):
+    candidate_labels = ("S", "SINV", "SQ")
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         S|SINV|SQ [> ROOT <, (VP <# VB) | <# MD|VBZ|VBP|VBD | < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])]
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.in_(candidate, ("S", "SINV", "SQ")):
-                continue
-            # Branch 1: S|SINV|SQ > ROOT <, (VP <# VB)
-            for _ in filter(
-                lambda node: Node_Text.satisfies(node, "ROOT"),
-                CHILD_OF.searchNodeIterator(candidate),
-            ):
-                for vp in filter(
-                    lambda node: Node_Text.satisfies(node, "VP"),
-                    HAS_LEFTMOST_CHILD.searchNodeIterator(candidate),
-                ):
-                    for _ in filter(
-                        lambda node: Node_Text.satisfies(node, "VB"),
-                        IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
-                    ):
-                        yield candidate
-            # Branch 2: S|SINV|SQ <# MD|VBZ|VBP|VBD
-            for _ in filter(
-                lambda node: Node_Text.in_(node, ("MD", "VBZ", "VBP", "VBD")),
-                IMMEDIATELY_HEADED_BY.searchNodeIterator(candidate),
-            ):
-                yield candidate
-            # Branch 3: S|SINV|SQ < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])
+        # Branch 1: S|SINV|SQ > ROOT <, (VP <# VB)
+        for _ in filter(
+            lambda node: Node_Text.satisfies(node, "ROOT"),
+            CHILD_OF.searchNodeIterator(candidate),
+        ):
             for vp in filter(
                 lambda node: Node_Text.satisfies(node, "VP"),
-                PARENT_OF.searchNodeIterator(candidate),
+                HAS_LEFTMOST_CHILD.searchNodeIterator(candidate),
             ):
-                # Branch 3.1: S|SINV|SQ < (VP <# MD|VBP|VBZ|VBD)
                 for _ in filter(
-                    lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
+                    lambda node: Node_Text.satisfies(node, "VB"),
                     IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
                 ):
                     yield candidate
-                # Branch 3.2: S|SINV|SQ < (VP < CC < (VP <# MD|VBP|VBZ|VBD))
-                for _ in filter(lambda node: Node_Text.satisfies(node, "CC"), PARENT_OF.searchNodeIterator(vp)):
-                    for vp2 in filter(
-                        lambda node: Node_Text.satisfies(node, "VP"),
-                        PARENT_OF.searchNodeIterator(vp),
+        # Branch 2: S|SINV|SQ <# MD|VBZ|VBP|VBD
+        for _ in filter(
+            lambda node: Node_Text.in_(node, ("MD", "VBZ", "VBP", "VBD")),
+            IMMEDIATELY_HEADED_BY.searchNodeIterator(candidate),
+        ):
+            yield candidate
+        # Branch 3: S|SINV|SQ < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])
+        for vp in filter(
+            lambda node: Node_Text.satisfies(node, "VP"),
+            PARENT_OF.searchNodeIterator(candidate),
+        ):
+            # Branch 3.1: S|SINV|SQ < (VP <# MD|VBP|VBZ|VBD)
+            for _ in filter(
+                lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
+                IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
+            ):
+                yield candidate
+            # Branch 3.2: S|SINV|SQ < (VP < CC < (VP <# MD|VBP|VBZ|VBD))
+            for _ in filter(lambda node: Node_Text.satisfies(node, "CC"), PARENT_OF.searchNodeIterator(vp)):
+                for vp2 in filter(
+                    lambda node: Node_Text.satisfies(node, "VP"),
+                    PARENT_OF.searchNodeIterator(vp),
+                ):
+                    for _ in filter(
+                        lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
+                        IMMEDIATELY_HEADED_BY.searchNodeIterator(vp2),
                     ):
-                        for _ in filter(
-                            lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
-                            IMMEDIATELY_HEADED_BY.searchNodeIterator(vp2),
-                        ):
-                            yield candidate
+                        yield candidate
 
 
 class C2(Abstract_Searcher):
+    candidate_labels = ("FRAG",)
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         FRAG > ROOT !<< (S|SINV|SQ [> ROOT <, (VP <# VB) | <# MD|VBZ|VBP|VBD | < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])])
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.satisfies(candidate, "FRAG"):
-                continue
-            if not any(Node_Text.satisfies(node, "ROOT") for node in CHILD_OF.searchNodeIterator(candidate)):
-                continue
+        if not any(Node_Text.satisfies(node, "ROOT") for node in CHILD_OF.searchNodeIterator(candidate)):
+            return
 
-            is_satisfied = True
-            for s in filter(
-                lambda node: Node_Text.in_(node, ("S", "SINV", "SQ")),
-                DOMINATES.searchNodeIterator(candidate),
+        is_satisfied = True
+        for s in filter(
+            lambda node: Node_Text.in_(node, ("S", "SINV", "SQ")),
+            DOMINATES.searchNodeIterator(candidate),
+        ):
+            # Branch 1: S|SINV|SQ > ROOT <, (VP <# VB)
+            if any(Node_Text.satisfies(node, "ROOT") for node in CHILD_OF.searchNodeIterator(s)) and any(
+                Node_Text.satisfies(node, "VB")
+                for vp in filter(
+                    lambda node: Node_Text.satisfies(node, "VP"),
+                    HAS_LEFTMOST_CHILD.searchNodeIterator(s),
+                )
+                for node in IMMEDIATELY_HEADED_BY.searchNodeIterator(vp)
             ):
-                # Branch 1: S|SINV|SQ > ROOT <, (VP <# VB)
-                if any(Node_Text.satisfies(node, "ROOT") for node in CHILD_OF.searchNodeIterator(s)) and any(
-                    Node_Text.satisfies(node, "VB")
-                    for vp in filter(
-                        lambda node: Node_Text.satisfies(node, "VP"),
-                        HAS_LEFTMOST_CHILD.searchNodeIterator(s),
-                    )
+                is_satisfied = False
+                break
+            # Branch 2: S|SINV|SQ <# MD|VBZ|VBP|VBD
+            if any(
+                Node_Text.in_(node, ("MD", "VBZ", "VBP", "VBD"))
+                for node in IMMEDIATELY_HEADED_BY.searchNodeIterator(s)
+            ):
+                is_satisfied = False
+                break
+            # Branch 3: S|SINV|SQ < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])
+            for vp in filter(lambda node: Node_Text.satisfies(node, "VP"), PARENT_OF.searchNodeIterator(s)):
+                if any(
+                    Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD"))
                     for node in IMMEDIATELY_HEADED_BY.searchNodeIterator(vp)
                 ):
                     is_satisfied = False
                     break
-                # Branch 2: S|SINV|SQ <# MD|VBZ|VBP|VBD
-                if any(
-                    Node_Text.in_(node, ("MD", "VBZ", "VBP", "VBD"))
-                    for node in IMMEDIATELY_HEADED_BY.searchNodeIterator(s)
+                if any(Node_Text.satisfies(node, "CC") for node in PARENT_OF.searchNodeIterator(vp)) and any(
+                    Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD"))
+                    for vp2 in filter(
+                        lambda node: Node_Text.satisfies(node, "VP"),
+                        PARENT_OF.searchNodeIterator(vp),
+                    )
+                    for node in IMMEDIATELY_HEADED_BY.searchNodeIterator(vp2)
                 ):
                     is_satisfied = False
                     break
-                # Branch 3: S|SINV|SQ < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])
-                for vp in filter(lambda node: Node_Text.satisfies(node, "VP"), PARENT_OF.searchNodeIterator(s)):
-                    if any(
-                        Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD"))
-                        for node in IMMEDIATELY_HEADED_BY.searchNodeIterator(vp)
-                    ):
-                        is_satisfied = False
-                        break
-                    if any(
-                        Node_Text.satisfies(node, "CC") for node in PARENT_OF.searchNodeIterator(vp)
-                    ) and any(
-                        Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD"))
-                        for vp2 in filter(
-                            lambda node: Node_Text.satisfies(node, "VP"),
-                            PARENT_OF.searchNodeIterator(vp),
-                        )
-                        for node in IMMEDIATELY_HEADED_BY.searchNodeIterator(vp2)
-                    ):
-                        is_satisfied = False
-                        break
-            if is_satisfied:
-                yield candidate
+        if is_satisfied:
+            yield candidate
 
 
 class T1(Abstract_Searcher):
+    candidate_labels = ("S", "SBARQ", "SINV", "SQ")
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         S|SBARQ|SINV|SQ > ROOT | [$-- S|SBARQ|SINV|SQ !>> SBAR|VP]
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.in_(candidate, ("S", "SBARQ", "SINV", "SQ")):
-                continue
-            # Branch 1: S|SBARQ|SINV|SQ > ROOT
-            for node in CHILD_OF.searchNodeIterator(candidate):
-                if Node_Text.satisfies(node, "ROOT"):
-                    yield candidate
-            # Branch 2: S|SBARQ|SINV|SQ [$-- S|SBARQ|SINV|SQ !>> SBAR|VP]
-            for _ in filter(
-                lambda node: Node_Text.in_(node, ("S", "SBARQ", "SINV", "SQ")),
-                RIGHT_SISTER_OF.searchNodeIterator(candidate),
+        # Branch 1: S|SBARQ|SINV|SQ > ROOT
+        for node in CHILD_OF.searchNodeIterator(candidate):
+            if Node_Text.satisfies(node, "ROOT"):
+                yield candidate
+        # Branch 2: S|SBARQ|SINV|SQ [$-- S|SBARQ|SINV|SQ !>> SBAR|VP]
+        for _ in filter(
+            lambda node: Node_Text.in_(node, ("S", "SBARQ", "SINV", "SQ")),
+            RIGHT_SISTER_OF.searchNodeIterator(candidate),
+        ):
+            if not any(
+                Node_Text.in_(node2, ("SBAR", "VP")) for node2 in DOMINATED_BY.searchNodeIterator(candidate)
             ):
-                if not any(
-                    Node_Text.in_(node2, ("SBAR", "VP")) for node2 in DOMINATED_BY.searchNodeIterator(candidate)
-                ):
-                    yield candidate
+                yield candidate
 
 
 class T2(Abstract_Searcher):
+    candidate_labels = ("FRAG",)
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         FRAG > ROOT !<< (S|SBARQ|SINV|SQ > ROOT | [$-- S|SBARQ|SINV|SQ !>> SBAR|VP])
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.satisfies(candidate, "FRAG"):
-                continue
-            if not any(Node_Text.satisfies(node, "ROOT") for node in CHILD_OF.searchNodeIterator(candidate)):
-                continue
-            is_satisfied = True
-            for s in filter(
-                lambda node: Node_Text.in_(node, ("S", "SBARQ", "SINV", "SQ")),
-                DOMINATES.searchNodeIterator(candidate),
-            ):
-                # Branch 1: S|SBARQ|SINV|SQ > ROOT
-                if any(Node_Text.satisfies(node, "ROOT") for node in CHILD_OF.searchNodeIterator(s)):
-                    is_satisfied = False
-                    break
-                # Branch 2: S|SBARQ|SINV|SQ [$-- S|SBARQ|SINV|SQ !>> SBAR|VP]
-                if any(
-                    Node_Text.in_(node, ("S", "SBARQ", "SINV", "SQ"))
-                    for node in RIGHT_SISTER_OF.searchNodeIterator(s)
-                ) and not any(
-                    Node_Text.in_(node, ("SBAR", "VP")) for node in DOMINATED_BY.searchNodeIterator(s)
-                ):
-                    is_satisfied = False
-                    break
-            if is_satisfied:
-                yield candidate
+        if not any(Node_Text.satisfies(node, "ROOT") for node in CHILD_OF.searchNodeIterator(candidate)):
+            return
+        is_satisfied = True
+        for s in filter(
+            lambda node: Node_Text.in_(node, ("S", "SBARQ", "SINV", "SQ")),
+            DOMINATES.searchNodeIterator(candidate),
+        ):
+            # Branch 1: S|SBARQ|SINV|SQ > ROOT
+            if any(Node_Text.satisfies(node, "ROOT") for node in CHILD_OF.searchNodeIterator(s)):
+                is_satisfied = False
+                break
+            # Branch 2: S|SBARQ|SINV|SQ [$-- S|SBARQ|SINV|SQ !>> SBAR|VP]
+            if any(
+                Node_Text.in_(node, ("S", "SBARQ", "SINV", "SQ"))
+                for node in RIGHT_SISTER_OF.searchNodeIterator(s)
+            ) and not any(Node_Text.in_(node, ("SBAR", "VP")) for node in DOMINATED_BY.searchNodeIterator(s)):
+                is_satisfied = False
+                break
+        if is_satisfied:
+            yield candidate
 
 
 class CN1(Abstract_Searcher):
+    candidate_labels = ("NP",)
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         NP !> NP [<< JJ|POS|PP|S|VBG | << (NP $++ NP !$+ CC)]
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.satisfies(candidate, "NP"):
-                continue
-            if any(Node_Text.satisfies(node, "NP") for node in CHILD_OF.searchNodeIterator(candidate)):
-                continue
-            # Branch 1: NP << JJ|POS|PP|S|VBG
+        if any(Node_Text.satisfies(node, "NP") for node in CHILD_OF.searchNodeIterator(candidate)):
+            return
+        # Branch 1: NP << JJ|POS|PP|S|VBG
+        for _ in filter(
+            lambda node: Node_Text.in_(node, ("JJ", "POS", "PP", "S", "VBG")),
+            DOMINATES.searchNodeIterator(candidate),
+        ):
+            yield candidate
+        # Branch 2: NP << (NP $++ NP !$+ CC)
+        for np in filter(
+            lambda node: Node_Text.satisfies(node, "NP"),
+            DOMINATES.searchNodeIterator(candidate),
+        ):
             for _ in filter(
-                lambda node: Node_Text.in_(node, ("JJ", "POS", "PP", "S", "VBG")),
-                DOMINATES.searchNodeIterator(candidate),
-            ):
-                yield candidate
-            # Branch 2: NP << (NP $++ NP !$+ CC)
-            for np in filter(
                 lambda node: Node_Text.satisfies(node, "NP"),
-                DOMINATES.searchNodeIterator(candidate),
+                LEFT_SISTER_OF.searchNodeIterator(np),
             ):
-                for _ in filter(
-                    lambda node: Node_Text.satisfies(node, "NP"),
-                    LEFT_SISTER_OF.searchNodeIterator(np),
+                if not any(
+                    Node_Text.satisfies(node, "CC") for node in IMMEDIATE_LEFT_SISTER_OF.searchNodeIterator(np)
                 ):
-                    if not any(
-                        Node_Text.satisfies(node, "CC")
-                        for node in IMMEDIATE_LEFT_SISTER_OF.searchNodeIterator(np)
-                    ):
-                        yield candidate
+                    yield candidate
 
 
 class CN2(Abstract_Searcher):
@@ -301,107 +348,104 @@ class CN2(Abstract_Searcher):
         for _ in filter(lambda node: Node_Text.satisfies(node, "S"), HAS_LEFTMOST_CHILD.searchNodeIterator(t)):
             yield t
 
+    candidate_labels = ("SBAR",)
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         SBAR [<# WHNP | <# (IN < That|that|For|for) | <, S] & [$+ VP | > VP]
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.satisfies(candidate, "SBAR"):
-                continue
-            # Condition 1: SBAR [<# WHNP | <# (IN < That|that|For|for) | <, S]
-            for _ in cls.conditionOneHelper(candidate):
-                # Condition 2: SBAR [$+ VP | > VP]
-                for _ in filter(
-                    lambda node: Node_Text.satisfies(node, "VP"),
-                    IMMEDIATE_LEFT_SISTER_OF.searchNodeIterator(candidate),
-                ):
-                    yield candidate
-                for _ in filter(
-                    lambda node: Node_Text.satisfies(node, "VP"),
-                    CHILD_OF.searchNodeIterator(candidate),
-                ):
-                    yield candidate
+        # Condition 1: SBAR [<# WHNP | <# (IN < That|that|For|for) | <, S]
+        for _ in cls.conditionOneHelper(candidate):
+            # Condition 2: SBAR [$+ VP | > VP]
+            for _ in filter(
+                lambda node: Node_Text.satisfies(node, "VP"),
+                IMMEDIATE_LEFT_SISTER_OF.searchNodeIterator(candidate),
+            ):
+                yield candidate
+            for _ in filter(
+                lambda node: Node_Text.satisfies(node, "VP"),
+                CHILD_OF.searchNodeIterator(candidate),
+            ):
+                yield candidate
 
 
 class CN3(Abstract_Searcher):
+    candidate_labels = ("S",)
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         S < (VP <# VBG|TO) $+ VP
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.satisfies(candidate, "S"):
-                continue
-            # Condition 1: S < (VP <# VBG|TO)
-            for vp in filter(
-                lambda node: Node_Text.satisfies(node, "VP"),
-                PARENT_OF.searchNodeIterator(candidate),
+        # Condition 1: S < (VP <# VBG|TO)
+        for vp in filter(
+            lambda node: Node_Text.satisfies(node, "VP"),
+            PARENT_OF.searchNodeIterator(candidate),
+        ):
+            for _ in filter(
+                lambda node: Node_Text.in_(node, ("VBG", "TO")),
+                IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
             ):
+                # Condition 2: S $+ VP
                 for _ in filter(
-                    lambda node: Node_Text.in_(node, ("VBG", "TO")),
-                    IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
+                    lambda node: Node_Text.satisfies(node, "VP"),
+                    IMMEDIATE_LEFT_SISTER_OF.searchNodeIterator(candidate),
                 ):
-                    # Condition 2: S $+ VP
-                    for _ in filter(
-                        lambda node: Node_Text.satisfies(node, "VP"),
-                        IMMEDIATE_LEFT_SISTER_OF.searchNodeIterator(candidate),
-                    ):
-                        yield candidate
+                    yield candidate
 
 
 class DC(Abstract_Searcher):
+    candidate_labels = ("SBAR",)
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         SBAR < (S|SINV|SQ [> ROOT <, (VP <# VB) | <# MD|VBZ|VBP|VBD | < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])])
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.satisfies(candidate, "SBAR"):
-                continue
-            for s in filter(
-                lambda node: Node_Text.in_(node, ("S", "SINV", "SQ")),
-                PARENT_OF.searchNodeIterator(candidate),
-            ):
-                # Branch 1: S|SINV|SQ > ROOT <, (VP <# VB)
-                for _ in filter(lambda node: Node_Text.satisfies(node, "ROOT"), CHILD_OF.searchNodeIterator(s)):
-                    for vp in filter(
-                        lambda node: Node_Text.satisfies(node, "VP"),
-                        HAS_LEFTMOST_CHILD.searchNodeIterator(s),
-                    ):
-                        for _ in filter(
-                            lambda node: Node_Text.satisfies(node, "VB"),
-                            IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
-                        ):
-                            yield candidate
-                # Branch 2: S|SINV|SQ <# MD|VBZ|VBP|VBD
-                for _ in filter(
-                    lambda node: Node_Text.in_(node, ("MD", "VBZ", "VBP", "VBD")),
-                    IMMEDIATELY_HEADED_BY.searchNodeIterator(s),
+        for s in filter(
+            lambda node: Node_Text.in_(node, ("S", "SINV", "SQ")),
+            PARENT_OF.searchNodeIterator(candidate),
+        ):
+            # Branch 1: S|SINV|SQ > ROOT <, (VP <# VB)
+            for _ in filter(lambda node: Node_Text.satisfies(node, "ROOT"), CHILD_OF.searchNodeIterator(s)):
+                for vp in filter(
+                    lambda node: Node_Text.satisfies(node, "VP"),
+                    HAS_LEFTMOST_CHILD.searchNodeIterator(s),
                 ):
-                    yield candidate
-                # Branch 3: S|SINV|SQ < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])
-                for vp in filter(lambda node: Node_Text.satisfies(node, "VP"), PARENT_OF.searchNodeIterator(s)):
-                    # Branch 3.1: VP <# MD|VBP|VBZ|VBD
                     for _ in filter(
-                        lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
+                        lambda node: Node_Text.satisfies(node, "VB"),
                         IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
                     ):
                         yield candidate
-                    # Branch 3.2: VP < CC < (VP <# MD|VBP|VBZ|VBD)
-                    for _ in filter(
-                        lambda node: Node_Text.satisfies(node, "CC"),
+            # Branch 2: S|SINV|SQ <# MD|VBZ|VBP|VBD
+            for _ in filter(
+                lambda node: Node_Text.in_(node, ("MD", "VBZ", "VBP", "VBD")),
+                IMMEDIATELY_HEADED_BY.searchNodeIterator(s),
+            ):
+                yield candidate
+            # Branch 3: S|SINV|SQ < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])
+            for vp in filter(lambda node: Node_Text.satisfies(node, "VP"), PARENT_OF.searchNodeIterator(s)):
+                # Branch 3.1: VP <# MD|VBP|VBZ|VBD
+                for _ in filter(
+                    lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
+                    IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
+                ):
+                    yield candidate
+                # Branch 3.2: VP < CC < (VP <# MD|VBP|VBZ|VBD)
+                for _ in filter(
+                    lambda node: Node_Text.satisfies(node, "CC"),
+                    PARENT_OF.searchNodeIterator(vp),
+                ):
+                    for vp2 in filter(
+                        lambda node: Node_Text.satisfies(node, "VP"),
                         PARENT_OF.searchNodeIterator(vp),
                     ):
-                        for vp2 in filter(
-                            lambda node: Node_Text.satisfies(node, "VP"),
-                            PARENT_OF.searchNodeIterator(vp),
+                        for _ in filter(
+                            lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
+                            IMMEDIATELY_HEADED_BY.searchNodeIterator(vp2),
                         ):
-                            for _ in filter(
-                                lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
-                                IMMEDIATELY_HEADED_BY.searchNodeIterator(vp2),
-                            ):
-                                yield candidate
+                            yield candidate
 
 
 class CT(Abstract_Searcher):
@@ -419,82 +463,80 @@ class CT(Abstract_Searcher):
             if not any(Node_Text.in_(node, ("SBAR", "VP")) for node in DOMINATED_BY.searchNodeIterator(t)):
                 yield t
 
+    candidate_labels = ("S", "SBARQ", "SINV", "SQ")
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         S|SBARQ|SINV|SQ [> ROOT | [$-- S|SBARQ|SINV|SQ !>> SBAR|VP]] << (SBAR < (S|SINV|SQ [> ROOT <, (VP <# VB) | <# MD|VBZ|VBP|VBD | < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])]))
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.in_(candidate, ("S", "SBARQ", "SINV", "SQ")):
-                continue
-            for _ in cls.conditionOneHelper(candidate):
-                # Condition 2: S|SBARQ|SINV|SQ << (SBAR < (S|SINV|SQ [> ROOT <, (VP <# VB) | <# MD|VBZ|VBP|VBD | < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])]))
-                for sbar in filter(
-                    lambda node: Node_Text.satisfies(node, "SBAR"),
-                    DOMINATES.searchNodeIterator(candidate),
+        for _ in cls.conditionOneHelper(candidate):
+            # Condition 2: S|SBARQ|SINV|SQ << (SBAR < (S|SINV|SQ [> ROOT <, (VP <# VB) | <# MD|VBZ|VBP|VBD | < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])]))
+            for sbar in filter(
+                lambda node: Node_Text.satisfies(node, "SBAR"),
+                DOMINATES.searchNodeIterator(candidate),
+            ):
+                for s in filter(
+                    lambda node: Node_Text.in_(node, ("S", "SINV", "SQ")),
+                    PARENT_OF.searchNodeIterator(sbar),
                 ):
-                    for s in filter(
-                        lambda node: Node_Text.in_(node, ("S", "SINV", "SQ")),
-                        PARENT_OF.searchNodeIterator(sbar),
+                    # Branch 2.1: S|SINV|SQ > ROOT <, (VP <# VB)
+                    for _ in filter(
+                        lambda node: Node_Text.satisfies(node, "ROOT"),
+                        CHILD_OF.searchNodeIterator(s),
                     ):
-                        # Branch 2.1: S|SINV|SQ > ROOT <, (VP <# VB)
-                        for _ in filter(
-                            lambda node: Node_Text.satisfies(node, "ROOT"),
-                            CHILD_OF.searchNodeIterator(s),
-                        ):
-                            for vp in filter(
-                                lambda node: Node_Text.satisfies(node, "VP"),
-                                HAS_LEFTMOST_CHILD.searchNodeIterator(s),
-                            ):
-                                for _ in filter(
-                                    lambda node: Node_Text.satisfies(node, "VB"),
-                                    IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
-                                ):
-                                    yield candidate
-                        # Branch 2.2: S|SINV|SQ <# MD|VBZ|VBP|VBD
-                        for _ in filter(
-                            lambda node: Node_Text.in_(node, ("MD", "VBZ", "VBP", "VBD")),
-                            IMMEDIATELY_HEADED_BY.searchNodeIterator(s),
-                        ):
-                            yield candidate
-                        # Branch 2.3: S|SINV|SQ < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])
                         for vp in filter(
                             lambda node: Node_Text.satisfies(node, "VP"),
-                            PARENT_OF.searchNodeIterator(s),
+                            HAS_LEFTMOST_CHILD.searchNodeIterator(s),
                         ):
-                            # Branch 2.3.1: VP <# MD|VBP|VBZ|VBD
                             for _ in filter(
-                                lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
+                                lambda node: Node_Text.satisfies(node, "VB"),
                                 IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
                             ):
                                 yield candidate
-                            # Branch 2.3.2: VP < CC < (VP <# MD|VBP|VBZ|VBD)
-                            for _ in filter(
-                                lambda node: Node_Text.satisfies(node, "CC"),
+                    # Branch 2.2: S|SINV|SQ <# MD|VBZ|VBP|VBD
+                    for _ in filter(
+                        lambda node: Node_Text.in_(node, ("MD", "VBZ", "VBP", "VBD")),
+                        IMMEDIATELY_HEADED_BY.searchNodeIterator(s),
+                    ):
+                        yield candidate
+                    # Branch 2.3: S|SINV|SQ < (VP [<# MD|VBP|VBZ|VBD | < CC < (VP <# MD|VBP|VBZ|VBD)])
+                    for vp in filter(
+                        lambda node: Node_Text.satisfies(node, "VP"),
+                        PARENT_OF.searchNodeIterator(s),
+                    ):
+                        # Branch 2.3.1: VP <# MD|VBP|VBZ|VBD
+                        for _ in filter(
+                            lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
+                            IMMEDIATELY_HEADED_BY.searchNodeIterator(vp),
+                        ):
+                            yield candidate
+                        # Branch 2.3.2: VP < CC < (VP <# MD|VBP|VBZ|VBD)
+                        for _ in filter(
+                            lambda node: Node_Text.satisfies(node, "CC"),
+                            PARENT_OF.searchNodeIterator(vp),
+                        ):
+                            for vp2 in filter(
+                                lambda node: Node_Text.satisfies(node, "VP"),
                                 PARENT_OF.searchNodeIterator(vp),
                             ):
-                                for vp2 in filter(
-                                    lambda node: Node_Text.satisfies(node, "VP"),
-                                    PARENT_OF.searchNodeIterator(vp),
+                                for _ in filter(
+                                    lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
+                                    IMMEDIATELY_HEADED_BY.searchNodeIterator(vp2),
                                 ):
-                                    for _ in filter(
-                                        lambda node: Node_Text.in_(node, ("MD", "VBP", "VBZ", "VBD")),
-                                        IMMEDIATELY_HEADED_BY.searchNodeIterator(vp2),
-                                    ):
-                                        yield candidate
+                                    yield candidate
 
 
 class CP(Abstract_Searcher):
+    candidate_labels = ("ADJP", "ADVP", "NP", "VP")
+
     @classmethod
-    def searchNodeIterator(cls, t: Tree) -> Generator[Tree, None, None]:
+    def matchCandidate(cls, candidate: Tree) -> Generator[Tree, None, None]:
         """
         ADJP|ADVP|NP|VP < CC
         """
-        for candidate in t.preorder_iter():
-            if not Node_Text.in_(candidate, ("ADJP", "ADVP", "NP", "VP")):
-                continue
-            for _ in filter(
-                lambda node: Node_Text.satisfies(node, "CC"),
-                PARENT_OF.searchNodeIterator(candidate),
-            ):
-                yield candidate
+        for _ in filter(
+            lambda node: Node_Text.satisfies(node, "CC"),
+            PARENT_OF.searchNodeIterator(candidate),
+        ):
+            yield candidate
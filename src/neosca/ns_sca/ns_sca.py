@@ -4,13 +4,25 @@ import logging
 import os
 import os.path as os_path
 import sys
+from collections.abc import Generator, Iterable
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
 
-from neosca.ns_io import Ns_Cache, Ns_IO
+from neosca.ns_io import Ns_Cache, Ns_IO, Ns_Values_Writer
+from neosca.ns_parse_pool import Ns_Parse_Pool, Ns_Run_Mixin
 from neosca.ns_sca.ns_sca_counter import Ns_SCA_Counter
 from neosca.ns_utils import Ns_Procedure_Result
 
+if TYPE_CHECKING:
+    from neosca.ns_sca.ns_sca_results import Ns_SCA_Results
+
+
+class Ns_SCA(Ns_Run_Mixin):
+    ANALYZER_NAME = "sca"
+    RUN_CONFIG_ATTRS = ("selected_measures", "precision", "is_skip_parsing", "user_data")
+    PARSE_FILE_METHOD_NAME = "get_forest_frm_cache_or_file"
+    PARSE_TEXTS_METHOD_NAME = "get_forests_frm_texts"
 
-class Ns_SCA:
     def __init__(  # {{{
         self,
         ofile_freq: str = "result.csv",
@@ -24,6 +36,11 @@ class Ns_SCA:
         is_skip_parsing: bool = False,
         is_save_matches: bool = False,
         is_save_values: bool = True,
+        is_counting_only: bool = False,
+        is_streaming: bool = False,
+        is_resuming: bool = False,
+        jobs: int = 1,
+        batch_size: int = 1,
         config: str | None = None,
     ) -> None:
         self.ofile_freq = ofile_freq
@@ -37,6 +54,20 @@ class Ns_SCA:
         self.is_skip_parsing = is_skip_parsing
         self.is_save_matches = is_save_matches
         self.is_save_values = is_save_values
+        # Keep only the values of structures, not their matches, for runs
+        # where matches are neither saved nor shown
+        self.is_counting_only = is_counting_only
+        # Write the values and matches of each file once it is processed, and
+        # release its counter, instead of keeping all of them in self.counters
+        self.is_streaming = is_streaming
+        # Skip files whose values a previous, interrupted run has written, as
+        # recorded in the manifest next to ofile_freq
+        self.is_resuming = is_resuming
+        # Number of processes to parse files in, see Ns_Parse_Pool
+        self.jobs = jobs
+        # Number of files sent to the Stanza pipeline at once
+        self.batch_size = batch_size
+        self.parse_pool: Ns_Parse_Pool | None = None
 
         self.user_data, self.user_structure_defs, self.user_snames = self.load_user_config(config)
         logging.debug(f"User defined snames: {self.user_snames}")
@@ -71,14 +102,32 @@ class Ns_SCA:
 
     # }}}
     def get_forest_frm_file(self, file_path: str) -> str:  # {{{
-        from neosca.ns_nlp import Ns_NLP_Stanza
-        from stanza import Document
-
         if self.is_skip_parsing:
             # Assume input as parse trees, e.g., (ROOT (S (NP) (VP)))
             return Ns_IO.load_file(file_path)
 
+        if self.parse_pool is not None:
+            return self.parse_pool.take(file_path)
+
         cache_path, is_cache_available = Ns_Cache.get_cache_path(file_path)
+        return self.get_forest_frm_cache_or_file(file_path, cache_path, is_cache_available)
+
+    # }}}
+    def get_forests_frm_texts(  # {{{
+        self, texts: list[str], *, cache_paths: list[str | None] | None = None
+    ) -> list[str]:
+        from neosca.ns_nlp import Ns_NLP_Stanza
+
+        return Ns_NLP_Stanza.get_constituency_forests(texts, cache_paths=cache_paths)
+
+    # }}}
+    def get_forest_frm_cache_or_file(  # {{{
+        self, file_path: str, cache_path: str, is_cache_available: bool
+    ) -> str:
+        from stanza import Document
+
+        from neosca.ns_nlp import Ns_NLP_Stanza
+
         # Use cache
         if self.is_use_cache and is_cache_available:
             logging.info(f"Loading cache: {cache_path}.")
@@ -111,6 +160,7 @@ class Ns_SCA:
             file_path,
             selected_measures=self.selected_measures,
             user_structure_defs=self.user_structure_defs,
+            is_counting_only=self.is_counting_only,
         )
         counter.determine_all_values(forest)
         self.counters.append(counter)
@@ -132,6 +182,7 @@ class Ns_SCA:
                 file_path,
                 selected_measures=self.selected_measures,
                 user_structure_defs=self.user_structure_defs,
+                is_counting_only=self.is_counting_only,
             )
             # Query
             counter.determine_all_values(forest)
@@ -141,12 +192,17 @@ class Ns_SCA:
             counter = Ns_SCA_Counter(
                 selected_measures=self.selected_measures,
                 user_structure_defs=self.user_structure_defs,
+                is_counting_only=self.is_counting_only,
             )
-            # Merge measures defined by tregex_pattern
-            for i, subfile in enumerate(subfiles, 1):
-                logging.info(f'Processing "{subfile}" ({i}/{total})...')
-                child_counter = self.run_on_file_or_subfiles(subfile)
-                counter += child_counter
+
+            def yield_child_counters() -> Generator[Ns_SCA_Counter, None, None]:
+                for i, subfile in enumerate(subfiles, 1):
+                    logging.info(f'Processing "{subfile}" ({i}/{total})...')
+                    yield self.run_on_file_or_subfiles(subfile)
+
+            # Merge measures defined by tregex_pattern, each child counter is
+            # released once merged
+            counter.merge_from(yield_child_counters())
         else:
             raise ValueError(f"file_or_subfiles {file_or_subfiles} is neither str nor list")
         return counter
@@ -158,9 +214,25 @@ class Ns_SCA:
         if clear:
             self.counters.clear()
 
-        for file_or_subfiles in file_or_subfiles_list:
-            counter = self.run_on_file_or_subfiles(file_or_subfiles)
-            self.counters.append(counter)
+        # .npy files are written from the whole results table at once
+        if self.is_streaming and self.oformat_freq in Ns_Values_Writer.FORMATS:
+            with self.open_values_writer() if self.is_save_values else nullcontext() as writer:
+                if writer is not None:
+                    file_or_subfiles_list = writer.filter_unfinished(file_or_subfiles_list)
+                with self.open_parse_pool(file_or_subfiles_list):
+                    for file_or_subfiles in file_or_subfiles_list:
+                        counter = self.run_on_file_or_subfiles(file_or_subfiles)
+                        if self.is_save_matches:
+                            counter.dump_matches(self.odir_matched, self.is_stdout)
+                        if writer is not None:
+                            results = self.get_results((counter,))
+                            writer.write(next(results.iter_records(self.precision)), file_or_subfiles)
+            return
+
+        with self.open_parse_pool(file_or_subfiles_list):
+            for file_or_subfiles in file_or_subfiles_list:
+                counter = self.run_on_file_or_subfiles(file_or_subfiles)
+                self.counters.append(counter)
 
         if self.is_save_matches:
             self.dump_matches()
@@ -172,36 +244,37 @@ class Ns_SCA:
         for counter in self.counters:
             counter.dump_matches(self.odir_matched, self.is_stdout)
 
+    # }}}
+    def get_results(self, counters: Iterable[Ns_SCA_Counter] | None = None) -> "Ns_SCA_Results":  # {{{
+        from neosca.ns_sca.ns_sca_results import Ns_SCA_Results
+
+        return Ns_SCA_Results.from_counters(self.counters if counters is None else counters)
+
     # }}}
     def dump_values(self) -> None:  # {{{
         logging.debug("Writting counts and/or frequencies...")
 
         if len(self.counters) == 0:
             raise ValueError("empty counter list")
-
-        sname_value_maps: list[dict[str, str]] = [
-            counter.get_all_values(self.precision) for counter in self.counters
-        ]
-
-        handle = sys.stdout if self.is_stdout else open(self.ofile_freq, "w", encoding="utf-8", newline="")  # noqa: SIM115
-
-        if self.oformat_freq == "csv":
-            import csv
-
-            fieldnames = sname_value_maps[0].keys()
-            csv_writer = csv.DictWriter(handle, fieldnames=fieldnames)
-
-            csv_writer.writeheader()
-            csv_writer.writerows(sname_value_maps)
-
-        elif self.oformat_freq == "json":
-            import json
-
-            json.dump(sname_value_maps, handle, ensure_ascii=False, indent=2)
+        if self.oformat_freq not in (*Ns_Values_Writer.FORMATS, "npy"):
+            raise ValueError(f'oformat_freq {self.oformat_freq} not in ("csv", "json", "jsonl", "npy")')
+
+        results = self.get_results()
+
+        if self.oformat_freq == "npy":
+            handle = sys.stdout.buffer if self.is_stdout else open(self.ofile_freq, "wb")  # noqa: SIM115
+            results.dump_npy(handle)
+            if not self.is_stdout:
+                handle.close()
+        elif self.oformat_freq == "csv":
+            handle = sys.stdout if self.is_stdout else open(self.ofile_freq, "w", encoding="utf-8", newline="")  # noqa: SIM115
+            results.dump_csv(handle, self.precision)
+            if not self.is_stdout:
+                handle.close()
         else:
-            raise ValueError(f'oformat_freq {self.oformat_freq} not in ("csv", "json")')
-
-        handle.close()
+            with self.open_values_writer() as writer:
+                for record in results.iter_records(self.precision):
+                    writer.write(record)
         # }}}
 
     @classmethod
@@ -210,3 +283,10 @@ class Ns_SCA:
         for s_name in counter.selected_measures:
             print(f"{s_name}: {counter.get_structure(s_name).description}")
         return True, None
+
+    def explain_patterns(self) -> Ns_Procedure_Result:
+        counter = Ns_SCA_Counter(
+            selected_measures=self.selected_measures, user_structure_defs=self.user_structure_defs
+        )
+        print(counter.explain_patterns())
+        return True, None
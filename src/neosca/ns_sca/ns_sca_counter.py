@@ -1,23 +1,211 @@
 #!/usr/bin/env python3
 
-import io
+import ast
 import logging
+import operator
 import os
 import os.path as os_path
 import re
 import shutil
 import sys
-import tokenize
+from array import array
 from collections import OrderedDict
-from copy import deepcopy
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping, Sequence
+from types import MappingProxyType
+from typing import Any
 
 from neosca.ns_about import __title__
 from neosca.ns_consts import DATA_DIR
 from neosca.ns_exceptions import CircularDefinitionError, InvalidSourceError, StructureNotFoundError
 from neosca.ns_io import Ns_IO
 from neosca.ns_sca import l2sca
+from neosca.ns_tregex.forest import Forest
 from neosca.ns_tregex.tree import Tree
-from neosca.ns_utils import safe_div
+from neosca.ns_tregex.tregex_pattern import Forest_Stats, Tregex_Pattern
+from neosca.ns_utils import safe_div, safe_div_columns
+
+
+class Ns_SCA_Matches(Sequence[str]):
+    """
+    Matches of a structure, kept as offsets into the leaves of the documents
+    they were found in: document, sentence, and [start, end) of the leaves. The
+    text of a match is only joined when it is read, i.e., when matches are
+    dumped, exported, or shown in the matches dialog.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        # leaf strings of each sentence, one entry per document
+        self.documents: list[list[tuple[str, ...]]] = []
+        self._document_id_map: dict[int, int] = {}
+        self.document_ids = array("i")
+        self.sentence_ids = array("i")
+        self.leaf_starts = array("i")
+        self.leaf_ends = array("i")
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> "Ns_SCA_Matches":
+        # Every string is stored as a one-leaf sentence
+        matches = cls()
+        sentences: list[tuple[str, ...]] = [(string,) for string in strings]
+        document_id = matches.add_document(sentences)
+        for sentence_id in range(len(sentences)):
+            matches.append(document_id, sentence_id, 0, 1)
+        return matches
+
+    def add_document(self, sentences: list[tuple[str, ...]]) -> int:
+        if (document_id := self._document_id_map.get(id(sentences))) is None:
+            document_id = self._document_id_map[id(sentences)] = len(self.documents)
+            self.documents.append(sentences)
+        return document_id
+
+    def append(self, document_id: int, sentence_id: int, leaf_start: int, leaf_end: int) -> None:
+        self.document_ids.append(document_id)
+        self.sentence_ids.append(sentence_id)
+        self.leaf_starts.append(leaf_start)
+        self.leaf_ends.append(leaf_end)
+
+    def extend(self, other: "Ns_SCA_Matches") -> None:
+        document_id_map = [self.add_document(sentences) for sentences in other.documents]
+        if document_id_map == list(range(len(document_id_map))):
+            self.document_ids.extend(other.document_ids)
+        else:
+            self.document_ids.extend(document_id_map[document_id] for document_id in other.document_ids)
+        self.sentence_ids.extend(other.sentence_ids)
+        self.leaf_starts.extend(other.leaf_starts)
+        self.leaf_ends.extend(other.leaf_ends)
+
+    def _render(self, i: int) -> str:
+        sentence = self.documents[self.document_ids[i]][self.sentence_ids[i]]
+        return " ".join(sentence[self.leaf_starts[i] : self.leaf_ends[i]])
+
+    def __len__(self) -> int:
+        return len(self.document_ids)
+
+    def __getitem__(self, i):  # type:ignore
+        if isinstance(i, slice):
+            return [self._render(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("match index out of range")
+        return self._render(i)
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self._render, range(len(self)))
+
+    def __add__(self, other: "Ns_SCA_Matches") -> "Ns_SCA_Matches":
+        new = Ns_SCA_Matches()
+        new.extend(self)
+        new.extend(other)
+        return new
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=False))
+
+    __hash__ = None  # type:ignore
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class Ns_SCA_Value_Source:
+    """
+    value_source of a structure, e.g. "VP1 + VP2", compiled once into a
+    closure that computes the value from the values of other structures
+    """
+
+    # value_source -> compiled
+    compiled_value_sources: dict[str, "Ns_SCA_Value_Source"] = {}
+
+    BINARY_OP_MAP: dict[type[ast.operator], Callable[[Any, Any], int | float]] = {
+        ast.Add: operator.add,
+        ast.Sub: operator.sub,
+        ast.Mult: operator.mul,
+        ast.Div: safe_div,
+    }
+    COLUMN_BINARY_OP_MAP: dict[type[ast.operator], Callable[[Any, Any], Any]] = {
+        **BINARY_OP_MAP,
+        ast.Div: safe_div_columns,
+    }
+    UNARY_OP_MAP: dict[type[ast.unaryop], Callable[[Any], int | float]] = {
+        ast.UAdd: operator.pos,
+        ast.USub: operator.neg,
+    }
+
+    def __init__(self, value_source: str) -> None:
+        self.value_source = value_source
+        try:
+            tree = ast.parse(value_source.strip(), mode="eval")
+        except SyntaxError as e:
+            raise InvalidSourceError(f'Invalid value_source "{value_source}": {e.msg}') from e
+
+        name_nodes = sorted(
+            (node for node in ast.walk(tree) if isinstance(node, ast.Name)),
+            key=lambda node: (node.lineno, node.col_offset),
+        )
+        # names of the structures it depends on, in the order they appear
+        self.snames: tuple[str, ...] = tuple(dict.fromkeys(node.id for node in name_nodes))
+        # Matches are only passed on by sums, e.g. "VP1 + VP2", where they are
+        # concatenated
+        is_addition_only = all(
+            isinstance(node.op, ast.Add)
+            for node in ast.walk(tree)
+            if isinstance(node, (ast.BinOp, ast.UnaryOp))
+        )
+        self.match_snames: tuple[str, ...] = tuple(node.id for node in name_nodes) if is_addition_only else ()
+        self._body = tree.body
+        self._evaluate = self._compile(self._body, self.BINARY_OP_MAP)
+        self._evaluate_columns: Callable | None = None
+
+    @classmethod
+    def compile(cls, value_source: str) -> "Ns_SCA_Value_Source":
+        if (compiled := cls.compiled_value_sources.get(value_source)) is None:
+            compiled = cls.compiled_value_sources[value_source] = cls(value_source)
+        return compiled
+
+    def _compile(
+        self, node: ast.expr, binary_op_map: Mapping[type[ast.operator], Callable[[Any, Any], Any]]
+    ) -> Callable[[Callable[[str], Any]], Any]:
+        # Only names, numbers, parentheses, and +-*/ are allowed
+        if isinstance(node, ast.Name):
+            sname = node.id
+            return lambda get_value: get_value(sname)
+        if (
+            isinstance(node, ast.Constant)
+            and isinstance(node.value, (int, float))
+            and not isinstance(node.value, bool)
+        ):
+            number = node.value
+            return lambda _: number
+        if isinstance(node, ast.BinOp) and (binary_op := binary_op_map.get(type(node.op))) is not None:
+            left, right = self._compile(node.left, binary_op_map), self._compile(node.right, binary_op_map)
+            return lambda get_value: binary_op(left(get_value), right(get_value))
+        if isinstance(node, ast.UnaryOp) and (unary_op := self.UNARY_OP_MAP.get(type(node.op))) is not None:
+            operand = self._compile(node.operand, binary_op_map)
+            return lambda get_value: unary_op(operand(get_value))
+        raise InvalidSourceError(f'Unexpected token: "{ast.unparse(node)}" in "{self.value_source}"')
+
+    def evaluate(self, get_value: Callable[[str], int | float]) -> int | float:
+        """
+        :param get_value: returns the value of a structure given its name
+        """
+        return self._evaluate(get_value)
+
+    def evaluate_columns(self, get_column: Callable[[str], Any]) -> Any:
+        """
+        Like evaluate(), but on whole columns at once, e.g., NumPy arrays of
+        the values of all files
+
+        :param get_column: returns the values of a structure given its name
+        """
+        if self._evaluate_columns is None:
+            self._evaluate_columns = self._compile(self._body, self.COLUMN_BINARY_OP_MAP)
+        return self._evaluate_columns(get_column)
 
 
 class Ns_SCA_Structure:
@@ -48,9 +236,9 @@ class Ns_SCA_Structure:
 
         self.tregex_pattern = tregex_pattern
         self.value_source = value_source
-
-        self.value: float | int | None = None
-        self.matches: list[str] = []
+        self.compiled_value_source: Ns_SCA_Value_Source | None = (
+            Ns_SCA_Value_Source.compile(value_source) if value_source is not None else None
+        )
 
     def definition(self) -> str:
         if self.tregex_pattern is not None:
@@ -73,63 +261,115 @@ class Ns_SCA_Structure:
         return not self.has_value_source()
 
     def __repr__(self) -> str:  # pragma: no cover
-        return f"name: {self.name}\ndescription: {self.description}\n{self.definition()}\nvalue: {self.value}"
-
-    def __add__(self, other) -> int | float:
-        assert self.value is not None
-        if isinstance(other, (float, int)):
-            return self.value + other
-
-        assert other.value is not None
-        return self.value + other.value
-
-    def __radd__(self, other) -> int | float:
-        assert self.value is not None
-        if isinstance(other, (float, int)):
-            return other + self.value
-        raise NotImplementedError
-
-    def __sub__(self, other) -> int | float:
-        assert self.value is not None
-        if isinstance(other, (float, int)):
-            return self.value - other
-
-        assert other.value is not None
-        return self.value - other.value
-
-    def __rsub__(self, other) -> int | float:
-        assert self.value is not None
-        if isinstance(other, (float, int)):
-            return other - self.value
-        raise NotImplementedError
-
-    def __mul__(self, other) -> int | float:
-        assert self.value is not None
-        if isinstance(other, (float, int)):
-            return self.value * other
-
-        assert other.value is not None
-        return self.value * other.value
-
-    def __rmul__(self, other) -> int | float:
-        assert self.value is not None
-        if isinstance(other, (float, int)):
-            return other * self.value
-        raise NotImplementedError
-
-    def __truediv__(self, other) -> float:
-        assert self.value is not None
-        if isinstance(other, (float, int)):
-            return safe_div(self.value, other)
+        return f"name: {self.name}\ndescription: {self.description}\n{self.definition()}"
+
+
+class Ns_SCA_Evaluation_Plan:
+    """
+    Order in which structures are determined, built once per set of structure
+    definitions and selected measures: every structure comes after those its
+    value_source depends on, and only the structures the selected measures
+    reach are included. Circular and undefined dependencies are reported when
+    the plan is built rather than in the middle of a run.
+    """
+
+    # (definitions, selected measures) -> plan, the least recently used are
+    # dropped beyond max_compiled_plans
+    compiled_plans: OrderedDict[tuple, "Ns_SCA_Evaluation_Plan"] = OrderedDict()
+    max_compiled_plans: int = 128
+
+    def __init__(self, sname_structure_map: Mapping[str, Ns_SCA_Structure], selected_measures: Iterable[str]):
+        order = self.topological_order(sname_structure_map)
+
+        reachable_snames: set[str] = set()
+        pending_snames = list(selected_measures)
+        while pending_snames:
+            sname = pending_snames.pop()
+            if sname in reachable_snames:
+                continue
+            if sname not in sname_structure_map:
+                raise StructureNotFoundError(f"{sname} not found.")
+            reachable_snames.add(sname)
+            if (compiled_value_source := sname_structure_map[sname].compiled_value_source) is not None:
+                pending_snames.extend(compiled_value_source.snames)
+
+        self.snames: tuple[str, ...] = tuple(sname for sname in order if sname in reachable_snames)
+        # terminals searched for in the forest, and structures computed from
+        # other structures afterwards
+        self.tregex_snames: tuple[str, ...] = tuple(
+            sname for sname in self.snames if sname_structure_map[sname].tregex_pattern is not None
+        )
+        self.value_source_snames: tuple[str, ...] = tuple(
+            sname for sname in self.snames if sname_structure_map[sname].value_source is not None
+        )
+        self.is_counting_words: bool = "W" in reachable_snames
 
-        assert other.value is not None
-        return safe_div(self.value, other.value)
+    @classmethod
+    def build(
+        cls, sname_structure_map: Mapping[str, Ns_SCA_Structure], selected_measures: Iterable[str]
+    ) -> "Ns_SCA_Evaluation_Plan":
+        selected_measures = tuple(selected_measures)
+        key = (
+            tuple(
+                (sname, structure.tregex_pattern, structure.value_source)
+                for sname, structure in sname_structure_map.items()
+            ),
+            selected_measures,
+        )
+        if (plan := cls.compiled_plans.get(key)) is not None:
+            cls.compiled_plans.move_to_end(key)
+            return plan
+        plan = cls.compiled_plans[key] = cls(sname_structure_map, selected_measures)
+        while len(cls.compiled_plans) > cls.max_compiled_plans:
+            cls.compiled_plans.popitem(last=False)
+        return plan
 
-    def __rtruediv__(self, other) -> float:
-        assert self.value is not None
-        if isinstance(other, (float, int)):
-            return safe_div(other, self.value)
-        raise NotImplementedError
+    @classmethod
+    def topological_order(cls, sname_structure_map: Mapping[str, Ns_SCA_Structure]) -> list[str]:
+        """
+        All structure names, each after the structures its value_source refers
+        to. Raise CircularDefinitionError on cycles and StructureNotFoundError
+        on references to undefined structures.
+        """
+        order: list[str] = []
+        done_snames: set[str] = set()
+        for root_sname in sname_structure_map:
+            if root_sname in done_snames:
+                continue
+            # depth-first, path_snames being the chain of structures whose
+            # dependencies are being resolved
+            path_snames: list[str] = [root_sname]
+            iterators = [iter(cls._dependency_snames(sname_structure_map, root_sname))]
+            while iterators:
+                sname = next(iterators[-1], None)
+                if sname is None:
+                    iterators.pop()
+                    finished_sname = path_snames.pop()
+                    done_snames.add(finished_sname)
+                    order.append(finished_sname)
+                    continue
+                if sname in done_snames:
+                    continue
+                if sname in path_snames:
+                    circular_definition = ", ".join(
+                        f"{ancestor_sname} = {sname_structure_map[ancestor_sname].value_source}"
+                        for ancestor_sname in path_snames[path_snames.index(sname) :]
+                    )
+                    raise CircularDefinitionError(f"Circular definition: {circular_definition}")
+                if sname not in sname_structure_map:
+                    dependent_structure = sname_structure_map[path_snames[-1]]
+                    raise StructureNotFoundError(
+                        f"{sname} not found, referred to by"
+                        f" {dependent_structure.name} = {dependent_structure.value_source}."
+                    )
+                path_snames.append(sname)
+                iterators.append(iter(cls._dependency_snames(sname_structure_map, sname)))
+        return order
+
+    @staticmethod
+    def _dependency_snames(sname_structure_map: Mapping[str, Ns_SCA_Structure], sname: str) -> tuple[str, ...]:
+        compiled_value_source = sname_structure_map[sname].compiled_value_source
+        return () if compiled_value_source is None else compiled_value_source.snames
 
 
 class Ns_SCA_Counter:
@@ -180,18 +420,67 @@ class Ns_SCA_Counter:
         "CP": l2sca.CP,
     }
 
+    WORD_RE = re.compile(r"\([A-Z]+\$? [^()—–-]+\)")
+
+    # user structure definitions -> (sname_structure_map, sname_id_map,
+    # default measures), shared by every counter with these definitions. The
+    # least recently used are dropped beyond max_shared_structure_defs.
+    shared_structure_defs: OrderedDict[
+        tuple, tuple[Mapping[str, Ns_SCA_Structure], dict[str, int], list[str]]
+    ] = OrderedDict()
+    max_shared_structure_defs: int = 128
+
     def __init__(
         self,
         ifile="",
         *,
         selected_measures: list[str] | None = None,
         user_structure_defs: list[dict[str, str]] | None = None,
+        is_counting_only: bool = False,
     ) -> None:
+        """
+        :param is_counting_only: only count structures, without keeping their matches
+        """
         self.ifile = ifile
+        self.user_structure_defs = user_structure_defs
+        self.is_counting_only = is_counting_only
 
-        user_sname_structure_map: dict[str, Ns_SCA_Structure] = {}
-        user_snames: set[str] | None = None
+        # Definitions are read-only and shared, values and matches of this
+        # counter are kept in slots indexed by structure id
+        self.sname_structure_map, self.sname_id_map, default_measures = Ns_SCA_Counter.get_structure_defs(
+            user_structure_defs
+        )
+        self.values: list[float | int | None] = [None] * len(self.sname_id_map)
+        self.matches: list[Ns_SCA_Matches | None] = [None] * len(self.sname_id_map)
+
+        if selected_measures is not None:
+            for sname in selected_measures:
+                if sname not in self.sname_id_map:
+                    raise ValueError(f"{sname} has not been defined.")
+        self.selected_measures: list[str] = (
+            selected_measures if selected_measures is not None else default_measures
+        )
+        logging.debug(f"Selected measures: {self.selected_measures}")
+        self.evaluation_plan = Ns_SCA_Evaluation_Plan.build(self.sname_structure_map, self.selected_measures)
+
+    @classmethod
+    def get_structure_defs(
+        cls, user_structure_defs: list[dict[str, str]] | None
+    ) -> tuple[Mapping[str, Ns_SCA_Structure], dict[str, int], list[str]]:
+        """
+        Built-in and user-defined structures, checked and built once per set of
+        user definitions
+        """
+        key = (
+            ()
+            if user_structure_defs is None
+            else tuple(tuple(kwargs.items()) for kwargs in user_structure_defs)
+        )
+        if (structure_defs := cls.shared_structure_defs.get(key)) is not None:
+            cls.shared_structure_defs.move_to_end(key)
+            return structure_defs
 
+        user_sname_structure_map: dict[str, Ns_SCA_Structure] = {}
         if user_structure_defs is not None:
             user_snames = Ns_SCA_Counter.check_user_structure_def(user_structure_defs)
             logging.debug(f"User definded snames: {user_snames}")
@@ -199,19 +488,15 @@ class Ns_SCA_Counter:
             for kwargs in user_structure_defs:
                 user_sname_structure_map[kwargs["name"]] = Ns_SCA_Structure(**kwargs)
 
-        self.sname_structure_map: dict[str, Ns_SCA_Structure] = deepcopy(Ns_SCA_Counter.BUILTIN_STRUCTURE_DEFS)
-        self.sname_structure_map.update(user_sname_structure_map)
-
-        default_measures = Ns_SCA_Counter.DEFAULT_MEASURES + [
-            sname for sname in user_sname_structure_map if sname not in Ns_SCA_Counter.DEFAULT_MEASURES
+        sname_structure_map = MappingProxyType({**cls.BUILTIN_STRUCTURE_DEFS, **user_sname_structure_map})
+        sname_id_map = {sname: sid for sid, sname in enumerate(sname_structure_map)}
+        default_measures = cls.DEFAULT_MEASURES + [
+            sname for sname in user_sname_structure_map if sname not in cls.DEFAULT_MEASURES
         ]
-
-        if selected_measures is not None:
-            Ns_SCA_Counter.check_undefined_measure(selected_measures, user_snames)
-        self.selected_measures: list[str] = (
-            selected_measures if selected_measures is not None else default_measures
-        )
-        logging.debug(f"Selected measures: {self.selected_measures}")
+        structure_defs = cls.shared_structure_defs[key] = (sname_structure_map, sname_id_map, default_measures)
+        while len(cls.shared_structure_defs) > cls.max_shared_structure_defs:
+            cls.shared_structure_defs.popitem(last=False)
+        return structure_defs
 
     @classmethod
     def check_user_structure_def(cls, user_structure_defs: list[dict[str, str]]) -> set[str]:
@@ -260,35 +545,52 @@ class Ns_SCA_Counter:
         else:
             return structure
 
-    def _check_matches(self, structure_name: str, matches: list[str]) -> None:
-        if structure_name not in self.sname_structure_map:
+    def get_structure_id(self, structure_name: str) -> int:
+        try:
+            return self.sname_id_map[structure_name]
+        except KeyError:
+            raise StructureNotFoundError(f"{structure_name} not found.") from KeyError
+
+    def _check_matches(self, structure_name: str, matches: list[str] | Ns_SCA_Matches) -> Ns_SCA_Matches:
+        if structure_name not in self.sname_id_map:
             raise StructureNotFoundError(f"{structure_name} not found")
-        elif not isinstance(matches, list):
-            raise ValueError("matches should be a list object")
+        elif isinstance(matches, list):
+            return Ns_SCA_Matches.from_strings(matches)
+        elif not isinstance(matches, Ns_SCA_Matches):
+            raise ValueError("matches should be a list or an Ns_SCA_Matches object")
+        return matches
 
-    def set_matches(self, structure_name: str, matches: list[str]) -> None:
-        self._check_matches(structure_name, matches)
-        self.sname_structure_map[structure_name].matches = matches
+    def set_matches(self, structure_name: str, matches: list[str] | Ns_SCA_Matches) -> None:
+        matches = self._check_matches(structure_name, matches)
+        self.matches[self.sname_id_map[structure_name]] = matches
 
-    def extend_matches(self, structure_name: str, matches: list[str]) -> None:
-        self._check_matches(structure_name, matches)
-        self.sname_structure_map[structure_name].matches.extend(matches)
+    def extend_matches(self, structure_name: str, matches: list[str] | Ns_SCA_Matches) -> None:
+        matches = self._check_matches(structure_name, matches)
+        self.get_matches(structure_name).extend(matches)
 
-    def get_matches(self, sname: str) -> list[str]:
-        return self.get_structure(sname).matches
+    def get_matches(self, sname: str) -> Ns_SCA_Matches:
+        sid = self.get_structure_id(sname)
+        if (matches := self.matches[sid]) is None:
+            matches = self.matches[sid] = Ns_SCA_Matches()
+        return matches
 
     def set_value(self, sname: str, value: int | float) -> None:
-        if sname not in self.sname_structure_map:
+        if sname not in self.sname_id_map:
             raise ValueError(f"{sname} not counted")
         elif not isinstance(value, (float, int)):
             raise ValueError(f"value should be either a float or an integer, got {value}")
         else:
-            self.sname_structure_map[sname].value = value
+            self.values[self.sname_id_map[sname]] = value
 
     def get_value(self, sname: str, precision: int = 4) -> float | int | None:
-        value = self.get_structure(sname).value
+        value = self.values[self.get_structure_id(sname)]
         return round(value, precision) if value is not None else value
 
+    def get_raw_value(self, sname: str) -> float | int:
+        value = self.values[self.get_structure_id(sname)]
+        assert value is not None, f"{sname} has not been determined."
+        return value
+
     def get_all_values(self, precision: int = 4) -> dict:
         # TODO should store Filename in an extra metadata layer
         ret = OrderedDict({"Filepath": self.ifile})
@@ -305,89 +607,180 @@ class Ns_SCA_Counter:
     def sname_is_terminal(self, sname: str) -> bool:
         return self.get_structure(sname).is_terminal()
 
-    def check_circular_def(self, descendant_sname: str, ancestor_snames: list[str]) -> None:
-        if descendant_sname in ancestor_snames:
-            circular_definition = ", ".join(
-                f"{ancestor_sname} = {self.get_structure(ancestor_sname).value_source}"
-                for ancestor_sname in ancestor_snames
-            )
-            raise CircularDefinitionError(f"Circular definition: {circular_definition}")
-        else:
-            logging.debug(
-                "[Tregex] Circular definition check passed: descendant"
-                f" {descendant_sname} not in ancestors {ancestor_snames}"
-            )
+    @classmethod
+    def count_words(cls, forest: Forest) -> int:
+        return sum(1 for _ in cls.WORD_RE.finditer(forest.string))
 
     @classmethod
-    def search_sname(cls, sname: str, forest: str) -> list[str]:
-        if sname not in cls.SNAME_SEARCHER_MAPPING:
+    def get_searcher(cls, sname: str, tregex_pattern: str | None = None) -> l2sca.Searcher:
+        """
+        The hand-written searcher of a built-in structure, or the compiled
+        tregex_pattern of a user-defined or redefined one
+        """
+        if sname in cls.SNAME_SEARCHER_MAPPING and (
+            tregex_pattern is None or tregex_pattern == cls.BUILTIN_STRUCTURE_DEFS[sname].tregex_pattern
+        ):
+            return cls.SNAME_SEARCHER_MAPPING[sname]
+        if tregex_pattern is None:
             raise ValueError(f"{sname} is not yet supported in {__title__}.")
+        return Tregex_Pattern.compile(tregex_pattern)
+
+    @classmethod
+    def search_sname(cls, sname: str, forest: Forest, tregex_pattern: str | None = None) -> Ns_SCA_Matches:
+        tregex_patterns = None if tregex_pattern is None else {sname: tregex_pattern}
+        return cls.search_snames((sname,), forest, tregex_patterns)[sname]
+
+    @classmethod
+    def search_snames(
+        cls, snames: Iterable[str], forest: Forest, tregex_patterns: Mapping[str, str] | None = None
+    ) -> dict[str, Ns_SCA_Matches]:
+        """
+        Search for several structures in one walk over each tree of the forest.
+        tregex_patterns maps snames to their patterns, snames left out are
+        searched for with the hand-written searchers. Matches are recorded as
+        leaf offsets, no text is joined here.
+        """
+        searcher_snames_map = cls.group_snames_by_searcher(snames, forest, tregex_patterns)
+        sname_matches_map: dict[str, Ns_SCA_Matches] = {
+            sname: Ns_SCA_Matches() for snames_ in searcher_snames_map.values() for sname in snames_
+        }
+        for searcher, sentence_id, node in cls.iter_searcher_nodes(searcher_snames_map, forest):
+            leaf_start, leaf_end = node.leftEdge(), node.rightEdge()
+            for sname in searcher_snames_map[searcher]:
+                matches = sname_matches_map[sname]
+                matches.append(matches.add_document(forest.leaf_strings()), sentence_id, leaf_start, leaf_end)
+        return sname_matches_map
+
+    @classmethod
+    def count_snames(
+        cls, snames: Iterable[str], forest: Forest, tregex_patterns: Mapping[str, str] | None = None
+    ) -> dict[str, int]:
+        """
+        Like search_snames(), but only count the matches
+        """
+        searcher_snames_map = cls.group_snames_by_searcher(snames, forest, tregex_patterns)
+        searcher_count_map: dict[l2sca.Searcher, int] = dict.fromkeys(searcher_snames_map, 0)
+        for searcher, _, _ in cls.iter_searcher_nodes(searcher_snames_map, forest):
+            searcher_count_map[searcher] += 1
+        return {
+            sname: searcher_count_map[searcher]
+            for searcher, snames_ in searcher_snames_map.items()
+            for sname in snames_
+        }
+
+    @classmethod
+    def group_snames_by_searcher(
+        cls, snames: Iterable[str], forest: Forest, tregex_patterns: Mapping[str, str] | None = None
+    ) -> dict[l2sca.Searcher, list[str]]:
+        searcher_snames_map: dict[l2sca.Searcher, list[str]] = {}
+        for sname in snames:
+            tregex_pattern = None if tregex_patterns is None else tregex_patterns.get(sname)
+            searcher_snames_map.setdefault(cls.get_searcher(sname, tregex_pattern), []).append(sname)
+
+        # Order the checks of compiled patterns to suit the first forest they
+        # search. Compiled patterns are shared, and the label distribution
+        # varies little between documents, so they are not planned again,
+        # which would cost another walk over every forest.
+        unplanned_patterns = [
+            searcher
+            for searcher in searcher_snames_map
+            if isinstance(searcher, Tregex_Pattern) and not searcher.is_planned_for_forest
+        ]
+        if unplanned_patterns:
+            stats = Forest_Stats.from_forest(forest)
+            for pattern in unplanned_patterns:
+                pattern.plan(stats)
+                pattern.is_planned_for_forest = True
+                logging.debug(pattern.explain())
+        return searcher_snames_map
 
-        matches = []
-        last_node = None
-        for tree in Tree.fromstring(forest):
-            for node in cls.SNAME_SEARCHER_MAPPING[sname].searchNodeIterator(tree):
-                if node is last_node:
+    @classmethod
+    def iter_searcher_nodes(
+        cls, searchers: Iterable[l2sca.Searcher], forest: Forest
+    ) -> Generator[tuple[l2sca.Searcher, int, Tree], None, None]:
+        """
+        Yield (searcher, sentence index, node) for every match in the forest
+        """
+        searcher_last_node_map: dict[l2sca.Searcher, Tree | None] = dict.fromkeys(searchers)
+        multi_searcher = l2sca.Multi_Searcher(searcher_last_node_map)
+        for sentence_id, tree in enumerate(forest):
+            for searcher, node in multi_searcher.searchNodeIterator(tree):
+                if node is searcher_last_node_map[searcher]:
                     # Mimic Tregex's -o option
                     # https://github.com/stanfordnlp/CoreNLP/blob/efc66a9cf49fecba219dfaa4025315ad966285cc/src/edu/stanford/nlp/trees/tregex/TregexPattern.java#L885
                     continue
-                last_node = node
-                span_string = node.span_string()
-                matches.append(span_string)
-        return matches
+                searcher_last_node_map[searcher] = node
+                yield searcher, sentence_id, node
 
-    def exec_value_source(
-        self,
-        value_source: str,
-        sname: str,
-        forest: str,
-        ancestor_snames: list[str],
-    ) -> tuple[float | int, list[str]]:
-        tokens = []
-        matches: list[str] = []
-        is_addition_only: bool = True
-        for t in tokenize.generate_tokens(io.StringIO(value_source).readline):
-            token_type, token_string, *_ = t
-            if token_type == tokenize.NAME:
-                ancestor_snames.append(sname)
-                self.check_circular_def(token_string, ancestor_snames)
-                self.determine_value(token_string, forest, ancestor_snames)
-                if self.sname_is_terminal(token_string):
-                    # No circular definition problem for terminal node.
-                    ancestor_snames.clear()
-                get_structure_code = f"self.get_structure('{token_string}')"
-                if is_addition_only:
-                    matches.extend(self.get_matches(token_string))
-                tokens.append((token_type, get_structure_code))
-            elif token_type == tokenize.NUMBER or token_string in ("(", ")"):
-                tokens.append((token_type, token_string))
-            elif token_string in ("+", "-", "*", "/"):
-                tokens.append((token_type, token_string))
-                if token_string != "+":
-                    matches.clear()
-                    is_addition_only = False
-            # Limit value_source as only NAMEs and numberic operators to assure security for `eval`
-            elif token_string != "":
-                raise InvalidSourceError(f'Unexpected token: "{token_string}"')
-        # Append "+ 0" to force tokens evaluated as number if value_source contains just name of another Structure
-        tokens.extend(((tokenize.PLUS, "+"), (tokenize.NUMBER, "0")))
-        return eval(tokenize.untokenize(tokens)), matches
-
-    def determine_value_from_tregex_pattern(self, sname: str, forest: str):
-        structure = self.get_structure(sname)
-        tregex_pattern = structure.tregex_pattern
-        assert tregex_pattern is not None
+    def explain_patterns(self) -> str:
+        """
+        How each structure that the selected measures depend on is searched
+        for: by a hand-written searcher, or by a compiled pattern whose plan is
+        printed
+        """
+        paragraphs = []
+        for sname in self.get_dependency_snames(self.selected_measures):
+            tregex_pattern = self.get_structure(sname).tregex_pattern
+            if tregex_pattern is None:
+                continue
+            searcher = self.get_searcher(sname, tregex_pattern)
+            if isinstance(searcher, Tregex_Pattern):
+                paragraphs.append(f"{sname}: {searcher.explain()}")
+            else:
+                paragraphs.append(f"{sname}: hand-written searcher for {tregex_pattern}")
+        return "\n\n".join(paragraphs)
 
-        logging.info(
-            f" Searching for {sname}"
-            + (f" ({structure.description})..." if structure.description is not None else "...")
-        )
-        logging.debug(f" Searching for {tregex_pattern}")
-        matched_subtrees = self.search_sname(sname, forest)
-        self.set_value(sname, len(matched_subtrees))
-        self.set_matches(sname, matched_subtrees)
+    def get_dependency_snames(self, snames: Iterable[str]) -> list[str]:
+        """
+        Return the given structures and every structure they depend on through
+        value_source, in the order they are first reached
+        """
+        dependency_snames: dict[str, None] = {}
+        pending_snames = list(snames)
+        while pending_snames:
+            sname = pending_snames.pop(0)
+            if sname in dependency_snames or sname not in self.sname_structure_map:
+                continue
+            dependency_snames[sname] = None
+            compiled_value_source = self.get_structure(sname).compiled_value_source
+            if compiled_value_source is not None:
+                pending_snames.extend(compiled_value_source.snames)
+        return list(dependency_snames)
 
-    def determine_value_from_value_source(self, sname: str, forest: str, ancestor_snames: list[str]) -> None:
+    def exec_value_source(self, value_source: str) -> tuple[float | int, Ns_SCA_Matches]:
+        """
+        Compute a value from already determined structures
+        """
+        compiled_value_source = Ns_SCA_Value_Source.compile(value_source)
+        matches = Ns_SCA_Matches()
+        for match_sname in () if self.is_counting_only else compiled_value_source.match_snames:
+            matches.extend(self.get_matches(match_sname))
+        return compiled_value_source.evaluate(self.get_raw_value), matches
+
+    def determine_value_from_tregex_pattern(self, sname: str, forest: Forest):
+        self.determine_values_from_tregex_patterns((sname,), forest)
+
+    def determine_values_from_tregex_patterns(self, snames: Iterable[str], forest: Forest) -> None:
+        tregex_patterns: dict[str, str] = {}
+        for sname in snames:
+            structure = self.get_structure(sname)
+            assert structure.tregex_pattern is not None
+            tregex_patterns[sname] = structure.tregex_pattern
+
+            logging.info(
+                f" Searching for {sname}"
+                + (f" ({structure.description})..." if structure.description is not None else "...")
+            )
+            logging.debug(f" Searching for {structure.tregex_pattern}")
+        if self.is_counting_only:
+            for sname, count in self.count_snames(tregex_patterns, forest, tregex_patterns).items():
+                self.set_value(sname, count)
+            return
+        for sname, matched_subtrees in self.search_snames(tregex_patterns, forest, tregex_patterns).items():
+            self.set_value(sname, len(matched_subtrees))
+            self.set_matches(sname, matched_subtrees)
+
+    def determine_value_from_value_source(self, sname: str) -> None:
         structure = self.get_structure(sname)
         value_source = structure.value_source
         assert value_source is not None, f"value_source for {sname} is None."
@@ -397,37 +790,43 @@ class Ns_SCA_Counter:
             + (f"({structure.description}) " if structure.description is not None else "")
             + f"= {value_source}..."
         )
-        value, matches = self.exec_value_source(value_source, sname, forest, ancestor_snames)
+        value, matches = self.exec_value_source(value_source)
         self.set_value(sname, value)
-        self.set_matches(sname, matches)
+        if not self.is_counting_only:
+            self.set_matches(sname, matches)
 
-    def determine_value(
-        self,
-        sname: str,
-        forest: str,
-        ancestor_snames: list[str] | None = None,
-    ) -> None:
+    def execute_plan(self, plan: Ns_SCA_Evaluation_Plan, forest: str | Forest) -> None:
+        """
+        Determine the structures of the plan that have no value yet: words,
+        then every Tregex pattern in one walk over the forest, then the
+        value_source structures in dependency order
+        """
+        if plan.is_counting_words and self.get_value("W") is None:
+            # Build the trees once and share them across all structures
+            if isinstance(forest, str):
+                forest = Forest.fromstring(forest)
+            logging.info(' Searching for "words"')
+            self.set_value("W", self.count_words(forest))
+
+        snames_to_search = [sname for sname in plan.tregex_snames if self.get_value(sname) is None]
+        if snames_to_search:
+            if isinstance(forest, str):
+                forest = Forest.fromstring(forest)
+            self.determine_values_from_tregex_patterns(snames_to_search, forest)
+
+        for sname in plan.value_source_snames:
+            if self.get_value(sname) is None:
+                self.determine_value_from_value_source(sname)
+
+    def determine_value(self, sname: str, forest: str | Forest) -> None:
         value = self.get_value(sname)
         if value is not None:
             logging.debug(f"[Tregex] {sname} has already been set as {value}, skipping...")
             return
+        self.execute_plan(Ns_SCA_Evaluation_Plan.build(self.sname_structure_map, (sname,)), forest)
 
-        if sname == "W":
-            logging.info(' Searching for "words"')
-            value = len(re.findall(r"\([A-Z]+\$? [^()—–-]+\)", forest))
-            self.set_value(sname, value)
-            return
-
-        if self.sname_has_tregex_pattern(sname):
-            self.determine_value_from_tregex_pattern(sname, forest)
-        else:
-            if ancestor_snames is None:
-                ancestor_snames = []
-            self.determine_value_from_value_source(sname, forest, ancestor_snames)
-
-    def determine_all_values(self, forest: str = "") -> None:
-        for sname in self.selected_measures:
-            self.determine_value(sname, forest)
+    def determine_all_values(self, forest: str | Forest = "") -> None:
+        self.execute_plan(self.evaluation_plan, forest)
 
     def dump_matches(self, odir_matched: str = "", is_stdout: bool = False) -> None:  # pragma: no cover
         bn_input = os_path.basename(self.ifile)
@@ -437,11 +836,15 @@ class Ns_SCA_Counter:
             shutil.rmtree(subodir_matched, ignore_errors=True)
             os.makedirs(subodir_matched)
         for sname, structure in self.sname_structure_map.items():
-            matches = structure.matches
+            sid = self.sname_id_map[sname]
+            matches = self.matches[sid]
             if not matches:
                 continue
 
-            meta_data = str(structure)
+            meta_data = (
+                f"name: {sname}\ndescription: {structure.description}\n{structure.definition()}\n"
+                f"value: {self.values[sid]}"
+            )
             res = "\n".join(matches)
             # Only accept alphanumeric chars, underscore, and hypen
             escaped_sname = re.sub(r"[^\w-]", "", sname.replace("/", "-per-"))
@@ -454,28 +857,54 @@ class Ns_SCA_Counter:
             else:
                 sys.stdout.write(f"{matches_id}\n{meta_data}\n\n{res}\n")
 
-    def __add__(self, other: "Ns_SCA_Counter") -> "Ns_SCA_Counter":
+    def merge_from(self, others: Iterable["Ns_SCA_Counter"]) -> None:
+        """
+        Add the values and matches of structures defined by tregex_pattern of
+        other counters, e.g., those of the subfiles of a file, to this one, and
+        then re-calculate structures defined by value_source once. Linear in the
+        total number of matches, unlike summing counters pairwise.
+        """
         logging.debug("Combining counters...")
-        new_ifile = self.ifile + "+" + other.ifile if self.ifile else other.ifile
-        new_selected_measures = list(dict.fromkeys(self.selected_measures + other.selected_measures))
-        new = Ns_SCA_Counter(new_ifile, selected_measures=new_selected_measures)
-        for sname, structure in new.sname_structure_map.items():
-            # Structures defined by value_source should be re-calculated after
-            # adding up structures defined by tregex_pattern
-            if structure.value_source is not None:
-                logging.debug(f"Skip combining {sname} as it is defined by value_source.")
-                continue
-
-            this_value = self.get_value(sname) or 0
-            that_value = other.get_value(sname) or 0
-            value = this_value + that_value
-            new.set_value(sname, value)
-            logging.debug(f"Combined {sname}: {this_value} + {that_value} = {value}")
-
-            matches: list[str] = self.get_matches(sname) + other.get_matches(sname)
-            new.set_matches(sname, matches)
-
-        # Re-calc measures defined by value_source
-        new.determine_all_values()
+        ifiles = [self.ifile] if self.ifile else []
+        selected_measures = dict.fromkeys(self.selected_measures)
+        terminal_sids = [
+            sid
+            for sname, sid in self.sname_id_map.items()
+            if self.sname_structure_map[sname].value_source is None
+        ]
+        values, matches = self.values, self.matches
+        for other in others:
+            if other.sname_structure_map is not self.sname_structure_map:
+                raise ValueError("Cannot combine counters with different structure definitions")
+            if ifiles or other.ifile:
+                ifiles.append(other.ifile)
+            selected_measures.update(dict.fromkeys(other.selected_measures))
+            for sid in terminal_sids:
+                values[sid] = (values[sid] or 0) + (other.values[sid] or 0)
+                if other_matches := other.matches[sid]:
+                    if matches[sid] is None:
+                        matches[sid] = Ns_SCA_Matches()
+                    matches[sid].extend(other_matches)  # type:ignore
+
+        self.ifile = "+".join(ifiles)
+        if len(selected_measures) != len(self.selected_measures):
+            self.selected_measures = list(selected_measures)
+            self.evaluation_plan = Ns_SCA_Evaluation_Plan.build(
+                self.sname_structure_map, self.selected_measures
+            )
+        # Structures defined by value_source should be re-calculated after
+        # adding up structures defined by tregex_pattern
+        for sname, sid in self.sname_id_map.items():
+            if self.sname_structure_map[sname].value_source is not None:
+                values[sid] = None
+                matches[sid] = None
+        self.determine_all_values()
 
+    def __add__(self, other: "Ns_SCA_Counter") -> "Ns_SCA_Counter":
+        new = Ns_SCA_Counter(
+            selected_measures=self.selected_measures,
+            user_structure_defs=self.user_structure_defs,
+            is_counting_only=self.is_counting_only and other.is_counting_only,
+        )
+        new.merge_from((self, other))
         return new
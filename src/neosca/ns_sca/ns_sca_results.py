@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import csv
+import json
+import math
+from collections.abc import Generator, Iterable, Mapping, Sequence
+from typing import IO, Any, BinaryIO
+
+import numpy as np
+
+from neosca.ns_sca.ns_sca_counter import Ns_SCA_Counter, Ns_SCA_Evaluation_Plan, Ns_SCA_Structure
+
+
+class Ns_SCA_Results:
+    """
+    Values of a corpus, one row per file and one column per structure. Counts
+    of words and Tregex patterns are kept in an integer matrix, and structures
+    defined by value_source, e.g., MLS and C/T, are computed over whole columns
+    at once rather than file by file. Undetermined counts are stored as NaN,
+    which makes the matrix a float one, and are dumped as null to JSON.
+    """
+
+    def __init__(
+        self,
+        file_paths: Sequence[str],
+        counts: np.ndarray,
+        *,
+        sname_structure_map: Mapping[str, Ns_SCA_Structure] | None = None,
+        selected_measures: Sequence[str] | None = None,
+    ) -> None:
+        """
+        :param counts: files × terminal structures of the evaluation plan, in
+            the order of Ns_SCA_Results.get_terminal_snames()
+        """
+        if sname_structure_map is None:
+            sname_structure_map, _, default_measures = Ns_SCA_Counter.get_structure_defs(None)
+            if selected_measures is None:
+                selected_measures = default_measures
+        elif selected_measures is None:
+            raise ValueError("selected_measures is required along with sname_structure_map")
+
+        self.file_paths: list[str] = list(file_paths)
+        self.selected_measures: tuple[str, ...] = tuple(selected_measures)
+        plan = Ns_SCA_Evaluation_Plan.build(sname_structure_map, self.selected_measures)
+        terminal_snames = self.get_terminal_snames(plan)
+        if counts.shape != (len(self.file_paths), len(terminal_snames)):
+            raise ValueError(
+                f"Expected counts of shape {(len(self.file_paths), len(terminal_snames))}, got {counts.shape}"
+            )
+
+        self.counts = counts
+        self.columns: dict[str, np.ndarray] = {sname: counts[:, i] for i, sname in enumerate(terminal_snames)}
+        for sname in plan.value_source_snames:
+            value = sname_structure_map[sname].compiled_value_source.evaluate_columns(  # type:ignore
+                self.columns.__getitem__
+            )
+            # A value_source of only numbers gives a scalar
+            self.columns[sname] = np.broadcast_to(value, (len(self.file_paths),))
+
+    @classmethod
+    def get_terminal_snames(cls, plan: Ns_SCA_Evaluation_Plan) -> tuple[str, ...]:
+        value_source_snames = set(plan.value_source_snames)
+        return tuple(sname for sname in plan.snames if sname not in value_source_snames)
+
+    @classmethod
+    def from_counters(cls, counters: Iterable[Ns_SCA_Counter]) -> "Ns_SCA_Results":
+        """
+        Collect the counts of counters sharing the same structure definitions
+        and selected measures, e.g., those of one Ns_SCA run
+        """
+        counters = iter(counters)
+        if (first := next(counters, None)) is None:
+            raise ValueError("empty counter list")
+
+        terminal_sids = [
+            first.get_structure_id(sname) for sname in cls.get_terminal_snames(first.evaluation_plan)
+        ]
+        file_paths: list[str] = []
+        rows: list[list[float | int | None]] = []
+        for counter in (first, *counters):
+            if counter.evaluation_plan is not first.evaluation_plan:
+                raise ValueError(f"{counter.ifile} has different structure definitions or selected measures")
+            file_paths.append(counter.ifile)
+            rows.append([counter.values[sid] for sid in terminal_sids])
+
+        # None becomes NaN in a float matrix
+        is_determined = all(count is not None for row in rows for count in row)
+        counts = np.array(rows, dtype=np.int64 if is_determined else np.float64).reshape(
+            len(rows), len(terminal_sids)
+        )
+        return cls(
+            file_paths,
+            counts,
+            sname_structure_map=first.sname_structure_map,
+            selected_measures=first.selected_measures,
+        )
+
+    def __len__(self) -> int:
+        return len(self.file_paths)
+
+    def get_column(self, sname: str) -> np.ndarray:
+        if (column := self.columns.get(sname)) is None:
+            raise KeyError(f"{sname} is not determined in the results")
+        return column
+
+    def get_rounded_column(self, sname: str, precision: int = 4) -> np.ndarray:
+        column = self.get_column(sname)
+        return column.round(precision) if column.dtype.kind == "f" else column
+
+    def to_array(self) -> np.ndarray:
+        """
+        Values of the selected measures as a float matrix, files × measures
+        """
+        return np.column_stack([self.get_column(sname) for sname in self.selected_measures]).astype(np.float64)
+
+    def to_records(self) -> np.ndarray:
+        """
+        Values of the selected measures as a structured array with a
+        "Filepath" field, so that column names are kept in .npy files
+        """
+        dtype: list[tuple[Any, ...]] = [("Filepath", np.str_, max(map(len, self.file_paths), default=1))]
+        dtype.extend((sname, self.get_column(sname).dtype) for sname in self.selected_measures)
+        records = np.empty(len(self), dtype=dtype)
+        records["Filepath"] = self.file_paths
+        for sname in self.selected_measures:
+            records[sname] = self.get_column(sname)
+        return records
+
+    def dump_csv(self, handle: IO[str], precision: int = 4) -> None:
+        # Each column is converted to strings in one go
+        str_columns = [
+            self.get_rounded_column(sname, precision).astype(str) for sname in self.selected_measures
+        ]
+        csv_writer = csv.writer(handle)
+        csv_writer.writerow(("Filepath", *self.selected_measures))
+        csv_writer.writerows(zip(self.file_paths, *str_columns, strict=True))
+
+    def iter_records(self, precision: int = 4) -> Generator[dict[str, Any], None, None]:
+        """
+        One {"Filepath": ..., measure: value, ...} dict per file
+        """
+        fieldnames = ("Filepath", *self.selected_measures)
+        columns = []
+        for sname in self.selected_measures:
+            column = self.get_rounded_column(sname, precision)
+            values = column.tolist()
+            # NaN of undetermined values becomes None
+            columns.append(
+                [None if math.isnan(value) else value for value in values]
+                if column.dtype.kind == "f"
+                else values
+            )
+        for row in zip(self.file_paths, *columns, strict=True):
+            yield dict(zip(fieldnames, row, strict=True))
+
+    def dump_json(self, handle: IO[str], precision: int = 4) -> None:
+        json.dump(list(self.iter_records(precision)), handle, ensure_ascii=False, indent=2)
+
+    def dump_npy(self, handle: BinaryIO) -> None:
+        np.save(handle, self.to_records(), allow_pickle=False)
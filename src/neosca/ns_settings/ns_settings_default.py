@@ -50,6 +50,9 @@ settings_default = {
     "Miscellaneous/dont-warn-on-cache-deletion": False,
     "Miscellaneous/cache": True,
     "Miscellaneous/use-cache": True,
+    # MiB, 0 for unlimited
+    "Miscellaneous/cache-max-size": 0,
+    "Miscellaneous/keep-matches": True,
     "default-splitter-sca": 300,
     "default-splitter-lca": 300,
     "default-splitter-file": 210,
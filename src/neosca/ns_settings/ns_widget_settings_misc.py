@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 
-from PyQt5.QtWidgets import QCheckBox, QGridLayout, QGroupBox
+from PyQt5.QtWidgets import QCheckBox, QGridLayout, QGroupBox, QLabel, QSpinBox
 
+from neosca.ns_io import Ns_Cache
 from neosca.ns_settings.ns_settings import Ns_Settings
 from neosca.ns_settings.ns_widget_settings_abstract import Ns_Widget_Settings_Abstract
 
@@ -12,22 +13,40 @@ class Ns_Widget_Settings_Misc(Ns_Widget_Settings_Abstract):
     def __init__(self, main=None):
         super().__init__(main)
         self.setup_cache()
+        self.setup_matches()
         self.setup_warning()
 
         self.gridlayout.addWidget(self.groupbox_cache, 0, 0)
-        self.gridlayout.addWidget(self.groupbox_warning, 1, 0)
+        self.gridlayout.addWidget(self.groupbox_matches, 1, 0)
+        self.gridlayout.addWidget(self.groupbox_warning, 2, 0)
         self.gridlayout.setRowStretch(self.gridlayout.rowCount(), 1)
 
     def setup_cache(self) -> None:
         self.checkbox_cache = QCheckBox("Cache uncached files for faster future runs")
         self.checkbox_use_cache = QCheckBox("Use cache if available")
+        self.spinbox_cache_max_size = QSpinBox()
+        self.spinbox_cache_max_size.setRange(0, 1024**2)
+        self.spinbox_cache_max_size.setSuffix(" MiB")
+        self.spinbox_cache_max_size.setSpecialValueText("Unlimited")
 
         gridlayout_cache = QGridLayout()
-        gridlayout_cache.addWidget(self.checkbox_cache, 0, 0)
-        gridlayout_cache.addWidget(self.checkbox_use_cache, 1, 0)
+        gridlayout_cache.addWidget(self.checkbox_cache, 0, 0, 1, 2)
+        gridlayout_cache.addWidget(self.checkbox_use_cache, 1, 0, 1, 2)
+        gridlayout_cache.addWidget(
+            QLabel("Maximum cache size (least recently used caches are deleted beyond it):"), 2, 0
+        )
+        gridlayout_cache.addWidget(self.spinbox_cache_max_size, 2, 1)
         self.groupbox_cache = QGroupBox("Cache")
         self.groupbox_cache.setLayout(gridlayout_cache)
 
+    def setup_matches(self) -> None:
+        self.checkbox_keep_matches = QCheckBox("Keep matches for viewing and exporting (uncheck to only count)")
+
+        gridlayout_matches = QGridLayout()
+        gridlayout_matches.addWidget(self.checkbox_keep_matches, 0, 0)
+        self.groupbox_matches = QGroupBox("Matches")
+        self.groupbox_matches.setLayout(gridlayout_matches)
+
     def setup_warning(self) -> None:
         self.checkbox_dont_warn_on_exit = QCheckBox("Don't warn on exit")
         self.checkbox_dont_warn_on_cache_deletion = QCheckBox("Don't warn on cache deletion")
@@ -40,11 +59,16 @@ class Ns_Widget_Settings_Misc(Ns_Widget_Settings_Abstract):
 
     def load_settings(self) -> None:
         self.load_settings_cache()
+        self.load_settings_matches()
         self.load_settings_warning()
 
     def load_settings_cache(self) -> None:
         self.checkbox_cache.setChecked(Ns_Settings.value(f"{self.name}/cache", type=bool))
         self.checkbox_use_cache.setChecked(Ns_Settings.value(f"{self.name}/use-cache", type=bool))
+        self.spinbox_cache_max_size.setValue(Ns_Settings.value(f"{self.name}/cache-max-size", type=int))
+
+    def load_settings_matches(self) -> None:
+        self.checkbox_keep_matches.setChecked(Ns_Settings.value(f"{self.name}/keep-matches", type=bool))
 
     def load_settings_warning(self) -> None:
         self.checkbox_dont_warn_on_exit.setChecked(
@@ -59,11 +83,19 @@ class Ns_Widget_Settings_Misc(Ns_Widget_Settings_Abstract):
 
     def apply_settings(self) -> None:
         self.apply_settings_cache()
+        self.apply_settings_matches()
         self.apply_settings_warning()
 
     def apply_settings_cache(self) -> None:
         Ns_Settings.setValue(f"{self.name}/cache", self.checkbox_cache.isChecked())
         Ns_Settings.setValue(f"{self.name}/use-cache", self.checkbox_use_cache.isChecked())
+        Ns_Settings.setValue(f"{self.name}/cache-max-size", self.spinbox_cache_max_size.value())
+        # MiB -> bytes
+        Ns_Cache.max_size = self.spinbox_cache_max_size.value() * 1024**2
+        Ns_Cache.evict()
+
+    def apply_settings_matches(self) -> None:
+        Ns_Settings.setValue(f"{self.name}/keep-matches", self.checkbox_keep_matches.isChecked())
 
     def apply_settings_warning(self) -> None:
         Ns_Settings.setValue(f"{self.name}/dont-warn-on-exit", self.checkbox_dont_warn_on_exit.isChecked())
@@ -40,6 +40,7 @@ class Ns_Worker_SCA_Generate_Table(Ns_Worker):
             "is_stdout": False,
             "is_save_values": False,
             "is_save_matches": False,
+            "is_counting_only": not Ns_Settings.value("Miscellaneous/keep-matches", type=bool),
             "config": None,
         }
 
@@ -85,6 +86,7 @@ class Ns_Worker_LCA_Generate_Table(Ns_Worker):
             "is_stdout": False,
             "is_save_values": False,
             "is_save_matches": False,
+            "is_counting_only": not Ns_Settings.value("Miscellaneous/keep-matches", type=bool),
         }
         lca_instance = Ns_LCA(**init_kwargs)
         model: Ns_StandardItemModel = self.main.model_lca
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+from collections.abc import Iterable, Iterator
+
+from neosca.ns_tregex.tree import Tree
+
+
+class Forest:
+    """
+    Trees of one document, built once from the bracketed parse string and
+    shared by every searcher that queries the document.
+    """
+
+    def __init__(self, trees: Iterable[Tree] = (), *, string: str | None = None) -> None:
+        self.trees: list[Tree] = list(trees)
+        self._string = string
+        self._leaf_strings: list[tuple[str, ...]] | None = None
+
+    def __repr__(self) -> str:
+        return self.string
+
+    def __iter__(self) -> Iterator[Tree]:
+        return iter(self.trees)
+
+    def __len__(self) -> int:
+        return len(self.trees)
+
+    def __getitem__(self, index: int) -> Tree:
+        return self.trees[index]
+
+    @property
+    def string(self) -> str:
+        """
+        The bracketed string the trees were built from, or, for forests built
+        from Tree objects, their string representations joined by newlines
+        """
+        if self._string is None:
+            self._string = "\n".join(tree.tostring() for tree in self.trees)
+        return self._string
+
+    def leaf_strings(self) -> list[tuple[str, ...]]:
+        """
+        The leaves of each tree as the strings that Tree.span_string() joins,
+        so that a span can be rendered from its tree index and leaf offsets
+        """
+        if self._leaf_strings is None:
+            self._leaf_strings = [
+                tuple(leaf.tostring() for leaf in tree.getLeaves()) if tree else () for tree in self.trees
+            ]
+        return self._leaf_strings
+
+    @classmethod
+    def fromstring(cls, string: str) -> "Forest":
+        return cls(Tree.fromstring(string), string=string)
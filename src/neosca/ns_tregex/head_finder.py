@@ -1,11 +1,87 @@
 #!/usr/bin/env python3
 
-from typing import TYPE_CHECKING
+from collections import Counter
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
-    from .tree import Tree
+    from .tree import Tree, Tree_Index
 
 
 class HeadFinder:
     def determineHead(self, t: "Tree"):
         raise NotImplementedError
+
+
+class Head_Cache:
+    """
+    Head daughters and head terminals of the nodes of one tree, each computed
+    at most once per head finder. Instances live on the Tree_Index of the tree
+    and are dropped together with it. Use Tree_Index.get_head_cache() instead
+    of instantiating this class directly.
+    """
+
+    # hits/misses of all caches, e.g., Head_Cache.stats["head_daughter_hits"]
+    stats: Counter[str] = Counter()
+
+    def __init__(self, index: "Tree_Index", hf: HeadFinder) -> None:
+        self.index = index
+        self.hf = hf
+        # preorder id -> head daughter/terminal
+        self.head_daughter_map: dict[int, Tree | None] = {}
+        self.head_terminal_map: dict[int, Tree | None] = {}
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cls.stats.clear()
+
+    def determineHead(self, t: "Tree") -> Optional["Tree"]:
+        i = t._preorder_id
+        if i in self.head_daughter_map:
+            self.stats["head_daughter_hits"] += 1
+            return self.head_daughter_map[i]
+        self.stats["head_daughter_misses"] += 1
+        head = self.head_daughter_map[i] = self.hf.determineHead(t)
+        return head
+
+    def head_terminal(self, t: "Tree") -> Optional["Tree"]:
+        i = t._preorder_id
+        if i in self.head_terminal_map:
+            self.stats["head_terminal_hits"] += 1
+            return self.head_terminal_map[i]
+        self.stats["head_terminal_misses"] += 1
+
+        # Walk down the chain of head daughters until reaching a leaf or a
+        # node whose head terminal is already known
+        chain: list[Tree] = []
+        node: Tree | None = t
+        while node is not None and node._preorder_id not in self.head_terminal_map:
+            if node.isLeaf():
+                self.head_terminal_map[node._preorder_id] = node
+                break
+            chain.append(node)
+            node = self.determineHead(node)
+        terminal = None if node is None else self.head_terminal_map[node._preorder_id]
+        for node in chain:
+            self.head_terminal_map[node._preorder_id] = terminal
+        return terminal
+
+    def precompute(self) -> None:
+        """
+        Determine the head daughter and head terminal of every node in one
+        bottom-up pass
+        """
+        determineHead = self.hf.determineHead
+        head_daughter_map = self.head_daughter_map
+        head_terminal_map = self.head_terminal_map
+        for node in reversed(self.index.nodes):
+            i = node._preorder_id
+            if node.isLeaf():
+                head_daughter_map[i] = None
+                head_terminal_map[i] = node
+                continue
+            if i not in head_daughter_map:
+                head_daughter_map[i] = determineHead(node)
+            head = head_daughter_map[i]
+            # descendants come after their ancestors in preorder, so the head
+            # daughter has been visited already
+            head_terminal_map[i] = None if head is None else head_terminal_map[head._preorder_id]
@@ -23,8 +23,18 @@ class Named_Nodes:
 
 
 class Node_Description(NamedTuple):
-    op: "Node_Op"
+    op: "type[Node_Op]"
     value: str
+    # value as prepared by op.compile(), e.g. the compiled regex of Node_Regex
+    compiled: "str | re.Pattern | None" = None
+
+    @classmethod
+    def build(cls, op: "type[Node_Op]", value: str) -> "Node_Description":
+        return cls(op, value, op.compile(value))
+
+    @property
+    def expect(self) -> "str | re.Pattern":
+        return self.value if self.compiled is None else self.compiled
 
 
 class Node_Descriptions:
@@ -35,7 +45,12 @@ class Node_Descriptions:
         is_negated: bool = False,
         use_basic_cat: bool = False,
     ) -> None:
-        self.descriptions = node_descriptions
+        self.descriptions: list[Node_Description] = []
+        # labels of the alternatives if all of them are plain labels, so that
+        # satisfy() is a set lookup
+        self.labels: frozenset[str] | None = frozenset()
+        for desc in node_descriptions:
+            self.add_description(desc)
         self.is_negated = is_negated
         self.use_basic_cat = use_basic_cat
 
@@ -58,7 +73,11 @@ class Node_Descriptions:
         self.strins_repr = s
 
     def add_description(self, other_description: Node_Description) -> None:
+        if other_description.compiled is None:
+            other_description = Node_Description.build(other_description.op, other_description.value)
         self.descriptions.append(other_description)
+        if self.labels is not None:
+            self.labels = self.labels | {other_description.value} if other_description.op is Node_Text else None
 
     def toggle_negated(self) -> None:
         self.is_negated = not self.is_negated
@@ -67,24 +86,44 @@ class Node_Descriptions:
         self.use_basic_cat = not self.use_basic_cat
 
     def satisfy(self, t: Tree) -> bool:
-        for desc in self.descriptions:
-            if desc.op.satisfies(t, desc.value, is_negated=self.is_negated, use_basic_cat=self.use_basic_cat):
-                return True
-        return False
+        # "!A|B" is negated as a whole: neither A nor B
+        if self.labels is not None:
+            return ((t.basic_category() if self.use_basic_cat else t.label) in self.labels) != self.is_negated
+        return (
+            any(
+                desc.op.satisfies(t, desc.expect, use_basic_cat=self.use_basic_cat)
+                for desc in self.descriptions
+            )
+            != self.is_negated
+        )
 
     def searchNodeIterator(self, t: Tree) -> Generator[Tree, None, None]:
+        # Plain label alternatives like "VP|NP" are looked up in the label index
+        # of the whole tree
+        if t.parent is None and not self.is_negated and all(desc.op is Node_Text for desc in self.descriptions):
+            labels = (desc.value for desc in self.descriptions)
+            yield from t.get_index().nodes_with_labels(labels, use_basic_cat=self.use_basic_cat)
+            return
+
         for node in t.preorder_iter():
             if self.satisfy(node):
                 yield node
 
 
 class Node_Op(ABC):
+    @classmethod
+    def compile(cls, expect: str) -> "str | re.Pattern":
+        """
+        Prepare the expected value once for repeated satisfies() calls
+        """
+        return expect
+
     @classmethod
     @abstractmethod
     def satisfies(
         cls,
         node: Tree,
-        expect: str,
+        expect: "str | re.Pattern",
         *,
         is_negated: bool = False,
         use_basic_cat: bool = False,
@@ -110,10 +149,9 @@ class Node_Text(Node_Op):
     @classmethod
     @override
     def satisfies(
-        cls, node: Tree, expect: str, *, is_negated: bool = False, use_basic_cat: bool = False
+        cls, node: Tree, expect: "str | re.Pattern", *, is_negated: bool = False, use_basic_cat: bool = False
     ) -> bool:
-        attr = "basic_category" if use_basic_cat else "label"
-        value = getattr(node, attr)
+        value = node.basic_category() if use_basic_cat else node.label
 
         if value is None:
             return is_negated
@@ -122,39 +160,57 @@ class Node_Text(Node_Op):
 
 
 class Node_Regex(Node_Op):
+    # "/regex/flags" -> compiled regex, for expects that are passed uncompiled
+    compiled_regexes: dict[str, re.Pattern] = {}
+
+    @classmethod
+    @override
+    def compile(cls, expect: str) -> re.Pattern:
+        if (compiled := cls.compiled_regexes.get(expect)) is not None:
+            return compiled
+
+        # Convert regex to standard python regex
+        regex = expect
+        flag = ""
+        current_flag = regex[-1]
+        while current_flag != "/":
+            # Seems that only (?m) and (?x) are useful for node describing:
+            #  re.ASCII      (?a)
+            #  re.IGNORECASE (?i)
+            #  re.LOCALE     (?L)
+            #  re.DOTALL     (?s)
+            #  re.MULTILINE  (?m)
+            #  re.VERBOSE    (?x)
+            if current_flag not in "xi":
+                raise ValueError(f"Error!! Unsupported regexp flag: {current_flag}")
+            flag += current_flag
+            regex = regex[:-1]
+            current_flag = regex[-1]
+
+        regex = regex[1:-1]
+        if flag:
+            regex = "(?" + "".join(set(flag)) + ")" + regex
+
+        compiled = cls.compiled_regexes[expect] = re.compile(regex)
+        return compiled
+
     @classmethod
     @override
     def satisfies(
-        cls, node: Tree, expect: str, *, is_negated: bool = False, use_basic_cat: bool = False
+        cls,
+        node: Tree,
+        expect: "str | re.Pattern",
+        *,
+        is_negated: bool = False,
+        use_basic_cat: bool = False,
     ) -> bool:
-        attr = "basic_category" if use_basic_cat else "label"
-        value = getattr(node, attr)
+        value = node.basic_category() if use_basic_cat else node.label
 
         if value is None:
             return is_negated
-        else:
-            # Convert regex to standard python regex
-            flag = ""
-            current_flag = value[-1]
-            while current_flag != "/":
-                # Seems that only (?m) and (?x) are useful for node describing:
-                #  re.ASCII      (?a)
-                #  re.IGNORECASE (?i)
-                #  re.LOCALE     (?L)
-                #  re.DOTALL     (?s)
-                #  re.MULTILINE  (?m)
-                #  re.VERBOSE    (?x)
-                if current_flag not in "xi":
-                    raise ValueError(f"Error!! Unsupported regexp flag: {current_flag}")
-                flag += current_flag
-                value = value[:-1]
-                current_flag = value[-1]
-
-            value = value[1:-1]
-            if flag:
-                value = "(?" + "".join(set(flag)) + ")" + value
-
-            return (re.search(value, expect) is not None) != is_negated
+        if isinstance(expect, str):
+            expect = cls.compile(expect)
+        return (expect.search(value) is not None) != is_negated
 
 
 class Node_Any(Node_Op):
@@ -163,7 +219,7 @@ class Node_Any(Node_Op):
     def satisfies(
         cls,
         node: Tree,
-        expect: str = "",
+        expect: "str | re.Pattern" = "",
         *,
         is_negated: bool = False,
         use_basic_cat: bool = False,
@@ -177,7 +233,7 @@ class Node_Root(Node_Op):
     def satisfies(
         cls,
         node: Tree,
-        expect: str = "",
+        expect: "str | re.Pattern" = "",
         *,
         is_negated: bool = False,
         use_basic_cat: bool = False,
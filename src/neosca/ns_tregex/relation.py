@@ -21,6 +21,9 @@ if TYPE_CHECKING:
 
 # TODO ROOT subclass
 
+# Shared by the head relations so that they also share the memoized heads of each tree
+COLLINS_HEAD_FINDER = CollinsHeadFinder()
+
 
 class Relation(ABC):
     @classmethod
@@ -41,21 +44,12 @@ class DOMINATES(Relation):
         """
         `t1` and `t2` should be part of the same tree
         """
-        while t2.parent is not None:
-            if t2.parent is t1:
-                return True
-            else:
-                t2 = t2.parent
-        return False
+        return t1.dominates(t2)
 
     @classmethod
     @override
     def searchNodeIterator(cls, t: "Tree") -> Generator["Tree", None, None]:
-        iterator = iter(t.children)
-        while (node := next(iterator, None)) is not None:
-            yield node
-            if not node.isLeaf():
-                iterator = _chain(node.children, iterator)
+        yield from t.get_index().descendants(t)
 
 
 class DOMINATED_BY(Relation):
@@ -431,7 +425,7 @@ class UNARY_PATH_DESCEDANT_OF(Relation):
 
 
 class HEADS(Relation):
-    hf = CollinsHeadFinder()
+    hf = COLLINS_HEAD_FINDER
 
     @classmethod
     @override
@@ -443,7 +437,7 @@ class HEADS(Relation):
         else:
             if headFinder is None:
                 headFinder = cls.hf
-            head = headFinder.determineHead(t2)
+            head = t2.head_daughter(headFinder)
             if head is None:
                 return False
             elif head is t1:
@@ -459,13 +453,13 @@ class HEADS(Relation):
         if headFinder is None:
             headFinder = cls.hf
         parent_ = t.parent
-        while parent_ is not None and headFinder.determineHead(parent_) is t:
+        while parent_ is not None and parent_.head_daughter(headFinder) is t:
             yield parent_
             parent_ = parent_.parent
 
 
 class HEADED_BY(Relation):
-    hf = CollinsHeadFinder()
+    hf = COLLINS_HEAD_FINDER
 
     @classmethod
     @override
@@ -480,21 +474,21 @@ class HEADED_BY(Relation):
         if headFinder is None:
             headFinder = cls.hf
         if not t.isLeaf():
-            head = headFinder.determineHead(t)
+            head = t.head_daughter(headFinder)
             while head is not None:
                 yield head
-                head = headFinder.determineHead(head)
+                head = head.head_daughter(headFinder)
 
 
 class IMMEDIATELY_HEADS(Relation):
-    hf = CollinsHeadFinder()
+    hf = COLLINS_HEAD_FINDER
 
     @classmethod
     @override
     def satisfies(cls, t1: "Tree", t2: "Tree", headFinder: Optional["HeadFinder"] = None) -> bool:
         if headFinder is None:
             headFinder = cls.hf
-        return headFinder.determineHead(t2) is t1
+        return t2.head_daughter(headFinder) is t1
 
     @classmethod
     @override
@@ -505,12 +499,12 @@ class IMMEDIATELY_HEADS(Relation):
         if parent_ is not None:  # if t is not root
             if headFinder is None:
                 headFinder = cls.hf
-            if headFinder.determineHead(parent_) is t:
+            if parent_.head_daughter(headFinder) is t:
                 yield parent_
 
 
 class IMMEDIATELY_HEADED_BY(Relation):
-    hf = CollinsHeadFinder()
+    hf = COLLINS_HEAD_FINDER
 
     @classmethod
     @override
@@ -526,7 +520,7 @@ class IMMEDIATELY_HEADED_BY(Relation):
             return
         if headFinder is None:
             headFinder = cls.hf
-        head = headFinder.determineHead(t)
+        head = t.head_daughter(headFinder)
         if head is not None:
             yield head
 
@@ -650,12 +644,8 @@ class ANCESTOR_OF_LEAF(Relation):
     @classmethod
     @override
     def searchNodeIterator(cls, t: "Tree") -> Generator["Tree", None, None]:
-        iterator = iter(t.children)
-        while (node := next(iterator, None)) is not None:
-            if node.isLeaf():
-                yield node
-            else:
-                iterator = _chain(node.children, iterator)
+        if not t.isLeaf():
+            yield from t.getLeaves()
 
 
 class UNBROKEN_CATEGORY_DOMINATES(Relation):
@@ -4,11 +4,13 @@
 
 import re
 from collections import deque
-from collections.abc import Generator, Iterator
+from collections.abc import Generator, Iterable, Iterator
 from io import StringIO
 from itertools import chain as _chain
+from operator import attrgetter
 from typing import TYPE_CHECKING, Optional
 
+from neosca.ns_tregex.head_finder import Head_Cache
 from neosca.ns_tregex.peekable import peekable
 
 if TYPE_CHECKING:
@@ -20,20 +22,31 @@ OPEN_PAREN = "("
 
 
 class Tree:
+    __slots__ = ("label", "parent", "children", "_index", "_preorder_id")
+
     def __init__(
         self,
         label: str | None = None,
         children: list["Tree"] | None = None,
         parent: Optional["Tree"] = None,
     ):
+        self.parent: Tree | None = None
+        # lookup tables of the whole tree this node belongs to, see get_index()
+        self._index: Tree_Index | None = None
+        # position of this node in self._index.nodes
+        self._preorder_id: int = -1
         self.set_label(label)
         if children is None:
             self.children = []
         else:
             for child in children:
+                # An adopted subtree may have been indexed as a tree of its own
+                child.clear_index()
                 child.parent = self  # type:ignore
             self.children = children
         # each subtree has at most one parent
+        if parent is not None:
+            parent.clear_index()
         self.parent = parent
 
     def __repr__(self):
@@ -212,22 +225,26 @@ class Tree:
             stack = tmp
         return ret
 
+    def head_daughter(self, hf: "HeadFinder") -> Optional["Tree"]:
+        """
+        Returns the daughter that is the head of the tree, memoized per tree
+        and head finder.
+
+        param hf The head-finding algorithm to use
+        return The head daughter if any, else None
+        """
+        return self.get_index().get_head_cache(hf).determineHead(self)
+
     def head_terminal(self, hf: "HeadFinder") -> Optional["Tree"]:
         """
-        Returns the tree leaf that is the head of the tree.
+        Returns the tree leaf that is the head of the tree, memoized per tree
+        and head finder.
 
         param hf The head-finding algorithm to use
         param parent  The parent of this tree
         return The head tree leaf if any, else null
         """
-        if self.isLeaf():
-            return self
-
-        head: Tree | None = hf.determineHead(self)
-        if head is not None:
-            return head.head_terminal(hf)
-
-        return None
+        return self.get_index().get_head_cache(hf).head_terminal(self)
 
     def get_terminal_labels(self) -> list[str | None]:
         """
@@ -262,45 +279,25 @@ class Tree:
         """
         note: return 0 for the leftmost node
         """
-        i = 0
-
-        def left_edge_helper(t: "Tree", t1: "Tree") -> bool:
-            nonlocal i
-            if t is t1:
-                return True
-            elif t1.isLeaf():
-                j = len(t1.get_terminal_labels())
-                i += j
-                return False
-            else:
-                return any(left_edge_helper(t, kid) for kid in t1.children)
-
-        if left_edge_helper(self, self.getRoot()):
-            return i
-        else:
-            raise RuntimeError("Tree is not a descendant of root.")
+        index = self.get_index()
+        return index.leaf_starts[self._preorder_id]
 
     def rightEdge(self) -> int:
         """
         note: return 1 for the leftmost node
         """
-        i = len(self.getRoot().get_terminal_labels())
-
-        def right_edge_helper(t: "Tree", t1: "Tree") -> bool:
-            nonlocal i
-            if t is t1:
-                return True
-            elif t1.isLeaf():
-                j = len(t1.get_terminal_labels())
-                i -= j
-                return False
-            else:
-                return any(right_edge_helper(t, kid) for kid in reversed(t1.children))
+        index = self.get_index()
+        return index.leaf_ends[self._preorder_id]
 
-        if right_edge_helper(self, self.getRoot()):
-            return i
-        else:
-            raise RuntimeError("Tree is not a descendant of root.")
+    def dominates(self, other: "Tree") -> bool:
+        """
+        Return whether `other` is a proper descendant of this node
+        """
+        index = self.get_index()
+        if other.get_index() is not index:
+            return False
+        i, j = self._preorder_id, other._preorder_id
+        return i < j and index.postorder_ids[j] < index.postorder_ids[i]
 
     def get_sister_index(self) -> int:
         """Return -1 for root"""
@@ -318,14 +315,34 @@ class Tree:
             self.label = None
         else:
             raise TypeError(f"label must be str, not {type(label).__name__}")
+        self.clear_index()
 
     def set_parent(self, node: "Tree") -> None:
         self.parent = node
 
     def add_child(self, node: "Tree") -> None:
+        node.clear_index()
+        self.clear_index()
         node.set_parent(self)
         self.children.append(node)
 
+    def get_index(self) -> "Tree_Index":
+        """
+        Return the lookup tables of the whole tree this node belongs to. They
+        are built on the first call and shared by all nodes of the tree until
+        it is changed through set_label() or add_child(). Call clear_index()
+        after changing `children` or `parent` directly.
+        """
+        if self._index is None:
+            Tree_Index(self.getRoot())
+        return self._index  # type:ignore
+
+    def clear_index(self) -> None:
+        if self._index is None:
+            return
+        for node in self._index.nodes:
+            node._index = None
+
     @classmethod
     def normalize(cls, text: str) -> str:
         return text.replace("-LRB-", OPEN_PAREN).replace("-RRB-", CLOSE_PAREN)
@@ -363,7 +380,9 @@ class Tree:
                 if current_tree is None:
                     stack_parent.append(new_tree)
                 else:
-                    current_tree.add_child(new_tree)
+                    # Skip add_child(): nothing has been indexed yet
+                    new_tree.parent = current_tree
+                    current_tree.children.append(new_tree)
                     stack_parent.append(current_tree)
 
                 current_tree = new_tree
@@ -384,8 +403,8 @@ class Tree:
                 if current_tree is None:
                     continue
 
-                new_tree = cls(token)
-                current_tree.add_child(new_tree)
+                new_tree = cls(token, parent=current_tree)
+                current_tree.children.append(new_tree)
 
         if current_tree is not None:  # type:ignore
             raise ValueError("incomplete tree (extra left parentheses in input)")
@@ -505,7 +524,10 @@ class Tree:
 
         return a list of the leaves.
         """
-        return [node for node in self.preorder_iter() if node.isLeaf()]
+        if not self:
+            raise ValueError("Trying to iterate an empty tree")
+        index = self.get_index()
+        return index.leaves[index.leaf_starts[self._preorder_id] : index.leaf_ends[self._preorder_id]]
 
     def span_string(self) -> str:
         """
@@ -534,3 +556,97 @@ class Tree:
 
         # print(f"{self.label=}\t{ret_n=}\t{ret_weight=}")
         return ret_n, ret_weight
+
+
+class Tree_Index:
+    """
+    Lookup tables of a whole tree, built in one pass over its nodes:
+
+    - nodes (in preorder) by label and by basic category, so that searchers can
+      go straight to, e.g., all the VP nodes instead of checking every node
+    - preorder/postorder numbers and leaf spans, so that span and dominance
+      queries need no walk over the tree
+
+    Per-node tables are lists indexed by the node's position in `nodes`.
+    """
+
+    def __init__(self, root: Tree) -> None:
+        self.root = root
+        self.nodes: list[Tree] = list(root.preorder_iter())
+        self.leaves: list[Tree] = []
+        self.label_nodes_map: dict[str | None, list[Tree]] = {}
+        self._basic_category_nodes_map: dict[str | None, list[Tree]] | None = None
+        self._head_caches: dict[HeadFinder, Head_Cache] = {}
+
+        n = len(self.nodes)
+        depths = [0] * n
+        self.leaf_starts: list[int] = [0] * n
+        for i, node in enumerate(self.nodes):
+            node._index = self
+            node._preorder_id = i
+            if i > 0:
+                # Every node but the root is reached through its parent
+                assert node.parent is not None
+                depths[i] = depths[node.parent._preorder_id] + 1
+            self.leaf_starts[i] = len(self.leaves)
+            if node.isLeaf():
+                self.leaves.append(node)
+            self.label_nodes_map.setdefault(node.label, []).append(node)
+
+        # Bottom-up: the last node of the subtree in preorder and the end of the
+        # leaf span are those of the last child
+        self.subtree_ends: list[int] = list(range(n))
+        self.leaf_ends: list[int] = [start + 1 for start in self.leaf_starts]
+        for i in range(n - 1, -1, -1):
+            children = self.nodes[i].children
+            if children:
+                last = children[-1]._preorder_id
+                self.subtree_ends[i] = self.subtree_ends[last]
+                self.leaf_ends[i] = self.leaf_ends[last]
+        self.postorder_ids: list[int] = [self.subtree_ends[i] - depths[i] for i in range(n)]
+
+    @property
+    def basic_category_nodes_map(self) -> dict[str | None, list[Tree]]:
+        if self._basic_category_nodes_map is None:
+            self._basic_category_nodes_map = {}
+            for label, nodes in self.label_nodes_map.items():
+                basic_category = None if label is None else label.split("-")[0]
+                self._basic_category_nodes_map.setdefault(basic_category, []).extend(nodes)
+            # lists merged from several labels are no longer in preorder
+            for nodes in self._basic_category_nodes_map.values():
+                nodes.sort(key=_preorder_id_getter)
+        return self._basic_category_nodes_map
+
+    def nodes_with_labels(self, labels: Iterable[str | None], *, use_basic_cat: bool = False) -> list[Tree]:
+        """
+        Return nodes whose label (or basic category, if `use_basic_cat` is True)
+        is one of `labels`, in preorder. The returned list must not be modified.
+        """
+        label_nodes_map = self.basic_category_nodes_map if use_basic_cat else self.label_nodes_map
+        node_lists = [label_nodes_map[label] for label in dict.fromkeys(labels) if label in label_nodes_map]
+        if not node_lists:
+            return []
+        if len(node_lists) == 1:
+            return node_lists[0]
+        return sorted(_chain.from_iterable(node_lists), key=_preorder_id_getter)
+
+    def get_head_cache(self, hf: "HeadFinder", *, precompute: bool = False) -> Head_Cache:
+        """
+        Return the memoized heads of this tree for `hf`. With `precompute`, the
+        heads of all nodes are determined at once in a bottom-up pass.
+        """
+        if (head_cache := self._head_caches.get(hf)) is None:
+            head_cache = self._head_caches[hf] = Head_Cache(self, hf)
+        if precompute:
+            head_cache.precompute()
+        return head_cache
+
+    def descendants(self, node: Tree) -> list[Tree]:
+        """
+        Return the proper descendants of `node` in preorder
+        """
+        i = node._preorder_id
+        return self.nodes[i + 1 : self.subtree_ends[i] + 1]
+
+
+_preorder_id_getter = attrgetter("_preorder_id")
@@ -0,0 +1,775 @@
+#!/usr/bin/env python3
+
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Callable, Generator, Iterable
+from typing import NamedTuple, NoReturn
+
+from neosca.ns_tregex.node_descriptions import (
+    Node_Any,
+    Node_Description,
+    Node_Descriptions,
+    Node_Op,
+    Node_Regex,
+    Node_Text,
+)
+from neosca.ns_tregex.relation import (
+    ANCESTOR_OF_ITH_LEAF,
+    ANCESTOR_OF_LEAF,
+    CHILD_OF,
+    DOMINATED_BY,
+    DOMINATES,
+    EQUALS,
+    FOLLOWS,
+    HAS_ITH_CHILD,
+    HAS_LEFTMOST_CHILD,
+    HAS_LEFTMOST_DESCENDANT,
+    HAS_ONLY_CHILD,
+    HAS_RIGHTMOST_DESCENDANT,
+    HEADED_BY,
+    HEADS,
+    IMMEDIATE_LEFT_SISTER_OF,
+    IMMEDIATE_RIGHT_SISTER_OF,
+    IMMEDIATELY_FOLLOWS,
+    IMMEDIATELY_HEADED_BY,
+    IMMEDIATELY_HEADS,
+    IMMEDIATELY_PRECEDES,
+    ITH_CHILD_OF,
+    LAST_CHILD_OF_PARENT,
+    LEFT_SISTER_OF,
+    LEFTMOST_CHILD_OF,
+    LEFTMOST_DESCENDANT_OF,
+    ONLY_CHILD_OF,
+    PARENT_EQUALS,
+    PARENT_OF,
+    PARENT_OF_LAST_CHILD,
+    PATTERN_SPLITTER,
+    PRECEDES,
+    RIGHT_SISTER_OF,
+    RIGHTMOST_DESCENDANT_OF,
+    SISTER_OF,
+    UNARY_PATH_ANCESTOR_OF,
+    UNARY_PATH_DESCEDANT_OF,
+    UNBROKEN_CATEGORY_DOMINATES,
+    UNBROKEN_CATEGORY_FOLLOWS,
+    UNBROKEN_CATEGORY_IS_DOMINATED_BY,
+    UNBROKEN_CATEGORY_PRECEDES,
+    AbstractRelationData,
+    Relation,
+    RelationData,
+    RelationWithNumArgData,
+    RelationWithStrArgData,
+)
+from neosca.ns_tregex.tree import Tree
+
+# Compiles Tregex patterns into matchers built from the relations of relation.py,
+# so that patterns run in-process instead of through the Java Tregex.
+# reference: https://nlp.stanford.edu/nlp/javadoc/javanlp-3.5.0/edu/stanford/nlp/trees/tregex/TregexPattern.html
+# grammar follows https://github.com/stanfordnlp/CoreNLP/blob/main/src/edu/stanford/nlp/trees/tregex/TregexParser.jj
+#
+# Not supported: backreferences (a name used twice, or "~name"), multi-relations
+# ("<... { A ; B }"), and variable groups. Node names ("NP=np") are accepted but
+# only label the node; since no bindings are kept, optional relations ("?< A")
+# are always satisfied.
+
+RELATION_OP_MAP: dict[str, type[Relation]] = {
+    "<<": DOMINATES,
+    ">>": DOMINATED_BY,
+    "<": PARENT_OF,
+    ">": CHILD_OF,
+    "$": SISTER_OF,
+    "$++": LEFT_SISTER_OF,
+    "$..": LEFT_SISTER_OF,
+    "$--": RIGHT_SISTER_OF,
+    "$,,": RIGHT_SISTER_OF,
+    "$+": IMMEDIATE_LEFT_SISTER_OF,
+    "$.": IMMEDIATE_LEFT_SISTER_OF,
+    "$-": IMMEDIATE_RIGHT_SISTER_OF,
+    "$,": IMMEDIATE_RIGHT_SISTER_OF,
+    "==": EQUALS,
+    "<=": PARENT_EQUALS,
+    "<,": HAS_LEFTMOST_CHILD,
+    ">,": LEFTMOST_CHILD_OF,
+    "<-": PARENT_OF_LAST_CHILD,
+    "<`": PARENT_OF_LAST_CHILD,
+    ">-": LAST_CHILD_OF_PARENT,
+    ">`": LAST_CHILD_OF_PARENT,
+    "<:": HAS_ONLY_CHILD,
+    ">:": ONLY_CHILD_OF,
+    "<<:": UNARY_PATH_ANCESTOR_OF,
+    ">>:": UNARY_PATH_DESCEDANT_OF,
+    "<<,": HAS_LEFTMOST_DESCENDANT,
+    ">>,": LEFTMOST_DESCENDANT_OF,
+    "<<-": HAS_RIGHTMOST_DESCENDANT,
+    "<<`": HAS_RIGHTMOST_DESCENDANT,
+    ">>-": RIGHTMOST_DESCENDANT_OF,
+    ">>`": RIGHTMOST_DESCENDANT_OF,
+    "..": PRECEDES,
+    ",,": FOLLOWS,
+    ".": IMMEDIATELY_PRECEDES,
+    ",": IMMEDIATELY_FOLLOWS,
+    "<#": IMMEDIATELY_HEADED_BY,
+    ">#": IMMEDIATELY_HEADS,
+    "<<#": HEADED_BY,
+    ">>#": HEADS,
+    "<<<": ANCESTOR_OF_LEAF,
+    ":": PATTERN_SPLITTER,
+}
+NUM_ARG_RELATION_OP_MAP: dict[str, type[Relation]] = {
+    "<": HAS_ITH_CHILD,
+    ">": ITH_CHILD_OF,
+    "<<<": ANCESTOR_OF_ITH_LEAF,
+}
+STR_ARG_RELATION_OP_MAP: dict[str, type[Relation]] = {
+    "<+": UNBROKEN_CATEGORY_DOMINATES,
+    ">+": UNBROKEN_CATEGORY_IS_DOMINATED_BY,
+    ".+": UNBROKEN_CATEGORY_PRECEDES,
+    ",+": UNBROKEN_CATEGORY_FOLLOWS,
+}
+
+_NON_IDENTIFIER_CHARS = r"\s()/|@!#%&=?\[\]<>~.,$:{};"
+_TOKEN_RE = re.compile(
+    "|".join(
+        (
+            r"(?P<WS>\s+)",
+            r"(?P<REGEX>/(?:\\.|[^/\\])*/[ix]*)",
+            r"(?P<MULTI_RELATION><\.\.\.)",
+            r"(?P<REL_W_NUM_ARG>(?:<<<|<|>)-?[0-9]+)",
+            r"(?P<REL_W_STR_ARG>[<>.,]\+(?=\())",
+            "(?P<RELATION>{})".format(
+                "|".join(re.escape(op) for op in sorted(RELATION_OP_MAP, key=len, reverse=True))
+            ),
+            r"(?P<BLANK>__)",
+            rf"(?P<IDENTIFIER>[^{_NON_IDENTIFIER_CHARS}_][^{_NON_IDENTIFIER_CHARS}]*)",
+            r"(?P<PUNCT>[()\[\]|&!@?=~])",
+        )
+    )
+)
+_REL_W_NUM_ARG_RE = re.compile(r"(<<<|<|>)(-?[0-9]+)")
+
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    pos: int
+
+
+class Forest_Stats:
+    """
+    Label counts and tree shape averages of a forest, from which the planner
+    estimates how often node descriptions match and how many nodes a relation
+    hands to its child pattern. Without trees, rough defaults are used.
+    """
+
+    # Used when no trees have been added
+    DEFAULT_TREE_SIZE = 50.0
+    DEFAULT_DEPTH = 6.0
+    DEFAULT_CHILDREN = 2.0
+    DEFAULT_LEAVES_BELOW = 8.0
+    DEFAULT_LABEL_PROBABILITY = 0.05
+
+    def __init__(self) -> None:
+        self.n_trees = 0
+        self.n_nodes = 0
+        self.n_leaves = 0
+        # sum of the number of ancestors of each node (or leaf), which is also
+        # the sum of the number of descendants (or leaves) under each node
+        self.depth_sum = 0
+        self.leaf_depth_sum = 0
+        self.label_counts: Counter[str | None] = Counter()
+
+    @classmethod
+    def from_forest(cls, forest: Iterable[Tree]) -> "Forest_Stats":
+        stats = cls()
+        for tree in forest:
+            stats.add_tree(tree)
+        return stats
+
+    def add_tree(self, tree: Tree) -> None:
+        self.n_trees += 1
+        label_counts = self.label_counts
+        stack = [(tree, 0)]
+        while stack:
+            node, depth = stack.pop()
+            label_counts[node.label] += 1
+            self.n_nodes += 1
+            self.depth_sum += depth
+            if children := node.children:
+                stack.extend((child, depth + 1) for child in children)
+            else:
+                self.n_leaves += 1
+                self.leaf_depth_sum += depth
+
+    @property
+    def tree_size(self) -> float:
+        return self.n_nodes / self.n_trees if self.n_trees else self.DEFAULT_TREE_SIZE
+
+    @property
+    def depth(self) -> float:
+        return self.depth_sum / self.n_nodes if self.n_nodes else self.DEFAULT_DEPTH
+
+    @property
+    def children(self) -> float:
+        if self.n_nodes == self.n_leaves:
+            return self.DEFAULT_CHILDREN
+        return (self.n_nodes - self.n_trees) / (self.n_nodes - self.n_leaves)
+
+    @property
+    def leaves_below(self) -> float:
+        return self.leaf_depth_sum / self.n_nodes if self.n_nodes else self.DEFAULT_LEAVES_BELOW
+
+    def description_probability(self, descriptions: Node_Descriptions) -> float:
+        """
+        Share of the nodes that satisfy the descriptions
+        """
+        if not self.n_nodes:
+            if any(desc.op is Node_Any for desc in descriptions):
+                probability = 1.0
+            else:
+                probability = min(1.0, self.DEFAULT_LABEL_PROBABILITY * len(descriptions.descriptions))
+        else:
+            count = 0
+            for desc in descriptions:
+                if desc.op is Node_Any:
+                    count = self.n_nodes
+                    break
+                if desc.op is Node_Text and not descriptions.use_basic_cat:
+                    count += self.label_counts[desc.value]
+                else:
+                    count += sum(
+                        n
+                        for label, n in self.label_counts.items()
+                        if desc.op.satisfies(Tree(label), desc.expect, use_basic_cat=descriptions.use_basic_cat)
+                    )
+            # Labels missing from the forest may still show up in other forests
+            probability = min(1.0, max(count, 0.5) / self.n_nodes)
+        return 1.0 - probability if descriptions.is_negated else probability
+
+
+# Expected number of nodes that searchNodeIterator() of a relation yields for
+# one node, relations left out yield at most one node
+RELATION_FANOUTS: dict[type[Relation], Callable[[Forest_Stats], float]] = {
+    DOMINATES: lambda stats: stats.depth,
+    DOMINATED_BY: lambda stats: stats.depth,
+    PARENT_OF: lambda stats: stats.children,
+    SISTER_OF: lambda stats: stats.children - 1,
+    LEFT_SISTER_OF: lambda stats: (stats.children - 1) / 2,
+    RIGHT_SISTER_OF: lambda stats: (stats.children - 1) / 2,
+    PARENT_EQUALS: lambda stats: stats.children + 1,
+    HAS_LEFTMOST_DESCENDANT: lambda stats: stats.depth / 2,
+    HAS_RIGHTMOST_DESCENDANT: lambda stats: stats.depth / 2,
+    LEFTMOST_DESCENDANT_OF: lambda stats: stats.depth / 2,
+    RIGHTMOST_DESCENDANT_OF: lambda stats: stats.depth / 2,
+    UNARY_PATH_ANCESTOR_OF: lambda stats: 1.5,
+    UNARY_PATH_DESCEDANT_OF: lambda stats: 1.5,
+    PRECEDES: lambda stats: stats.tree_size / 2,
+    FOLLOWS: lambda stats: stats.tree_size / 2,
+    IMMEDIATELY_PRECEDES: lambda stats: stats.depth / 2,
+    IMMEDIATELY_FOLLOWS: lambda stats: stats.depth / 2,
+    HEADED_BY: lambda stats: stats.depth / 2,
+    HEADS: lambda stats: stats.depth / 2,
+    ANCESTOR_OF_LEAF: lambda stats: stats.leaves_below,
+    UNBROKEN_CATEGORY_DOMINATES: lambda stats: stats.children,
+    UNBROKEN_CATEGORY_IS_DOMINATED_BY: lambda stats: 1.5,
+    UNBROKEN_CATEGORY_PRECEDES: lambda stats: stats.depth / 2,
+    UNBROKEN_CATEGORY_FOLLOWS: lambda stats: stats.depth / 2,
+    PATTERN_SPLITTER: lambda stats: stats.tree_size,
+}
+# Fixed cost of a relation besides stepping through the nodes it yields, in
+# units of one step
+RELATION_COSTS: dict[type[Relation], float] = {
+    HEADED_BY: 3.0,
+    HEADS: 3.0,
+    IMMEDIATELY_HEADED_BY: 3.0,
+    IMMEDIATELY_HEADS: 3.0,
+    ANCESTOR_OF_LEAF: 2.0,
+    ANCESTOR_OF_ITH_LEAF: 2.0,
+    PRECEDES: 2.0,
+    FOLLOWS: 2.0,
+}
+# Cost of checking one alternative of a node description
+DESCRIPTION_COSTS: dict[type[Node_Op], float] = {Node_Regex: 3.0}
+
+
+class Estimate(NamedTuple):
+    # expected work of one check, in steps
+    cost: float
+    # chance that the check succeeds
+    probability: float
+
+
+def _format_plan_line(text: str, depth: int, estimate: Estimate) -> str:
+    return f"{'  ' * depth + text:<48} cost={estimate.cost:<8.2f} p={estimate.probability:.3f}"
+
+
+class Condition(ABC):
+    """
+    Constraint that the relations of a node put on it
+    """
+
+    estimate = Estimate(1.0, 0.5)
+
+    @abstractmethod
+    def satisfies(self, t: Tree) -> bool:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def plan(self, stats: Forest_Stats) -> Estimate:
+        """
+        Reorder the checks below this condition by the estimates from stats,
+        and return the estimate of the condition itself
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def explain(self, depth: int = 0) -> list[str]:
+        raise NotImplementedError()
+
+    def format_line(self, text: str, depth: int) -> str:
+        return _format_plan_line(text, depth, self.estimate)
+
+
+class Relation_Condition(Condition):
+    def __init__(self, relation_data: AbstractRelationData, child: "Node_Pattern") -> None:
+        self.relation_data = relation_data
+        self.child = child
+        self.fanout = 1.0
+
+    def __repr__(self) -> str:
+        return f"{self.relation_data!r} {self.child!r}"
+
+    def satisfies(self, t: Tree) -> bool:
+        child = self.child
+        return any(child.satisfies(node) for node in self.relation_data.searchNodeIterator(t))
+
+    def plan(self, stats: Forest_Stats) -> Estimate:
+        op = self.relation_data.op
+        child_estimate = self.child.plan(stats)
+        self.fanout = fanout = RELATION_FANOUTS[op](stats) if op in RELATION_FANOUTS else 1.0  # type:ignore
+        p = child_estimate.probability
+        # any() stops at the first node that satisfies the child
+        n_steps = fanout if p == 0 else (1 - (1 - p) ** fanout) / p
+        self.estimate = Estimate(
+            RELATION_COSTS.get(op, 0.0) + n_steps * (1 + child_estimate.cost),  # type:ignore
+            1 - (1 - p) ** fanout,
+        )
+        return self.estimate
+
+    def explain(self, depth: int = 0) -> list[str]:
+        return [
+            self.format_line(f"{self.relation_data!r} (~{self.fanout:.1f} nodes)", depth),
+            *self.child.explain(depth + 1),
+        ]
+
+
+class And_Condition(Condition):
+    def __init__(self, conditions: list[Condition]) -> None:
+        self.conditions = conditions
+
+    def __repr__(self) -> str:
+        return " ".join(map(repr, self.conditions))
+
+    def satisfies(self, t: Tree) -> bool:
+        return all(condition.satisfies(t) for condition in self.conditions)
+
+    def plan(self, stats: Forest_Stats) -> Estimate:
+        for condition in self.conditions:
+            condition.plan(stats)
+
+        # Cheap checks that are likely to fail go first
+        def rank(condition: Condition) -> float:
+            cost, p = condition.estimate
+            return cost / (1 - p) if p < 1 else float("inf")
+
+        self.conditions.sort(key=rank)
+        cost, p = 0.0, 1.0
+        for condition in self.conditions:
+            cost += p * condition.estimate.cost
+            p *= condition.estimate.probability
+        self.estimate = Estimate(cost, p)
+        return self.estimate
+
+    def explain(self, depth: int = 0) -> list[str]:
+        return [self.format_line("and", depth)] + [
+            line for condition in self.conditions for line in condition.explain(depth + 1)
+        ]
+
+
+class Or_Condition(Condition):
+    def __init__(self, conditions: list[Condition]) -> None:
+        self.conditions = conditions
+
+    def __repr__(self) -> str:
+        return "[" + " | ".join(map(repr, self.conditions)) + "]"
+
+    def satisfies(self, t: Tree) -> bool:
+        return any(condition.satisfies(t) for condition in self.conditions)
+
+    def plan(self, stats: Forest_Stats) -> Estimate:
+        for condition in self.conditions:
+            condition.plan(stats)
+
+        # Cheap checks that are likely to succeed go first
+        def rank(condition: Condition) -> float:
+            cost, p = condition.estimate
+            return cost / p if p > 0 else float("inf")
+
+        self.conditions.sort(key=rank)
+        cost, p_fail = 0.0, 1.0
+        for condition in self.conditions:
+            cost += p_fail * condition.estimate.cost
+            p_fail *= 1 - condition.estimate.probability
+        self.estimate = Estimate(cost, 1 - p_fail)
+        return self.estimate
+
+    def explain(self, depth: int = 0) -> list[str]:
+        return [self.format_line("or", depth)] + [
+            line for condition in self.conditions for line in condition.explain(depth + 1)
+        ]
+
+
+class Not_Condition(Condition):
+    def __init__(self, condition: Condition) -> None:
+        self.condition = condition
+
+    def __repr__(self) -> str:
+        return f"!{self.condition!r}"
+
+    def satisfies(self, t: Tree) -> bool:
+        return not self.condition.satisfies(t)
+
+    def plan(self, stats: Forest_Stats) -> Estimate:
+        cost, p = self.condition.plan(stats)
+        self.estimate = Estimate(cost, 1 - p)
+        return self.estimate
+
+    def explain(self, depth: int = 0) -> list[str]:
+        return [self.format_line("not", depth), *self.condition.explain(depth + 1)]
+
+
+class Optional_Condition(Condition):
+    def __init__(self, condition: Condition) -> None:
+        self.condition = condition
+
+    def __repr__(self) -> str:
+        return f"?{self.condition!r}"
+
+    def satisfies(self, t: Tree) -> bool:
+        # "?" only decides whether the names in the relation get bound
+        return True
+
+    def plan(self, stats: Forest_Stats) -> Estimate:
+        self.condition.plan(stats)
+        self.estimate = Estimate(0.0, 1.0)
+        return self.estimate
+
+    def explain(self, depth: int = 0) -> list[str]:
+        return [self.format_line("optional (not checked)", depth), *self.condition.explain(depth + 1)]
+
+
+class Node_Pattern:
+    """
+    A node description and the condition its relations put on the node
+    """
+
+    def __init__(self, descriptions: Node_Descriptions, condition: Condition | None = None) -> None:
+        self.descriptions = descriptions
+        self.condition = condition
+        self.estimate = Estimate(1.0, 0.5)
+
+    def __repr__(self) -> str:
+        if self.condition is None:
+            return repr(self.descriptions)
+        return f"({self.descriptions!r} {self.condition!r})"
+
+    def add_condition(self, condition: Condition) -> None:
+        if self.condition is None:
+            self.condition = condition
+        else:
+            self.condition = And_Condition([self.condition, condition])
+
+    def satisfies(self, t: Tree) -> bool:
+        return self.descriptions.satisfy(t) and (self.condition is None or self.condition.satisfies(t))
+
+    def plan(self, stats: Forest_Stats) -> Estimate:
+        # The description is always checked first, the relations only run on
+        # nodes that satisfy it
+        cost = sum(DESCRIPTION_COSTS.get(desc.op, 1.0) for desc in self.descriptions) / 2  # type:ignore
+        p = stats.description_probability(self.descriptions)
+        if self.condition is not None:
+            condition_cost, condition_p = self.condition.plan(stats)
+            cost += p * condition_cost
+            p *= condition_p
+        self.estimate = Estimate(cost, p)
+        return self.estimate
+
+    def explain(self, depth: int = 0) -> list[str]:
+        descriptions = self.descriptions
+        text = ("!" if descriptions.is_negated else "") + ("@" if descriptions.use_basic_cat else "")
+        text += repr(descriptions)
+        line = _format_plan_line(text, depth, self.estimate)
+        if self.condition is None:
+            return [line]
+        return [line, *self.condition.explain(depth + 1)]
+
+
+class Tregex_Parser:
+    """
+    Recursive descent parser turning a Tregex pattern into a Node_Pattern
+    """
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.tokens = self.tokenize(pattern)
+        self.pos = 0
+        self.names: set[str] = set()
+
+    def tokenize(self, pattern: str) -> list[Token]:
+        tokens = []
+        pos = 0
+        while pos < len(pattern):
+            m = _TOKEN_RE.match(pattern, pos)
+            if m is None or m.lastgroup is None:
+                self.error(f'unexpected character "{pattern[pos]}"', pos)
+            if m.lastgroup == "MULTI_RELATION":
+                self.error("multi-relations are not supported", pos)
+            if m.lastgroup != "WS":
+                tokens.append(Token(m.lastgroup, m.group(), pos))
+            pos = m.end()
+        return tokens
+
+    def error(self, message: str, pos: int | None = None) -> NoReturn:
+        if pos is None:
+            pos = self.tokens[self.pos].pos if self.pos < len(self.tokens) else len(self.pattern)
+        raise ValueError(
+            f"Invalid Tregex pattern at position {pos}: {message}\n  {self.pattern}\n  {' ' * pos}^"
+        )
+
+    def peek(self, offset: int = 0) -> Token | None:
+        pos = self.pos + offset
+        return self.tokens[pos] if pos < len(self.tokens) else None
+
+    def next(self) -> Token:
+        token = self.peek()
+        if token is None:
+            self.error("unexpected end of pattern")
+        assert token is not None
+        self.pos += 1
+        return token
+
+    def accept(self, value: str) -> bool:
+        token = self.peek()
+        if token is not None and token.kind == "PUNCT" and token.value == value:
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, value: str) -> None:
+        if not self.accept(value):
+            self.error(f'expected "{value}"')
+
+    def parse(self) -> Node_Pattern:
+        node = self.parse_sub_node()
+        if self.peek() is not None:
+            self.error("unexpected token")
+        return node
+
+    def at_relation_start(self) -> bool:
+        token = self.peek()
+        if token is None:
+            return False
+        if token.kind == "PUNCT":
+            return token.value in "!?["
+        return token.kind in ("RELATION", "REL_W_NUM_ARG", "REL_W_STR_ARG")
+
+    def parse_sub_node(self) -> Node_Pattern:
+        if self.accept("("):
+            node = self.parse_sub_node()
+            self.expect(")")
+        else:
+            node = Node_Pattern(self.parse_mod_description())
+        if self.at_relation_start():
+            node.add_condition(self.parse_relation_disj())
+        return node
+
+    def parse_child_node(self) -> Node_Pattern:
+        if self.accept("("):
+            node = self.parse_sub_node()
+            self.expect(")")
+            return node
+        return Node_Pattern(self.parse_mod_description())
+
+    def parse_relation_disj(self) -> Condition:
+        conditions = [self.parse_relation_conj()]
+        while self.accept("|"):
+            conditions.append(self.parse_relation_conj())
+        return conditions[0] if len(conditions) == 1 else Or_Condition(conditions)
+
+    def parse_relation_conj(self) -> Condition:
+        conditions = [self.parse_mod_relation()]
+        while True:
+            if self.accept("&") or self.at_relation_start():
+                conditions.append(self.parse_mod_relation())
+            else:
+                break
+        return conditions[0] if len(conditions) == 1 else And_Condition(conditions)
+
+    def parse_mod_relation(self) -> Condition:
+        if self.accept("!"):
+            return Not_Condition(self.parse_relation_child())
+        if self.accept("?"):
+            return Optional_Condition(self.parse_relation_child())
+        return self.parse_relation_child()
+
+    def parse_relation_child(self) -> Condition:
+        if self.accept("["):
+            condition = self.parse_relation_disj()
+            self.expect("]")
+            return condition
+        return self.parse_relation()
+
+    def parse_relation(self) -> Relation_Condition:
+        token = self.next()
+        relation_data: AbstractRelationData
+        if token.kind == "RELATION":
+            relation_data = RelationData(token.value, RELATION_OP_MAP[token.value])  # type:ignore
+        elif token.kind == "REL_W_NUM_ARG":
+            m = _REL_W_NUM_ARG_RE.fullmatch(token.value)
+            assert m is not None
+            op, num = m.group(1), int(m.group(2))
+            if num == 0:
+                self.error("relations count children and leaves from 1 (or -1)", token.pos)
+            relation_data = RelationWithNumArgData(
+                token.value,
+                NUM_ARG_RELATION_OP_MAP[op],  # type:ignore
+                arg=num,
+            )
+        elif token.kind == "REL_W_STR_ARG":
+            self.expect("(")
+            descriptions = self.parse_description()
+            self.expect(")")
+            relation_data = RelationWithStrArgData(
+                f"{token.value}({descriptions!r})",
+                STR_ARG_RELATION_OP_MAP[token.value],  # type:ignore
+                arg=descriptions,
+            )
+        else:
+            self.error("expected a relation", token.pos)
+        return Relation_Condition(relation_data, self.parse_child_node())
+
+    def parse_mod_description(self) -> Node_Descriptions:
+        is_negated = self.accept("!")
+        use_basic_cat = self.accept("@")
+        descriptions = self.parse_description()
+        descriptions.is_negated = is_negated
+        descriptions.use_basic_cat = use_basic_cat
+
+        if self.accept("="):
+            token = self.next()
+            if token.kind != "IDENTIFIER":
+                self.error("expected a node name", token.pos)
+            if token.value in self.names:
+                self.error(f'backreferences are not supported, "{token.value}" is named twice', token.pos)
+            self.names.add(token.value)
+            descriptions.set_name(token.value)
+        elif self.accept("~"):
+            self.error("backreferences are not supported", self.tokens[self.pos - 1].pos)
+        return descriptions
+
+    def parse_description(self) -> Node_Descriptions:
+        descriptions = [self.parse_description_term()]
+        while (
+            (token := self.peek()) is not None
+            and token.value == "|"
+            and (next_token := self.peek(1)) is not None
+            and next_token.kind in ("IDENTIFIER", "REGEX", "BLANK")
+        ):
+            self.pos += 1
+            descriptions.append(self.parse_description_term())
+        ret = Node_Descriptions(descriptions)
+        ret.set_strins_repr("|".join(desc.value for desc in descriptions))
+        return ret
+
+    def parse_description_term(self) -> Node_Description:
+        token = self.next()
+        if token.kind == "IDENTIFIER":
+            return Node_Description.build(Node_Text, token.value)
+        if token.kind == "REGEX":
+            try:
+                return Node_Description.build(Node_Regex, token.value)
+            except re.error as e:
+                self.error(f"invalid regex: {e}", token.pos)
+        if token.kind == "BLANK":
+            return Node_Description.build(Node_Any, token.value)
+        self.error("expected a node description", token.pos)
+        raise AssertionError  # unreachable
+
+
+class Tregex_Pattern:
+    """
+    A compiled Tregex pattern. It exposes the same interface as the searchers
+    of neosca.ns_sca.l2sca, so that compiled patterns can run in the same
+    single walk over a tree as the hand-written ones.
+    """
+
+    # pattern string -> compiled pattern
+    compiled_patterns: dict[str, "Tregex_Pattern"] = {}
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.root = Tregex_Parser(pattern).parse()
+
+        # Labels a node must have to possibly match, None if any node can
+        descriptions = self.root.descriptions
+        self.candidate_labels: tuple[str, ...] | None = None
+        if (
+            not descriptions.is_negated
+            and not descriptions.use_basic_cat
+            and all(desc.op is Node_Text for desc in descriptions)
+        ):
+            self.candidate_labels = tuple(desc.value for desc in descriptions)
+        # Whether the pattern has been planned for the statistics of a real
+        # forest, rather than the defaults
+        self.is_planned_for_forest = False
+
+    def __repr__(self) -> str:
+        return self.pattern
+
+    @classmethod
+    def compile(cls, pattern: str) -> "Tregex_Pattern":
+        """
+        The compiled pattern, planned with default statistics the first time
+        """
+        if (compiled := cls.compiled_patterns.get(pattern)) is None:
+            compiled = cls.compiled_patterns[pattern] = cls(pattern)
+            compiled.plan(Forest_Stats())
+        return compiled
+
+    def plan(self, stats: Forest_Stats) -> Estimate:
+        """
+        Reorder the checks of the pattern to suit a forest with the given
+        statistics. The order never changes which nodes match.
+        """
+        return self.root.plan(stats)
+
+    def explain(self, stats: Forest_Stats | None = None) -> str:
+        """
+        The current plan as text, one check per line in the order they run,
+        after planning for stats if given. Costs are in steps over nodes, p is
+        the estimated chance that a check succeeds.
+        """
+        if stats is not None:
+            self.plan(stats)
+        return "\n".join((f"Plan for {self.pattern}", *self.root.explain()))
+
+    def matchCandidate(self, candidate: Tree) -> Generator[Tree, None, None]:
+        # Unlike the hand-written searchers, a node is yielded at most once
+        if self.root.satisfies(candidate):
+            yield candidate
+
+    def searchNodeIterator(self, t: Tree) -> Generator[Tree, None, None]:
+        condition = self.root.condition
+        for node in self.root.descriptions.searchNodeIterator(t):
+            if condition is None or condition.satisfies(node):
+                yield node
@@ -41,6 +41,20 @@ def safe_div(n1: int | float, n2: int | float) -> int | float:
     return n1 / n2 if n2 else 0
 
 
+def safe_div_columns(n1, n2):
+    """
+    Element-wise safe_div() of NumPy arrays, or of an array and a number.
+
+    >>> import numpy as np
+    >>> safe_div_columns(np.array([10, 10]), np.array([2, 0]))
+    array([5., 0.])
+    """
+    import numpy as np
+
+    n1, n2 = np.broadcast_arrays(np.asarray(n1, dtype=np.float64), np.asarray(n2, dtype=np.float64))
+    return np.divide(n1, n2, out=np.zeros(n1.shape), where=n2 != 0)
+
+
 def safe_log(n: float, base: int | None = None) -> float:
     """
     >>> safe_log(10, 10)
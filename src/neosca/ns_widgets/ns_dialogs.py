@@ -264,7 +264,7 @@ class Ns_Dialog_TextEdit_Matches(Ns_Dialog_TextEdit):
 
         self.file_name = index.model().index(index.row(), 0).data()
         self.sname = index.model().headerData(index.column(), Qt.Orientation.Horizontal)
-        self.matched_subtrees: list[str] = index.data(Qt.ItemDataRole.UserRole)
+        self.matched_subtrees: Sequence[str] = index.data(Qt.ItemDataRole.UserRole)
         self.setText("\n".join(self.matched_subtrees))
 
         self.label_summary = Ns_Label_WordWrapped(
@@ -461,14 +461,14 @@ class Ns_Dialog_Table_Cache(Ns_Dialog_Table):
 
     def on_delete_all(self) -> None:
         cache_paths = tuple(self.model_cache.yield_column(0, Qt.ItemDataRole.UserRole))
-        self.delete_cache(cache_paths)
+        self.delete_cache(cache_paths, is_deleting_all=True)
 
     def on_delete_selected(self) -> None:
         indexes: list[QModelIndex] = self.tableview_cache.selectionModel().selectedRows(column=0)
         cache_paths = tuple(index.data(Qt.ItemDataRole.UserRole) for index in indexes)
         self.delete_cache(cache_paths)
 
-    def delete_cache(self, cache_paths: Sequence[str]) -> None:
+    def delete_cache(self, cache_paths: Sequence[str], *, is_deleting_all: bool = False) -> None:
         if not cache_paths:
             QMessageBox.warning(self, "No Cache Files Selected", "Please select at least one cache file.")
             return
@@ -487,13 +487,17 @@ class Ns_Dialog_Table_Cache(Ns_Dialog_Table):
             if messagebox.exec() == QMessageBox.StandardButton.No:
                 return
 
-        for cache_path in cache_paths:
+        # Files with the same contents share a cache file
+        for cache_path in dict.fromkeys(cache_paths):
             try:
                 os.remove(cache_path)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error deleting file: {e}")
 
         Ns_Cache.delete_cache_entries(cache_paths)
+        # Parses of sentences are not listed, but go with the whole cache
+        if is_deleting_all:
+            Ns_Cache.clear_sentence_records()
 
         noun = "cache file" if len_cache_paths == 1 else "cache files"
         self.main.statusBar().showMessage(f"Deleted {len_cache_paths} {noun}")
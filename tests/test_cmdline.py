@@ -80,6 +80,19 @@ class TestCommandLine(CmdlineTmpl):
             self.assertEqual(self.ui.options.oformat_freq, "json")
             self.assertEqual(self.ui.odir_matched, "result_matches")
 
+    def test_run_options(self):
+        for subcommand in ("sca", "lca"):
+            args = ["nsca", subcommand, "--text", cli_text, "--jobs", "0", "--batch-size", "4"]
+            self.assertEqual(self.ui.parse_args(args), (True, None))
+            self.assertEqual(self.ui.options.jobs, os.cpu_count() or 1)
+            self.assertEqual(self.ui.init_kwargs["batch_size"], 4)
+            self.assertFalse(self.ui.init_kwargs["is_resuming"])
+
+            for option, value in (("--jobs", "-1"), ("--batch-size", "0"), ("--cache-max-size", "-1")):
+                sucess, err_msg = self.ui.parse_args(["nsca", subcommand, "--text", cli_text, option, value])
+                self.assertFalse(sucess)
+                self.assertIn(option, err_msg)
+
     def test_no_parse(self):
         args = ["nsca", "sca", "--text", cli_text, "--cache", "--use-cache"]
         self.ui.parse_args(args)
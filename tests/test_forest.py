@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+from neosca.ns_tregex.forest import Forest
+from neosca.ns_tregex.tree import Tree
+
+from .base_tmpl import BaseTmpl
+from .base_tmpl import tree as tree_string
+
+
+class TestForest(BaseTmpl):
+    def test_fromstring(self):
+        forest = Forest.fromstring(tree_string * 3)
+        self.assertEqual(len(forest), 3)
+        self.assertEqual(forest.string, tree_string * 3)
+        for tree in forest:
+            self.assertEqual(tree, next(Tree.fromstring(tree_string)))
+
+        # iterating again yields the very same Tree objects, not fresh parses
+        self.assertEqual([id(tree) for tree in forest], [id(tree) for tree in forest.trees])
+        self.assertIs(forest[0], forest.trees[0])
+
+    def test_string(self):
+        trees = list(Tree.fromstring("(ROOT (NP (EX There)))(ROOT (NP (DT that)))"))
+        forest = Forest(trees)
+        self.assertEqual(forest.string, "(ROOT (NP (EX There)))\n(ROOT (NP (DT that)))")
+        self.assertEqual(repr(forest), forest.string)
+
+        self.assertEqual(len(Forest()), 0)
+        self.assertEqual(Forest().string, "")
+
+    def test_leaf_strings(self):
+        forest = Forest.fromstring("(ROOT (NP (EX There)))(ROOT (S (NP (DT that)) (VP (VBD was))))")
+        self.assertEqual(forest.leaf_strings(), [("There",), ("that", "was")])
+        self.assertIs(forest.leaf_strings(), forest.leaf_strings())
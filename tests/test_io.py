@@ -1,6 +1,14 @@
 #!/usr/bin/env python3
 
-from neosca.ns_io import Ns_IO
+import json
+import os.path as os_path
+import pickle
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from neosca.ns_io import Ns_Cache, Ns_IO, Ns_Run_Manifest, Ns_Values_Writer
 
 from .base_tmpl import BaseTmpl
 
@@ -11,3 +19,237 @@ class TestIO(BaseTmpl):
         self.assertEqual(Ns_IO.ensure_unique_filestem("name", ["name", "name (1)"]), "name (2)")
         self.assertEqual(Ns_IO.ensure_unique_filestem("name", ["name", "name (1)", "name (2)"]), "name (3)")
         self.assertEqual(Ns_IO.ensure_unique_filestem("name", ["other"]), "name")
+
+
+class TestCache(BaseTmpl):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.patches = (
+            mock.patch("neosca.ns_io.CACHE_DIR", Path(self.tmpdir.name)),
+            mock.patch("neosca.ns_io.CACHE_DB_PATH", Path(self.tmpdir.name) / "cache_info.sqlite3"),
+            mock.patch("neosca.ns_io.CACHE_INFO_PATH", Path(self.tmpdir.name) / "cache_info.json"),
+            mock.patch.object(Ns_Cache, "connection", None),
+            mock.patch.object(Ns_Cache, "model_tag", "model"),
+            mock.patch.object(Ns_Cache, "total_size", None),
+        )
+        for patch in self.patches:
+            patch.start()
+        return super().setUp()
+
+    def tearDown(self):
+        if Ns_Cache.connection is not None:
+            Ns_Cache.connection.close()
+        for patch in self.patches:
+            patch.stop()
+        self.tmpdir.cleanup()
+        return super().tearDown()
+
+    def write_file(self, name: str, text: str) -> str:
+        path = os_path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_get_cache_path(self):
+        path_a = self.write_file("a.txt", "Same text.")
+        cache_path, is_available = Ns_Cache.get_cache_path(path_a)
+        self.assertFalse(is_available)
+        self.assertEqual(Ns_Cache.get_cache_name(path_a), os_path.basename(cache_path))
+        Ns_IO.dump_bytes(b"parse", cache_path)
+
+        # Copies and renamed files share the cache
+        path_b = self.write_file("b.txt", "Same text.")
+        self.assertEqual(Ns_Cache.get_cache_path(path_b), (cache_path, True))
+        self.assertEqual(Ns_Cache.get_cache_path(path_a), (cache_path, True))
+
+        # Changed contents and changed models do not
+        path_b = self.write_file("b.txt", "Other text.")
+        self.assertFalse(Ns_Cache.get_cache_path(path_b)[1])
+        with mock.patch.object(Ns_Cache, "model_tag", "other-model"):
+            self.assertFalse(Ns_Cache.get_cache_path(path_a)[1])
+
+    def test_evict(self):
+        cache_paths = []
+        for name in ("a.txt", "b.txt", "c.txt"):
+            cache_path, _ = Ns_Cache.get_cache_path(self.write_file(name, name))
+            Ns_IO.dump_bytes(b"parse", cache_path)
+            Ns_Cache.record_cache(cache_path)
+            cache_paths.append(cache_path)
+        self.assertEqual(len(tuple(Ns_Cache.yield_cname_cpath_csize_fpath())), 3)
+
+        # Using a.txt makes b.txt the least recently used
+        self.assertTrue(Ns_Cache.get_cache_path(os_path.join(self.tmpdir.name, "a.txt"))[1])
+        with mock.patch.object(Ns_Cache, "max_size", 2 * len(b"parse")):
+            Ns_Cache.evict()
+        self.assertEqual(list(map(os_path.exists, cache_paths)), [True, False, True])
+        self.assertEqual(
+            sorted(file_path for *_, file_path in Ns_Cache.yield_cname_cpath_csize_fpath()),
+            [os_path.join(self.tmpdir.name, name) for name in ("a.txt", "c.txt")],
+        )
+
+    def test_concurrent_access(self):
+        # Each change is committed at once, so another process can write
+        path = self.write_file("a.txt", "a")
+        cache_path, _ = Ns_Cache.get_cache_path(path)
+        Ns_IO.dump_bytes(b"parse", cache_path)
+        Ns_Cache.record_cache(cache_path)
+        other = sqlite3.connect(os_path.join(self.tmpdir.name, "cache_info.sqlite3"), timeout=1)
+        with other:
+            other.execute("INSERT INTO files VALUES (?, ?)", ("b.txt", "b.pickle.lzma"))
+        other.close()
+        self.assertEqual(Ns_Cache.get_cache_name("b.txt"), "b.pickle.lzma")
+
+        # The running total follows the recorded sizes
+        self.assertEqual(Ns_Cache.get_total_size(), len(b"parse"))
+        Ns_IO.dump_bytes(b"longer parse", cache_path)
+        Ns_Cache.record_cache(cache_path)
+        self.assertEqual(Ns_Cache.get_total_size(), len(b"longer parse"))
+
+    def test_import_cache_info_json(self):
+        cache_path = os_path.join(self.tmpdir.name, "foo.pickle.lzma")
+        Ns_IO.dump_bytes(b"parse", cache_path)
+        cache_info_path = os_path.join(self.tmpdir.name, "cache_info.json")
+        Ns_IO.dump_json({"/path/to/foo.txt": "foo.pickle.lzma"}, cache_info_path)
+        self.assertEqual(
+            list(Ns_Cache.yield_cname_cpath_csize_fpath()),
+            [("foo.pickle.lzma", cache_path, "5.0 B", "/path/to/foo.txt")],
+        )
+        self.assertFalse(os_path.exists(cache_info_path))
+
+    def test_sentence_records(self):
+        key = Ns_Cache.get_sentence_key("A sentence.")
+        self.assertEqual(key, Ns_Cache.get_sentence_key("A sentence."))
+        self.assertNotEqual(key, Ns_Cache.get_sentence_key("Another sentence."))
+        with mock.patch.object(Ns_Cache, "model_tag", "other-model"):
+            self.assertNotEqual(key, Ns_Cache.get_sentence_key("A sentence."))
+
+        record = {"processors": {"pos"}, "words": [{"upos": "DET"}], "constituency": None}
+        self.assertEqual(Ns_Cache.load_sentence_records([key]), {})
+        Ns_Cache.save_sentence_records({key: record})
+        keys = [key, *(str(i) for i in range(1000))]
+        self.assertEqual(Ns_Cache.load_sentence_records(keys), {key: record})
+
+    def test_evict_sentence_records(self):
+        # --cache-max-size bounds sentence records along with cache files
+        record = {"processors": {"pos"}, "words": [{"upos": "DET"}], "constituency": None}
+        record_size = len(pickle.dumps(record))
+        cache_path, _ = Ns_Cache.get_cache_path(self.write_file("a.txt", "a"))
+        Ns_IO.dump_bytes(b"parse", cache_path)
+        Ns_Cache.record_cache(cache_path)
+        keys = [Ns_Cache.get_sentence_key(str(i)) for i in range(4)]
+        with mock.patch.object(Ns_Cache, "max_size", len(b"parse") + 3 * record_size):
+            for key in keys[:3]:
+                Ns_Cache.save_sentence_records({key: record})
+            self.assertEqual(Ns_Cache.get_total_size(), len(b"parse") + 3 * record_size)
+            # Loading keys[0] makes the cache file the least recently used
+            self.assertEqual(Ns_Cache.load_sentence_records(keys[:1]), {keys[0]: record})
+            Ns_Cache.save_sentence_records({keys[3]: record})
+            self.assertFalse(os_path.exists(cache_path))
+            Ns_Cache.save_sentence_records({keys[3]: record, "new": record})
+        self.assertEqual(Ns_Cache.get_total_size(), 3 * record_size)
+        self.assertEqual(Ns_Cache.get_total_size(is_refreshing=True), 3 * record_size)
+        self.assertEqual(Ns_Cache.load_sentence_records(keys).keys(), {keys[0], keys[3]})
+
+        Ns_Cache.clear_sentence_records()
+        self.assertEqual(Ns_Cache.load_sentence_records([*keys, "new"]), {})
+        self.assertEqual(Ns_Cache.get_total_size(), 0)
+
+
+class TestValuesWriter(BaseTmpl):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.records = [{"Filepath": "a.txt", "W": 10, "MLS": 5.0}, {"Filepath": "b.txt", "W": 0, "MLS": 0}]
+        return super().setUp()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        return super().tearDown()
+
+    def write(self, oformat: str, records: list[dict]) -> str:
+        path = os_path.join(self.tmpdir.name, f"result.{oformat}")
+        with Ns_Values_Writer(path, oformat) as writer:
+            for record in records:
+                writer.write(record)
+                # Each record is on disk once written
+                self.assertGreater(os_path.getsize(path), 0)
+        with open(path, encoding="utf-8", newline="") as f:
+            return f.read()
+
+    def test_formats(self):
+        self.assertEqual(self.write("csv", self.records), "Filepath,W,MLS\r\na.txt,10,5.0\r\nb.txt,0,0\r\n")
+        self.assertEqual(
+            self.write("jsonl", self.records).splitlines(), [json.dumps(record) for record in self.records]
+        )
+        # A JSON array written item by item is laid out as json.dump() does
+        for records in (self.records, self.records[:1], []):
+            self.assertEqual(self.write("json", records), json.dumps(records, indent=2))
+        self.assertRaises(ValueError, Ns_Values_Writer, None, "xlsx")
+
+    def test_resume(self):
+        path = os_path.join(self.tmpdir.name, "result.csv")
+        sources = []
+        for name in ("a.txt", "b.txt"):
+            sources.append(os_path.join(self.tmpdir.name, name))
+            with open(sources[-1], "w", encoding="utf-8") as f:
+                f.write(name)
+        config = {"precision": 4}
+
+        # A run interrupted after its first file
+        with Ns_Values_Writer(path, "csv", manifest=Ns_Run_Manifest(path, config)) as writer:
+            self.assertFalse(writer.is_finished(sources[0]))
+            writer.write(self.records[0], sources[0])
+
+        with Ns_Values_Writer(path, "csv", manifest=Ns_Run_Manifest(path, config)) as writer:
+            self.assertTrue(writer.is_finished(sources[0]))
+            self.assertFalse(writer.is_finished(sources[1]))
+            writer.write(self.records[1], sources[1])
+        with open(path, encoding="utf-8", newline="") as f:
+            self.assertEqual(f.read(), "Filepath,W,MLS\r\na.txt,10,5.0\r\nb.txt,0,0\r\n")
+
+        # Changed files and changed configurations are analyzed again
+        with open(sources[0], "a", encoding="utf-8") as f:
+            f.write("more")
+        with Ns_Values_Writer(path, "csv", manifest=Ns_Run_Manifest(path, config)) as writer:
+            self.assertFalse(writer.is_finished(sources[0]))
+            self.assertTrue(writer.is_finished(sources[1]))
+            self.assertFalse(writer.is_finished([sources[1]]))
+        with Ns_Values_Writer(path, "csv", manifest=Ns_Run_Manifest(path, {"precision": 2})) as writer:
+            self.assertFalse(writer.is_finished(sources[1]))
+
+        self.assertRaises(ValueError, Ns_Values_Writer, None, "csv", manifest=Ns_Run_Manifest(path, config))
+
+    def test_resume_changed_file(self):
+        sources = []
+        for name in ("a.txt", "b.txt"):
+            sources.append(os_path.join(self.tmpdir.name, name))
+            with open(sources[-1], "w", encoding="utf-8") as f:
+                f.write(name)
+        config = {"precision": 4}
+
+        for oformat in ("csv", "jsonl"):
+            path = os_path.join(self.tmpdir.name, f"result.{oformat}")
+            with Ns_Values_Writer(path, oformat, manifest=Ns_Run_Manifest(path, config)) as writer:
+                for source, record in zip(sources, self.records, strict=True):
+                    writer.write(record, source)
+
+            # A file edited between the runs is analyzed again, and its row
+            # replaces the old one
+            with open(sources[0], "a", encoding="utf-8") as f:
+                f.write("more")
+            new_record = {**self.records[0], "W": 20}
+            with Ns_Values_Writer(path, oformat, manifest=Ns_Run_Manifest(path, config)) as writer:
+                self.assertEqual(writer.filter_unfinished(sources), [sources[0]])
+                writer.write(new_record, sources[0])
+            with open(path, encoding="utf-8", newline="") as f:
+                content = f.read()
+            if oformat == "csv":
+                self.assertEqual(content, "Filepath,W,MLS\r\nb.txt,0,0\r\na.txt,20,5.0\r\n")
+            else:
+                self.assertEqual(content.splitlines(), [json.dumps(self.records[1]), json.dumps(new_record)])
+
+            # The manifest holds each file once
+            manifest = Ns_Run_Manifest(path, config)
+            self.assertEqual(manifest.load(), 2)
+            self.assertEqual(manifest.n_dropped, 0)
+            with open(sources[0], "w", encoding="utf-8") as f:
+                f.write("a.txt")
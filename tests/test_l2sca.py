@@ -1915,6 +1915,50 @@ class TestL2SCA(BaseTmpl):
         self.run_test(l2sca.CP, "(NODE (CC))", 0)
 
     # }}}
+    def test_multi_searcher(self):
+        tree = next(
+            Tree.fromstring(
+                "(ROOT (S (S (NP (PRP He)) (VP (VBD ran))) (, ,) (CC and) (S (NP (PRP she)) (VP (VBD walked)"
+                " (SBAR (WHNP (WP who)) (S (VP (VBZ knows)))))) (. .)))"
+            )
+        )
+        multi_searcher = l2sca.Multi_Searcher(self.searchers + self.searchers)
+        self.assertEqual(multi_searcher.searchers, self.searchers)
+        self.assertEqual(multi_searcher.label_searchers_map["FRAG"], [l2sca.C2, l2sca.T2])
+
+        searcher_nodes_map: dict = {searcher: [] for searcher in self.searchers}
+        for searcher, node in multi_searcher.searchNodeIterator(tree):
+            searcher_nodes_map[searcher].append(node)
+        for searcher, nodes in searcher_nodes_map.items():
+            self.assertEqual(list(map(id, nodes)), list(map(id, searcher.searchNodeIterator(tree))))
+        self.assertEqual(len(searcher_nodes_map[l2sca.T1]), 2)
+
+    searchers = (
+        l2sca.S,
+        l2sca.VP1,
+        l2sca.VP2,
+        l2sca.C1,
+        l2sca.C2,
+        l2sca.T1,
+        l2sca.T2,
+        l2sca.CN1,
+        l2sca.CN2,
+        l2sca.CN3,
+        l2sca.DC,
+        l2sca.CT,
+        l2sca.CP,
+    )
+
     def run_test(self, searcher, tree_str: str, expected_matches: int):
         tree = next(Tree.fromstring(tree_str))
         self.assertEqual(len(list(searcher.searchNodeIterator(tree))), expected_matches)
+        # The single-pass matcher must agree with the searcher's own walk
+        multi_searcher = l2sca.Multi_Searcher(self.searchers)
+        self.assertEqual(
+            sum(
+                1
+                for matched_searcher, _ in multi_searcher.searchNodeIterator(tree)
+                if matched_searcher is searcher
+            ),
+            expected_matches,
+        )
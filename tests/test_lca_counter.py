@@ -72,3 +72,39 @@ class TestLCACounter(BaseTmpl):
             logging.info(f"Comparing {item}...")
             self.assertEqual(c.get_value(item), c_parent.get_value(item))
             self.assertEqual(c.get_matches(item), c_parent.get_matches(item))
+
+        # Merging in place gives the same values as summing pairwise
+        c_merged = Ns_LCA_Counter()
+        c_merged.merge_from(counters)
+        self.assertEqual(c_merged.file_path, "+".join(counter.file_path for counter in counters))
+        for item in Ns_LCA_Counter.DEFAULT_MEASURES:
+            if item in ("NDW-ER50", "NDW-ES50"):
+                continue
+            self.assertEqual(c_merged.get_value(item), c_parent.get_value(item))
+            self.assertEqual(c_merged.get_matches(item), c_parent.get_matches(item))
+
+    def test_counting_only(self):
+        lempos_path = glob.glob(f"{self.testdir_data_lempos}/*.lempos")[0]
+        with open(lempos_path, encoding="utf-8") as f:
+            lempos_tuples = tuple(
+                (lemma.lower(), pos) for lemma, pos in (line.strip().split("_") for line in f if line.strip())
+            )
+        counter = Ns_LCA_Counter(tagset="ptb", is_counting_only=True)
+        counter.determine_all_values(lempos_tuples)
+        expected = Ns_LCA_Counter(tagset="ptb")
+        expected.determine_all_values(lempos_tuples)
+        for item in Ns_LCA_Counter.DEFAULT_MEASURES:
+            if item in ("NDW-ER50", "NDW-ES50"):
+                continue
+            self.assertEqual(counter.get_value(item), expected.get_value(item), item)
+            self.assertEqual(counter.get_matches(item), [])
+        self.assertNotIn("noun", counter.count_table)
+        self.assertEqual(counter.count_freqs["noun"].total(), counter.get_value("nountokens"))
+
+        merged = counter + expected
+        self.assertFalse(merged.is_counting_only)
+        self.assertEqual(merged.get_value("lextokens"), expected.get_value("lextokens") * 2)
+        self.assertEqual(merged.get_value("lextypes"), expected.get_value("lextypes"))
+        counter.merge_from([expected])
+        self.assertEqual(counter.get_value("lextokens"), expected.get_value("lextokens") * 2)
+        self.assertEqual(counter.get_value("lextypes"), expected.get_value("lextypes"))
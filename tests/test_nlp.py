@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 
 import os
+import tempfile
+import uuid
+from unittest import mock
 
+from neosca.ns_io import Ns_Cache
 from neosca.ns_nlp import Ns_NLP_Stanza
+from neosca.ns_parse_pool import Ns_Parse_Pool
+from neosca.ns_sca.ns_sca import Ns_SCA
 
 from .base_tmpl import BaseTmpl
 from .cmdline_tmpl import text as cli_text
@@ -13,12 +19,12 @@ class TestNLPStanza(BaseTmpl):
         self.processors = Ns_NLP_Stanza.processors
         return super().setUp()
 
-    def test_private_nlp(self):
+    def test_private_nlp_many(self):
         processors = ("tokenize",)
-        doc = Ns_NLP_Stanza._nlp(cli_text, processors=processors)
+        doc = Ns_NLP_Stanza._nlp_many((cli_text,), processors=processors)[0]
         self.assertSetEqual(doc.processors, set(processors))
 
-        doc2 = Ns_NLP_Stanza._nlp(doc)
+        doc2 = Ns_NLP_Stanza._nlp_many((doc,))[0]
         self.assertSetEqual(doc2.processors, set(self.processors))
 
     def test_nlp(self):
@@ -39,3 +45,103 @@ class TestNLPStanza(BaseTmpl):
         serialized = Ns_NLP_Stanza.doc2serialized(doc)
         doc2 = Ns_NLP_Stanza.serialized2doc(serialized)
         self.assertSetEqual(doc.processors, doc2.processors)
+
+    def test_nlp_many(self):
+        texts = ("This is the first text.", "This is another text. It has two sentences.")
+        cache_paths = ("cli_text_0.pickle.lzma", None)
+        docs = Ns_NLP_Stanza.nlp_many(texts, processors=("tokenize",), cache_paths=cache_paths)
+        self.assertEqual([len(doc.sentences) for doc in docs], [1, 2])
+        self.assertFileExists(cache_paths[0])
+        os.remove(cache_paths[0])
+
+        # Each document gets only the processors it lacks
+        docs = Ns_NLP_Stanza.nlp_many((docs[0], texts[1]), processors=self.processors)
+        for doc in docs:
+            self.assertSetEqual(doc.processors, set(self.processors))
+        self.assertEqual(
+            Ns_NLP_Stanza.get_constituency_forests(texts),
+            [Ns_NLP_Stanza.get_constituency_forest(text) for text in texts],
+        )
+
+    def test_load_processors(self):
+        if hasattr(Ns_NLP_Stanza, "pipeline"):
+            del Ns_NLP_Stanza.pipeline
+        Ns_NLP_Stanza.loaded_processors = ()
+
+        Ns_NLP_Stanza.get_lemma_and_pos(cli_text, tagset="ud")
+        self.assertEqual(Ns_NLP_Stanza.loaded_processors, ("tokenize", "mwt", "pos", "lemma"))
+        self.assertEqual(tuple(Ns_NLP_Stanza.processor_sizes), Ns_NLP_Stanza.loaded_processors)
+        self.assertGreater(Ns_NLP_Stanza.processor_sizes["pos"], 0)
+
+        # Processors are added when needed, and kept
+        Ns_NLP_Stanza.get_constituency_forest(cli_text)
+        self.assertEqual(Ns_NLP_Stanza.loaded_processors, self.processors)
+
+    def test_nlp_many_by_sentence(self):
+        cache_path = "cli_text_0.pickle.lzma"
+        text = "This is the first sentence. This is the second one."
+        forest = Ns_NLP_Stanza.get_constituency_forest(text, cache_path=cache_path)
+        os.remove(cache_path)
+
+        # Only the edited sentence is parsed again
+        with mock.patch.object(Ns_NLP_Stanza, "_nlp_many", wraps=Ns_NLP_Stanza._nlp_many) as nlp_many:
+            edited_forest = Ns_NLP_Stanza.get_constituency_forest(
+                text.replace("second one", "last one"), cache_path=cache_path
+            )
+        parsed_doc = nlp_many.call_args_list[-1].args[0][0]
+        self.assertEqual([sentence.text for sentence in parsed_doc.sentences], ["This is the last one."])
+        self.assertEqual(edited_forest.split("\n")[0], forest.split("\n")[0])
+        os.remove(cache_path)
+
+    def test_reusing_sentences(self):
+        texts = ("This is a prompt. I agree with it.", "This is a prompt. I disagree with it.")
+        Ns_NLP_Stanza.start_reusing_sentences()
+        try:
+            with mock.patch.object(Ns_NLP_Stanza, "_nlp_many", wraps=Ns_NLP_Stanza._nlp_many) as nlp_many:
+                forests = Ns_NLP_Stanza.get_constituency_forests(texts)
+        finally:
+            Ns_NLP_Stanza.stop_reusing_sentences()
+
+        # The repeated sentence is parsed once, and its parse shared
+        parsed_doc = nlp_many.call_args_list[-1].args[0][0]
+        self.assertEqual(len(parsed_doc.sentences), 3)
+        self.assertEqual((Ns_NLP_Stanza.n_sentences, Ns_NLP_Stanza.n_parsed_sentences), (4, 3))
+        self.assertEqual(forests[0].split("\n")[0], forests[1].split("\n")[0])
+        self.assertEqual(forests, [Ns_NLP_Stanza.get_constituency_forest(text) for text in texts])
+
+    def test_keep_sentence_records(self):
+        Ns_NLP_Stanza.start_reusing_sentences()
+        try:
+            with mock.patch.object(Ns_NLP_Stanza, "max_sentence_records", 2):
+                Ns_NLP_Stanza.keep_sentence_records({"a": {}, "b": {}})
+                # "a" is used again, so "b" is the least recently used
+                Ns_NLP_Stanza.keep_sentence_records({"a": {}, "c": {}})
+            self.assertEqual(list(Ns_NLP_Stanza.sentence_records), ["a", "c"])  # type:ignore
+        finally:
+            Ns_NLP_Stanza.stop_reusing_sentences()
+        self.assertIsNone(Ns_NLP_Stanza.sentence_records)
+
+    def test_reusing_sentences_in_workers(self):
+        # A sentence parsed by a worker of one pool is found by the workers
+        # of another through the cache database
+        word = f"Zq{uuid.uuid4().hex[:8]}"
+        analyzer = Ns_SCA(is_cache=True, is_use_cache=True, jobs=2)
+        cache_paths = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("first", "second"):
+                file_path = os.path.join(tmpdir, f"{name}.txt")
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(f"{word} is shared. {word} is {name}.")
+                cache_paths.append(Ns_Cache.get_cache_path(file_path)[0])
+                with Ns_Parse_Pool(
+                    analyzer,
+                    analyzer.PARSE_FILE_METHOD_NAME,
+                    analyzer.PARSE_TEXTS_METHOD_NAME,
+                    [file_path],
+                    jobs=2,
+                ) as pool:
+                    self.assertEqual(pool.take(file_path).count("(ROOT"), 2)
+            self.assertEqual((Ns_NLP_Stanza.n_sentences, Ns_NLP_Stanza.n_parsed_sentences), (2, 1))
+        for cache_path in cache_paths:
+            os.remove(cache_path)
+        Ns_Cache.delete_cache_entries(cache_paths)
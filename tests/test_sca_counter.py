@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 
 import operator
-
-from neosca.ns_exceptions import StructureNotFoundError
-from neosca.ns_sca.ns_sca_counter import Ns_SCA_Counter, Ns_SCA_Structure
+from unittest import mock
+
+from neosca.ns_exceptions import CircularDefinitionError, InvalidSourceError, StructureNotFoundError
+from neosca.ns_sca.ns_sca_counter import (
+    Ns_SCA_Counter,
+    Ns_SCA_Evaluation_Plan,
+    Ns_SCA_Matches,
+    Ns_SCA_Structure,
+    Ns_SCA_Value_Source,
+)
+from neosca.ns_tregex.forest import Forest
+from neosca.ns_tregex.tregex_pattern import Forest_Stats, Tregex_Pattern
 
 from .base_tmpl import BaseTmpl
+from .base_tmpl import tree as tree_string
 
 
 class TestStructure(BaseTmpl):
@@ -22,34 +32,58 @@ class TestStructure(BaseTmpl):
             },
         )
 
-    def test_numeric_op(self):
-        s1 = Ns_SCA_Structure("W")
-        s2 = Ns_SCA_Structure("W")
-
-        s1.value = 20
-        s2.value = 10
-
-        self.assertEqual(s1 + s2, 30)
-        self.assertEqual(s1 + 10, 30)
-        self.assertEqual(20 + s2, 30)
-        self.assertRaises(NotImplementedError, operator.add, "20", s2)
-
-        self.assertEqual(s1 - s2, 10)
-        self.assertEqual(s1 - 10, 10)
-        self.assertEqual(20 - s2, 10)
-        self.assertRaises(NotImplementedError, operator.sub, "20", s2)
 
-        self.assertEqual(s1 * s2, 200)
-        self.assertEqual(s1 * 10, 200)
-        self.assertEqual(20 * s2, 200)
-        self.assertRaises(NotImplementedError, operator.mul, "20", s2)
-
-        self.assertEqual(s1 / s2, 2)
-        self.assertEqual(s1 / 10, 2)
-        self.assertEqual(20 / s2, 2)
-        self.assertRaises(NotImplementedError, operator.truediv, "20", s2)
-
-        self.assertEqual(s1 / 0, 0)
+class TestValueSource(BaseTmpl):
+    def test_compile(self):
+        compiled = Ns_SCA_Value_Source.compile("CN1 + CN2 + CN3")
+        self.assertIs(Ns_SCA_Value_Source.compile("CN1 + CN2 + CN3"), compiled)
+        self.assertIs(Ns_SCA_Structure("CN", value_source="CN1 + CN2 + CN3").compiled_value_source, compiled)
+        self.assertEqual(compiled.snames, ("CN1", "CN2", "CN3"))
+        self.assertEqual(compiled.match_snames, ("CN1", "CN2", "CN3"))
+
+        compiled = Ns_SCA_Value_Source.compile("(B + A) / (A - 1)")
+        self.assertEqual(compiled.snames, ("B", "A"))
+        # Matches are not passed on by anything but sums
+        self.assertEqual(compiled.match_snames, ())
+
+        for value_source in ("A ** 2", "f(A)", "A +", "'A'", "A.value", "1j"):
+            self.assertRaises(InvalidSourceError, Ns_SCA_Value_Source, value_source)
+
+    def test_evaluate(self):
+        values = {"A": 3, "B": 7}
+        self.assertEqual(Ns_SCA_Value_Source("(B + A) / (A - 1)").evaluate(values.__getitem__), 5)
+        self.assertEqual(Ns_SCA_Value_Source("-A * 2 + 0.5").evaluate(values.__getitem__), -5.5)
+        self.assertEqual(Ns_SCA_Value_Source("B / (A - 3)").evaluate(values.__getitem__), 0)
+        self.assertEqual(Ns_SCA_Value_Source("A").evaluate(values.__getitem__), 3)
+
+
+class TestMatches(BaseTmpl):
+    def test_offsets(self):
+        forest = Forest.fromstring(tree_string)
+        matches = Ns_SCA_Matches()
+        document_id = matches.add_document(forest.leaf_strings())
+        self.assertEqual(matches.add_document(forest.leaf_strings()), document_id)
+        matches.append(document_id, 0, 2, 4)
+        matches.append(document_id, 0, 0, 1)
+        self.assertEqual(len(matches), 2)
+        self.assertEqual(matches, ["no possibility", "There"])
+        self.assertEqual(matches[-1], "There")
+        self.assertEqual(matches[:1], ["no possibility"])
+        self.assertRaises(IndexError, matches.__getitem__, 2)
+
+    def test_extend(self):
+        matches = Ns_SCA_Matches.from_strings(["a", "b c"])
+        other = Ns_SCA_Matches()
+        other.extend(Ns_SCA_Matches.from_strings(["d"]))
+        other.extend(matches)
+        self.assertEqual(len(other.documents), 2)
+        self.assertEqual(other, ["d", "a", "b c"])
+        self.assertEqual(matches + other, ["a", "b c", "d", "a", "b c"])
+        # The operands are left untouched
+        self.assertEqual(matches, ["a", "b c"])
+        other.reset()
+        self.assertEqual(other, [])
+        self.assertEqual(other.documents, [])
 
 
 class TestStructureCounter(BaseTmpl):
@@ -206,3 +240,181 @@ class TestStructureCounter(BaseTmpl):
             ("CP", 34),
         ):
             self.assertEqual(counter3.get_value(s_name), value)
+
+    def test_determine_all_values(self):
+        counter_from_str = Ns_SCA_Counter()
+        counter_from_str.determine_all_values(tree_string)
+
+        forest = Forest.fromstring(tree_string)
+        counter_from_forest = Ns_SCA_Counter()
+        counter_from_forest.determine_all_values(forest)
+
+        self.assertEqual(counter_from_str.get_all_values(), counter_from_forest.get_all_values())
+        for sname in counter_from_str.sname_structure_map:
+            self.assertEqual(counter_from_str.get_matches(sname), counter_from_forest.get_matches(sname))
+        self.assertEqual(counter_from_forest.get_value("W"), 10)
+        self.assertEqual(counter_from_forest.get_value("S"), 1)
+
+    def test_search_snames(self):
+        forest = Forest.fromstring(tree_string * 2)
+        snames = tuple(Ns_SCA_Counter.SNAME_SEARCHER_MAPPING)
+        sname_matches_map = Ns_SCA_Counter.search_snames(snames, forest)
+        self.assertEqual(tuple(sname_matches_map), snames)
+        for sname in snames:
+            self.assertEqual(sname_matches_map[sname], Ns_SCA_Counter.search_sname(sname, forest))
+        self.assertEqual(len(sname_matches_map["VP1"]), 4)
+        self.assertRaises(ValueError, Ns_SCA_Counter.search_snames, ("VP", "VP1"), forest)
+
+        # Structures without a hand-written searcher, or redefined ones, are
+        # searched for with compiled Tregex patterns
+        sname_matches_map = Ns_SCA_Counter.search_snames(
+            ("NP", "VP1", "CP"), forest, {"NP": "NP < DT", "VP1": "VP > S|SINV|SQ", "CP": "NP < DT"}
+        )
+        self.assertEqual(len(sname_matches_map["NP"]), 6)
+        self.assertEqual(sname_matches_map["CP"], sname_matches_map["NP"])
+        self.assertEqual(sname_matches_map["VP1"], Ns_SCA_Counter.search_sname("VP1", forest))
+
+        # Compiled patterns are planned for the first forest only
+        with mock.patch.object(Forest_Stats, "from_forest", wraps=Forest_Stats.from_forest) as from_forest:
+            Ns_SCA_Counter.search_snames(("CN",), forest, {"CN": "NP < JJ <- NN"})
+            Ns_SCA_Counter.search_snames(("CN",), forest, {"CN": "NP < JJ <- NN"})
+        self.assertEqual(from_forest.call_count, 1)
+        self.assertTrue(Tregex_Pattern.compile("NP < JJ <- NN").is_planned_for_forest)
+
+    def test_user_structures(self):
+        user_structure_defs = [
+            {"name": "DT", "tregex_pattern": "DT > (NP > VP)"},
+            {"name": "NP", "tregex_pattern": "NP < DT"},
+            {"name": "DT/NP", "value_source": "DT / NP"},
+        ]
+        counter = Ns_SCA_Counter(selected_measures=["DT/NP"], user_structure_defs=user_structure_defs)
+        counter.determine_all_values(tree_string)
+        self.assertEqual(counter.get_value("NP"), 3)
+        self.assertEqual(counter.get_value("DT"), 2)
+        self.assertEqual(counter.get_value("DT/NP"), 0.6667)
+        self.assertEqual(counter.get_matches("NP"), ["no possibility", "a walk", "that day"])
+
+        explanation = counter.explain_patterns()
+        self.assertIn("DT: Plan for DT > (NP > VP)", explanation)
+        self.assertNotIn("VP1", explanation)
+
+    def test_get_dependency_snames(self):
+        counter = Ns_SCA_Counter()
+        self.assertEqual(counter.get_dependency_snames(["VP1"]), ["VP1"])
+        self.assertEqual(counter.get_dependency_snames(["C/T"]), ["C/T", "C", "T", "C1", "C2", "T1", "T2"])
+
+    def test_evaluation_plan(self):
+        counter = Ns_SCA_Counter(selected_measures=["C/T", "MLS"])
+        self.assertIs(counter.evaluation_plan, Ns_SCA_Counter(selected_measures=["C/T", "MLS"]).evaluation_plan)
+        plan = counter.evaluation_plan
+        self.assertEqual(set(plan.snames), {"C/T", "C", "T", "C1", "C2", "T1", "T2", "MLS", "W", "S"})
+        for sname in plan.snames:
+            for dependency_sname in counter.get_dependency_snames([sname]):
+                self.assertLessEqual(plan.snames.index(dependency_sname), plan.snames.index(sname))
+        self.assertEqual(set(plan.tregex_snames), {"C1", "C2", "T1", "T2", "S"})
+        self.assertEqual(set(plan.value_source_snames), {"C", "T", "C/T", "MLS"})
+        self.assertTrue(plan.is_counting_words)
+
+        # Only the structures the selected measures reach are determined
+        counter.determine_all_values(tree_string)
+        self.assertEqual(counter.get_value("C/T"), 1)
+        self.assertIsNone(counter.get_value("CN1"))
+        self.assertIsNone(counter.get_value("VP"))
+
+    def test_evaluation_plan_errors(self):
+        circular_defs = [
+            {"name": "X", "value_source": "Y + 1"},
+            {"name": "Y", "value_source": "Z * 2"},
+            {"name": "Z", "value_source": "X - S"},
+        ]
+        # Reported when the counter is created, even if X, Y, and Z are not selected
+        with self.assertRaisesRegex(CircularDefinitionError, "X = Y [+] 1, Y = Z [*] 2, Z = X - S"):
+            Ns_SCA_Counter(selected_measures=["S"], user_structure_defs=circular_defs)
+        self.assertRaises(
+            CircularDefinitionError,
+            Ns_SCA_Counter,
+            user_structure_defs=[{"name": "A", "value_source": "A + 1"}],
+        )
+        self.assertRaises(
+            StructureNotFoundError,
+            Ns_SCA_Counter,
+            user_structure_defs=[{"name": "A", "value_source": "UNDEFINED + 1"}],
+        )
+        self.assertRaises(
+            StructureNotFoundError, Ns_SCA_Evaluation_Plan, Ns_SCA_Counter.BUILTIN_STRUCTURE_DEFS, ["NULL"]
+        )
+
+    def test_shared_structure_defs(self):
+        user_structure_defs = [{"name": "NP", "tregex_pattern": "NP < DT"}]
+        counter1 = Ns_SCA_Counter(user_structure_defs=user_structure_defs)
+        counter2 = Ns_SCA_Counter(user_structure_defs=[dict(kwargs) for kwargs in user_structure_defs])
+        self.assertIs(counter1.sname_structure_map, counter2.sname_structure_map)
+        self.assertIsNot(counter1.sname_structure_map, Ns_SCA_Counter().sname_structure_map)
+        self.assertRaises(TypeError, operator.setitem, counter1.sname_structure_map, "NP", None)
+        self.assertRaises(ValueError, Ns_SCA_Counter, selected_measures=["NP"])
+
+        counter1.determine_all_values(tree_string)
+        self.assertEqual(counter1.get_value("NP"), 3)
+        self.assertIsNone(counter2.get_value("NP"))
+        self.assertEqual(counter2.get_matches("NP"), [])
+
+        # Combined counters keep the user-defined structures
+        combined = counter1 + counter1
+        self.assertEqual(combined.get_value("NP"), 6)
+        self.assertEqual(len(combined.get_matches("NP")), 6)
+
+    def test_bounded_shared_defs(self):
+        max_shared_structure_defs = Ns_SCA_Counter.max_shared_structure_defs
+        max_compiled_plans = Ns_SCA_Evaluation_Plan.max_compiled_plans
+        Ns_SCA_Counter.max_shared_structure_defs = Ns_SCA_Evaluation_Plan.max_compiled_plans = 2
+        try:
+            for label in ("A", "B", "C"):
+                Ns_SCA_Counter(user_structure_defs=[{"name": label, "tregex_pattern": f"{label} !< __"}])
+            self.assertEqual(len(Ns_SCA_Counter.shared_structure_defs), 2)
+            self.assertEqual(len(Ns_SCA_Evaluation_Plan.compiled_plans), 2)
+            self.assertNotIn(
+                ((("name", "A"), ("tregex_pattern", "A !< __")),), Ns_SCA_Counter.shared_structure_defs
+            )
+        finally:
+            Ns_SCA_Counter.max_shared_structure_defs = max_shared_structure_defs
+            Ns_SCA_Evaluation_Plan.max_compiled_plans = max_compiled_plans
+
+    def test_merge_from(self):
+        counters = []
+        for ifile in ("a", "b", "c"):
+            counter = Ns_SCA_Counter(ifile)
+            counter.determine_all_values(tree_string)
+            counters.append(counter)
+        expected = Ns_SCA_Counter()
+        expected.determine_all_values(tree_string * 3)
+
+        counter = Ns_SCA_Counter()
+        counter.merge_from(iter(counters))
+        self.assertEqual(counter.ifile, "a+b+c")
+        for sname in counter.selected_measures:
+            self.assertEqual(counter.get_value(sname), expected.get_value(sname), sname)
+            self.assertEqual(counter.get_matches(sname), expected.get_matches(sname), sname)
+        self.assertEqual(counter.get_all_values()["MLS"], str(expected.get_value("MLS")))
+        self.assertEqual((counters[0] + counters[1]).ifile, "a+b")
+
+        user_counter = Ns_SCA_Counter(user_structure_defs=[{"name": "NP", "tregex_pattern": "NP < DT"}])
+        self.assertRaises(ValueError, counter.merge_from, [user_counter])
+
+    def test_counting_only(self):
+        forest = Forest.fromstring(tree_string * 2)
+        snames = tuple(Ns_SCA_Counter.SNAME_SEARCHER_MAPPING)
+        self.assertEqual(
+            Ns_SCA_Counter.count_snames(snames, forest),
+            {sname: len(matches) for sname, matches in Ns_SCA_Counter.search_snames(snames, forest).items()},
+        )
+
+        counter = Ns_SCA_Counter(is_counting_only=True)
+        counter.determine_all_values(forest)
+        expected = Ns_SCA_Counter()
+        expected.determine_all_values(forest)
+        self.assertEqual(counter.get_all_values(), expected.get_all_values())
+        for sname in counter.sname_structure_map:
+            self.assertEqual(counter.get_matches(sname), [])
+
+        counter.merge_from([expected])
+        self.assertEqual(counter.get_value("VP1"), expected.get_value("VP1") * 2)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import io
+import json
+
+import numpy as np
+
+from neosca.ns_sca.ns_sca_counter import Ns_SCA_Counter
+from neosca.ns_sca.ns_sca_results import Ns_SCA_Results
+
+from .base_tmpl import BaseTmpl
+from .base_tmpl import tree as tree_string
+
+NP_STRING = "(ROOT (NP (NN Dog)))"
+
+
+class TestSCAResults(BaseTmpl):
+    def setUp(self):
+        self.counters = []
+        for file_path, forest in (("a.txt", tree_string), ("b.txt", tree_string * 2), ("c.txt", NP_STRING)):
+            counter = Ns_SCA_Counter(file_path)
+            counter.determine_all_values(forest)
+            self.counters.append(counter)
+        self.results = Ns_SCA_Results.from_counters(self.counters)
+        return super().setUp()
+
+    def test_columns(self):
+        self.assertEqual(len(self.results), 3)
+        self.assertEqual(self.results.selected_measures, tuple(Ns_SCA_Counter.DEFAULT_MEASURES))
+        for sname in Ns_SCA_Counter.DEFAULT_MEASURES:
+            self.assertEqual(
+                self.results.get_column(sname).tolist(),
+                [counter.get_raw_value(sname) for counter in self.counters],
+                sname,
+            )
+        # Divisions by zero give 0, as safe_div() does
+        self.assertEqual(self.results.get_column("C/T")[2], 0)
+        self.assertEqual(self.results.to_array().shape, (3, len(Ns_SCA_Counter.DEFAULT_MEASURES)))
+        self.assertRaises(KeyError, self.results.get_column, "XYZ")
+
+    def test_user_structures(self):
+        counter = Ns_SCA_Counter(
+            "a.txt",
+            selected_measures=["VP/W", "TWO"],
+            user_structure_defs=[
+                {"name": "VP/W", "value_source": "(VP1 + VP2) / W"},
+                {"name": "TWO", "value_source": "2"},
+            ],
+        )
+        counter.determine_all_values(tree_string)
+        results = Ns_SCA_Results.from_counters([counter])
+        self.assertEqual(results.get_column("VP/W").tolist(), [counter.get_raw_value("VP/W")])
+        self.assertEqual(results.get_column("TWO").tolist(), [2])
+
+        self.assertRaises(ValueError, Ns_SCA_Results.from_counters, [counter, self.counters[0]])
+        self.assertRaises(ValueError, Ns_SCA_Results.from_counters, [])
+
+    def test_undetermined(self):
+        # Undetermined counts are kept as NaN
+        results = Ns_SCA_Results.from_counters([Ns_SCA_Counter("x.txt"), self.counters[0]])
+        self.assertEqual(results.counts.dtype, np.float64)
+        self.assertTrue(np.isnan(results.get_column("W")[0]))
+        self.assertTrue(np.isnan(results.get_column("MLS")[0]))
+        self.assertEqual(results.get_column("W")[1], self.counters[0].get_raw_value("W"))
+        record = next(results.iter_records())
+        self.assertIsNone(record["W"])
+        self.assertIsNone(record["MLS"])
+        self.assertEqual(self.results.counts.dtype, np.int64)
+
+    def test_dump(self):
+        handle = io.StringIO()
+        self.results.dump_csv(handle, precision=2)
+        header, *rows = handle.getvalue().splitlines()
+        self.assertEqual(header.split(","), ["Filepath", *Ns_SCA_Counter.DEFAULT_MEASURES])
+        self.assertEqual(
+            rows[0].split(",")[1:],
+            [str(self.counters[0].get_value(sname, 2)) for sname in Ns_SCA_Counter.DEFAULT_MEASURES],
+        )
+
+        handle = io.StringIO()
+        self.results.dump_json(handle)
+        records = json.loads(handle.getvalue())
+        self.assertEqual(records[1]["Filepath"], "b.txt")
+        self.assertEqual(records[1]["MLS"], self.counters[1].get_value("MLS"))
+
+        handle = io.BytesIO()
+        self.results.dump_npy(handle)
+        handle.seek(0)
+        records = np.load(handle)
+        self.assertEqual(records["Filepath"].tolist(), ["a.txt", "b.txt", "c.txt"])
+        self.assertEqual(records["VP"].tolist(), self.results.get_column("VP").tolist())
@@ -3,6 +3,8 @@
 import re
 import sys
 
+from neosca.ns_tregex.collins_head_finder import CollinsHeadFinder
+from neosca.ns_tregex.head_finder import Head_Cache
 from neosca.ns_tregex.tree import Tree
 
 from .base_tmpl import BaseTmpl
@@ -176,6 +178,130 @@ class TestTree(BaseTmpl):
 
         self.assertEqual(self.t.height(), 10)
 
+    def test_get_index(self):
+        index = self.t.get_index()
+        # the index lives on the root and is shared by all nodes
+        self.assertIs(self.t[0, 0].get_index(), index)
+        self.assertEqual(index.nodes, list(self.t.preorder_iter()))
+
+        nps = index.nodes_with_labels(["NP"])
+        self.assertEqual(len(nps), 5)
+        self.assertEqual(nps, [node for node in self.t.preorder_iter() if node.label == "NP"])
+        self.assertEqual(
+            index.nodes_with_labels(["VP", "NP", "VP"]),
+            [node for node in self.t.preorder_iter() if node.label in ("NP", "VP")],
+        )
+        self.assertEqual(index.nodes_with_labels(["NON-EXISTING"]), [])
+
+        t = next(Tree.fromstring("(ROOT (S (NP-SBJ (PRP I)) (VP (VBP see) (NP-OBJ (PRP it)) (NP (DT that)))))"))
+        self.assertEqual(
+            [node.label for node in t.get_index().nodes_with_labels(["NP"], use_basic_cat=True)],
+            ["NP-SBJ", "NP-OBJ", "NP"],
+        )
+
+    def test_clear_index(self):
+        index = self.t.get_index()
+        self.assertIs(self.t.get_index(), index)
+
+        vbd = self.t.get_index().nodes_with_labels(["VBD"])[0]
+        vbd.set_label("VBZ")
+        self.assertIsNot(self.t.get_index(), index)
+        self.assertEqual(self.t.get_index().nodes_with_labels(["VBD"]), [])
+        self.assertEqual(self.t.get_index().nodes_with_labels(["VBZ"]), [vbd])
+
+        index = self.t.get_index()
+        self.t.add_child(Tree("VBD"))
+        self.assertIsNot(self.t.get_index(), index)
+        self.assertEqual(len(self.t.get_index().nodes_with_labels(["VBD"])), 1)
+
+    def test_adopted_subtree_index(self):
+        np = next(Tree.fromstring("(NP (DT a) (NN walk))"))
+        self.assertEqual((np.leftEdge(), np.rightEdge()), (0, 2))
+        root = Tree("ROOT", [Tree("VP", [Tree("VBG", [Tree("taking")])]), np])
+        self.assertIs(np.get_index(), root.get_index())
+        self.assertEqual((np.leftEdge(), np.rightEdge()), (1, 3))
+        self.assertTrue(root.dominates(np))
+        self.assertTrue(root.dominates(np[0]))
+        self.assertFalse(np.dominates(root))
+
+    def test_edges(self):
+        # "There was no possibility of taking a walk that day ."
+        self.assertEqual((self.t.leftEdge(), self.t.rightEdge()), (0, 11))
+        was = self.t[0, 1, 0, 0]
+        self.assertEqual(was.label, "was")
+        self.assertEqual((was.leftEdge(), was.rightEdge()), (1, 2))
+        pp = self.t[0, 1, 1, 1]
+        self.assertEqual(pp.label, "PP")
+        self.assertEqual((pp.leftEdge(), pp.rightEdge()), (4, 10))
+        self.assertEqual(pp.span_string(), "of taking a walk that day")
+
+    def test_dominates(self):
+        nodes = list(self.t.preorder_iter())
+        for node1 in nodes:
+            ancestors = set(map(id, node1.iter_upto_root())) - {id(node1)}
+            ancestors |= {id(self.t)} if node1 is not self.t else set()
+            for node2 in nodes:
+                self.assertEqual(node2.dominates(node1), id(node2) in ancestors)
+
+        other_t = next(Tree.fromstring(self.tree_string))
+        self.assertFalse(self.t.dominates(other_t[0]))
+
+        # postorder numbers are those of an actual postorder walk
+        postorder: list[Tree] = []
+        stack = [(self.t, False)]
+        while stack:
+            node, is_visited = stack.pop()
+            if is_visited:
+                postorder.append(node)
+            else:
+                stack.append((node, True))
+                stack.extend((kid, False) for kid in reversed(node.children))
+        index = self.t.get_index()
+        self.assertEqual(
+            [index.postorder_ids[node._preorder_id] for node in postorder], list(range(len(nodes)))
+        )
+
+    def test_head_cache(self):
+        hf = CollinsHeadFinder()
+        nodes = list(self.t.preorder_iter())
+        expected_heads = [hf.determineHead(node) for node in nodes]
+        expected_terminals = []
+        for node in nodes:
+            while node is not None and not node.isLeaf():
+                node = hf.determineHead(node)
+            expected_terminals.append(node)
+
+        Head_Cache.reset_stats()
+        for _ in range(2):
+            self.assertEqual(
+                list(map(id, (node.head_daughter(hf) for node in nodes))), list(map(id, expected_heads))
+            )
+        self.assertEqual(Head_Cache.stats["head_daughter_misses"], len(nodes))
+        self.assertEqual(Head_Cache.stats["head_daughter_hits"], len(nodes))
+        self.assertEqual(
+            list(map(id, (node.head_terminal(hf) for node in nodes))), list(map(id, expected_terminals))
+        )
+        self.assertEqual(self.t.head_terminal(hf).label, "was")  # type:ignore
+
+        # precomputing gives the same heads without any further call to hf
+        t = next(Tree.fromstring(self.tree_string))
+        head_cache = t.get_index().get_head_cache(hf, precompute=True)
+        Head_Cache.reset_stats()
+        nodes = list(t.preorder_iter())
+        self.assertEqual(
+            [getattr(node.head_daughter(hf), "label", None) for node in nodes],
+            [getattr(node, "label", None) for node in expected_heads],
+        )
+        self.assertEqual(
+            [node.head_terminal(hf).label for node in nodes], [node.label for node in expected_terminals]
+        )  # type:ignore
+        self.assertEqual(Head_Cache.stats["head_daughter_misses"] + Head_Cache.stats["head_terminal_misses"], 0)
+        self.assertIs(t.get_index().get_head_cache(hf), head_cache)
+
+        # the cache is dropped together with the index
+        t[0].set_label("NP")
+        self.assertIsNot(t.get_index().get_head_cache(hf), head_cache)
+
     def test_deep_tree(self):
         # Set the maximum recursion depth to 2000
         limit = 1000
@@ -194,3 +320,5 @@ class TestTree(BaseTmpl):
         t.height()
         t.get_terminal_labels()
         t.get_tagged_terminal_labels()
+        t.leftEdge()
+        t.getLeaves()[0].rightEdge()
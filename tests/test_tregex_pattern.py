@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+from neosca.ns_sca.ns_sca_counter import Ns_SCA_Counter
+from neosca.ns_tregex.forest import Forest
+from neosca.ns_tregex.node_descriptions import Node_Description, Node_Descriptions, Node_Regex, Node_Text
+from neosca.ns_tregex.tregex_pattern import And_Condition, Forest_Stats, Tregex_Pattern
+
+from .base_tmpl import BaseTmpl
+from .base_tmpl import tree as tree_string
+
+FOREST_STRING = (
+    tree_string + "(ROOT (S (NP (PRP I)) (VP (VBD said) (SBAR (IN that) (S (NP (PRP he)) (VP (MD would)"
+    " (VP (VB come) (CC and) (VP (VB go))))))) (. .)))"
+    "(ROOT (SQ (VBZ Is) (NP (PRP it)) (ADJP (JJ red) (CC or) (JJ blue)) (. ?)))"
+    "(ROOT (FRAG (NP (DT The) (JJ big) (NN dog)) (. .)))"
+)
+
+
+class TestTregexPattern(BaseTmpl):
+    def setUp(self):
+        self.forest = Forest.fromstring(FOREST_STRING)
+        return super().setUp()
+
+    def search(self, pattern: str) -> list[str]:
+        compiled = Tregex_Pattern.compile(pattern)
+        return [node.span_string() for tree in self.forest for node in compiled.searchNodeIterator(tree)]
+
+    def test_builtin_patterns(self):
+        # Compiled patterns match the same nodes as the hand-written searchers
+        for sname, searcher in Ns_SCA_Counter.SNAME_SEARCHER_MAPPING.items():
+            compiled = Tregex_Pattern.compile(Ns_SCA_Counter.BUILTIN_STRUCTURE_DEFS[sname].tregex_pattern)  # type:ignore
+            for tree in self.forest:
+                expected = list(dict.fromkeys(searcher.searchNodeIterator(tree)))
+                self.assertEqual(list(compiled.searchNodeIterator(tree)), expected, sname)
+
+    def test_forest_stats(self):
+        stats = Forest_Stats.from_forest(Forest.fromstring("(ROOT (S (NP (PRP I)) (VP (VBD ran))))"))
+        self.assertEqual((stats.n_trees, stats.n_nodes, stats.n_leaves), (1, 8, 2))
+        self.assertEqual(stats.label_counts["NP"], 1)
+        self.assertEqual(stats.tree_size, 8)
+        self.assertEqual(stats.depth, 19 / 8)
+        self.assertEqual(stats.children, 7 / 6)
+        self.assertEqual(stats.leaves_below, 8 / 8)
+
+    def test_plan(self):
+        stats = Forest_Stats.from_forest(self.forest)
+        for sname in Ns_SCA_Counter.SNAME_SEARCHER_MAPPING:
+            compiled = Tregex_Pattern(Ns_SCA_Counter.BUILTIN_STRUCTURE_DEFS[sname].tregex_pattern)  # type:ignore
+            expected = [list(compiled.searchNodeIterator(tree)) for tree in self.forest]
+            compiled.plan(stats)
+            # The order of checks never changes which nodes match
+            self.assertEqual([list(compiled.searchNodeIterator(tree)) for tree in self.forest], expected, sname)
+
+        compiled = Tregex_Pattern("NP << DT > VP")
+        compiled.plan(stats)
+        assert isinstance(compiled.root.condition, And_Condition)
+        # The cheap parent check runs before walking the descendants
+        self.assertEqual([repr(c) for c in compiled.root.condition.conditions], ["> VP", "<< DT"])
+        header, *lines = compiled.explain().splitlines()
+        self.assertEqual(header, "Plan for NP << DT > VP")
+        self.assertEqual([line.split()[0] for line in lines], ["NP", "and", ">", "VP", "<<", "DT"])
+
+    def test_compile_cache(self):
+        self.assertIs(Tregex_Pattern.compile("NP < DT"), Tregex_Pattern.compile("NP < DT"))
+
+    def test_candidate_labels(self):
+        self.assertEqual(Tregex_Pattern.compile("NP|VP < DT").candidate_labels, ("NP", "VP"))
+        self.assertIsNone(Tregex_Pattern.compile("/^N/").candidate_labels)
+        self.assertIsNone(Tregex_Pattern.compile("__ < DT").candidate_labels)
+        self.assertIsNone(Tregex_Pattern.compile("!NP").candidate_labels)
+
+    def test_descriptions(self):
+        self.assertEqual(self.search("JJ"), ["red", "blue", "big"])
+        self.assertEqual(self.search("/^V/ < CC"), ["come and go"])
+        self.assertEqual(self.search("ADJP|VP < CC"), ["come and go", "red or blue"])
+        self.assertEqual(len(self.search("__ !< __")), sum(len(tree.getLeaves()) for tree in self.forest))
+        self.assertEqual(self.search("!/^[A-Z.,?]/ > CC"), ["and", "or"])
+        self.assertEqual(self.search("NP=np < PRP"), ["I", "he", "it"])
+
+    def test_regex_descriptions(self):
+        desc = Node_Description.build(Node_Regex, "/^np$/i")
+        self.assertIs(desc.compiled, Node_Regex.compile("/^np$/i"))
+        # Descriptions built without compiling are compiled when added
+        descriptions = Node_Descriptions([Node_Description(Node_Regex, "/^np$/i")])
+        self.assertIs(descriptions.descriptions[0].compiled, desc.compiled)
+        self.assertIsNone(descriptions.labels)
+        self.assertEqual(Node_Descriptions([Node_Description(Node_Text, "NP")]).labels, {"NP"})
+
+        self.assertEqual(self.search("/^np$/i < PRP"), ["I", "he", "it"])
+        self.assertRaises(ValueError, Tregex_Pattern.compile, "/(/")
+
+    def test_relations(self):
+        self.assertEqual(self.search("VP <1 MD"), ["would come and go"])
+        self.assertEqual(self.search("VP <-1 VP"), ["would come and go", "come and go"])
+        self.assertEqual(self.search("JJ $+ CC"), ["red"])
+        self.assertEqual(self.search("JJ $- CC"), ["blue"])
+        self.assertEqual(self.search("FRAG <<, DT"), ["The big dog ."])
+        self.assertEqual(self.search("FRAG <+(NP) NN"), ["The big dog ."])
+        self.assertEqual(self.search("SQ <# VBZ"), ["Is it red or blue ?"])
+        self.assertEqual(self.search("CC , JJ . JJ"), ["or"])
+
+    def test_boolean_operators(self):
+        self.assertEqual(self.search("JJ [$+ CC | $- CC]"), ["red", "blue"])
+        self.assertEqual(self.search("JJ > ADJP & !$- CC"), ["red"])
+        self.assertEqual(self.search("JJ ![> ADJP | $+ NN]"), [])
+        self.assertEqual(self.search("(JJ > ADJP) $+ CC"), ["red"])
+        self.assertEqual(self.search("JJ ?$+ CC"), ["red", "blue", "big"])
+        self.assertEqual(self.search("FRAG : NN"), ["The big dog ."])
+        # Both sides of ":" are matched in the same tree
+        self.assertEqual(self.search("FRAG : SQ"), [])
+
+    def test_invalid_patterns(self):
+        for pattern in (
+            "",
+            "NP <",
+            "NP < (DT",
+            "NP [< DT",
+            "NP <0 DT",
+            "NP=a < DT=a",
+            "NP < ~a",
+            "NP <... {A}",
+            "NP ; VP",
+        ):
+            self.assertRaises(ValueError, Tregex_Pattern.compile, pattern)
+        # Unrecognized characters are reported with their position
+        self.assertRaisesRegex(
+            ValueError, 'position 5: unexpected character "{"', Tregex_Pattern.compile, "NP < {A}"
+        )